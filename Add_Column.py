@@ -1,6 +1,6 @@
 HELP_DOC = """
 ADD COLUMN
-(version 1.0.1)
+(version 1.0.2)
 by Angelo Chan
 
 This is a program to insert new columns into a table file, filled with the
@@ -143,6 +143,7 @@ DEFAULT__headers = False
 
 import _Controlled_Print as PRINT
 from _Command_Line_Parser import *
+import _Buffered_Writer as WRITER # 1.0
 
 from Table_File_Reader import *
 
@@ -244,7 +245,7 @@ def Add_Columns(path_in, delimiter, path_out, additions, headers):
     f.Set_New_Path(path_in)
     f.Set_Delimiter(delimiter)
     f.Open()
-    o = open(path_out, "w")
+    o = WRITER.Open_Buffered(path_out)
     
     PRINT.printP(STR__add_columns_begin)
     
@@ -1,6 +1,6 @@
 HELP_DOC = """
 COLUMN OPERATIONS
-(version 1.1.0)
+(version 1.1.2)
 by Angelo Chan
 
 This is a program for performing simple operations on table data such as adding,
@@ -143,6 +143,7 @@ DEFAULT__header = 1 # None
 
 import _Controlled_Print as PRINT
 from _Command_Line_Parser import * # 2.1
+import _Buffered_Writer as WRITER # 1.0
 
 from Table_File_Reader import * # 1.1.1
 
@@ -368,15 +369,19 @@ def Calculate_New_Columns(path_in, delim, path_out, header_mode, operations):
     # Setup
     total_new_cols_f = float(total_new_cols)
     range_ = range(total_new_cols)
+    col_nos = []
+    for operation in operations: col_nos += operation[1:]
     
     # I/O setup
     f = Table_Reader()
     f.Set_New_Path(path_in)
     f.Set_Delimiter(delim)
+    if col_nos and min(col_nos) >= 0: # Only split the columns needed
+        f.Set_Max_Column(max(col_nos) + 1)
     if header_mode != NSK.NONE:
         f.Set_Header_Params([1])
     f.Open()
-    o = open(path_out, "w")
+    o = WRITER.Open_Buffered(path_out)
     
     # Header
     if header_mode == NSK.KEEP:
@@ -1,6 +1,6 @@
 HELP_DOC = """
 JOIN TABLES
-(version 3.0.2)
+(version 3.5.1)
 by Angelo Chan
 
 This is a program for joining two table files into one table file. A new table
@@ -18,7 +18,8 @@ USAGE:
     python27 Join.py <input_path_left> <{input_format_left}> <key_columns_left>
             <input_path_right> <{input_format_right}> <key_columns_right>
             [-o <output_path> {output_format}] [-j <join_type>] [-s <sort>]
-            [-h Y|N] [-i Y|N] [-l Y|N] [-r Y|N]
+            [-h Y|N] [-i Y|N] [-l Y|N] [-r Y|N] [-m <method>] [-c Y|N]
+            [-b Y|N]
 
 
 
@@ -104,6 +105,49 @@ OPTIONAL:
         (DEFAULT: N)
         
         Whether or not duplicate keys are allowed in the right table.
+    
+    method
+        
+        (DEFAULT: dict)
+        
+        How the join is carried out. Acceptable options are:
+            dict    - Both tables are read into memory, and then joined.
+            merge   - The keys of both tables are sorted using temp files, and
+                      then merged. The rows of the tables are not held in
+                      memory, allowing tables larger than the available memory
+                      to be joined. Cannot be used without sorting.
+            hash    - Only the smaller table is read into memory. The larger
+                      table is read one row at a time. Only supports inner,
+                      left and right joins, and cannot be used with sorting.
+                      Keys are always treated as strings. To detect duplicate
+                      keys, a 64-bit digest of each key of the larger table is
+                      still held in memory, unless duplicates are allowed in
+                      the larger table and the duplicate warnings are turned
+                      off. (WARN_UNEQUAL_DUPLICATES)
+        
+        All methods produce the same output. (For the hash method, this only
+        holds if integer-like fields are not treated as integers.)
+    
+    (-c)
+        
+        (DEFAULT: N)
+        
+        Whether or not to use compact row storage with the dict method. Only the
+        location of each row in the input file is held in memory, instead of
+        its values. The values are read from the input file again when the
+        output is written. This uses much less memory, at the cost of some
+        speed.
+    
+    (-b)
+        
+        (DEFAULT: N)
+        
+        Whether or not to read the input files as raw bytes, instead of
+        converting Windows and old Mac newlines to Unix newlines as they are
+        read. Faster, but only suitable for files with Unix newlines, as any
+        other newline characters are kept as part of the values. Only affects
+        the dict and hash methods. (The merge method, and the dict method with
+        compact row storage, always read raw bytes.)
 
 
 
@@ -119,6 +163,16 @@ EXAMPLES EXPLANATION:
     3:
     Sorted left join of two table files with headers. Output file and format
     specified.
+    
+    4:
+    Join of two table files too large to fit in memory.
+    
+    5:
+    Unsorted left join of a large table file with a small table file, without
+    reading the large table file into memory.
+    
+    6:
+    Join of two table files with many columns, using less memory.
 
 EXAMPLES:
     
@@ -128,13 +182,20 @@ EXAMPLES:
     
     python27 Join.py table_3.tsv tsv 1,2 table_4.csv csv 3,2 -j L -h Y -o
             merged_data.txt ssv
+    
+    python27 Join.py huge_1.tsv tsv 1 huge_2.tsv tsv 1 -m merge
+    
+    python27 Join.py huge_1.tsv tsv 1 table_2.tsv tsv 1 -j L -s N -m hash
+    
+    python27 Join.py wide_1.tsv tsv 1 wide_2.tsv tsv 1 -c Y
 
 USAGE:
     
     python27 Join.py <input_path_left> <{input_format_left}> <key_columns_left>
             <input_path_right> <{input_format_right}> <key_columns_right>
             [-o <output_path> {output_format}] [-j <join_type>] [-s <sort>]
-            [-h Y|N] [-i Y|N] [-l Y|N] [-r Y|N]
+            [-h Y|N] [-i Y|N] [-l Y|N] [-r Y|N] [-m <method>] [-c Y|N]
+            [-b Y|N]
 """
 
 
@@ -153,6 +214,10 @@ PRINT_METRICS = True
 WARN_UNEQUAL_DUPLICATES = True
 UNEQUAL_DUPLICATE_EXAMPLES = 10
 
+MERGE_RUN_SIZE = 1000000 # Max number of keys held in memory by the MERGE method
+MERGE_CHUNK_SIZE = 4096 # Number of keys written to temp files at a time
+TEMP_DIR = "" # Directory for temp files. (Empty string: system default)
+
 
 
 # Defaults #####################################################################
@@ -164,6 +229,9 @@ DEFAULT__headers = False
 DEFAULT__integers = True
 DEFAULT__left_dup = False
 DEFAULT__right_dup = False
+DEFAULT__method = 1 #DICT
+DEFAULT__compact = False
+DEFAULT__binary = False
 
 
 
@@ -171,6 +239,17 @@ DEFAULT__right_dup = False
 
 import sys
 import os
+import marshal
+import heapq
+import mmap
+import tempfile
+import shutil
+import hashlib
+import struct
+from array import array
+from operator import itemgetter
+
+import _Buffered_Writer as WRITER # 1.0
 
 
 
@@ -188,6 +267,11 @@ class SORT:
     FORWARD=2
     REVERSE=3
 
+class METHOD:
+    DICT=1
+    MERGE=2
+    HASH=3
+
 
 
 # Strings ######################################################################
@@ -248,6 +332,23 @@ Please specify one of:
     forward
     reverse"""
 
+STR__invalid_method = """
+ERROR: Invalid join method: {s}
+Please specify one of:
+    dict
+    merge
+    hash"""
+
+STR__invalid_method_sort = """
+ERROR: The merge method always sorts the output. Please specify forward or
+reverse sorting."""
+
+STR__invalid_method_sort_hash = """
+ERROR: The hash method does not sort the output. Please specify no sorting."""
+
+STR__invalid_method_join = """
+ERROR: The hash method only supports inner, left and right joins."""
+
 
 STR__metrics_lines = """
     JOIN METRICS:
@@ -297,6 +398,10 @@ LIST__no = ["N", "n", "NO", "No", "no", "F", "f", "FALSE", "False", "false"]
 LIST__forward = ["F", "f", "FORWARD", "Forward", "forward"]
 LIST__reverse = ["R", "r", "REVERSE", "Reverse", "reverse"]
 
+LIST__dict = ["D", "d", "DICT", "Dict", "dict"]
+LIST__merge = ["M", "m", "MERGE", "Merge", "merge"]
+LIST__hash = ["H", "h", "HASH", "Hash", "hash"]
+
 LIST__tsv = ["\t", "T", "t", "TSV", "Tsv", "tsv", "TAB", "Tab", "tab"]
 LIST__csv = [",", "C", "c", "CSV", "Csv", "csv", "COMMA", "Comma", "comma"]
 LIST__ssv = [" ", "S", "s", "SSV", "Ssv", "ssv", "SPACE", "Space", "space"]
@@ -327,6 +432,22 @@ for i in LIST__xor: DICT__join[i] = JOIN.XOR
 
 
 
+DICT__method = {}
+for i in LIST__dict: DICT__method[i] = METHOD.DICT
+for i in LIST__merge: DICT__method[i] = METHOD.MERGE
+for i in LIST__hash: DICT__method[i] = METHOD.HASH
+
+
+
+# Arrays #######################################################################
+
+# Typecode for arrays of byte offsets. ("q" is not available in Python 2, and
+# "l" is only 32 bits on some platforms.)
+if array("l").itemsize >= 8: ARRAY_TYPE__offsets = "l"
+else: ARRAY_TYPE__offsets = "d"
+
+
+
 DICT__delim_format = {
     "\t": "tsv",
     ",": "csv",
@@ -357,7 +478,8 @@ UNEQUAL_DUPLICATE_EXAMPLES = UNEQUAL_DUPLICATE_EXAMPLES + 1
 # File Processing Code #########################################################
 
 def Join_Tables(path_l, delim_l, keys_l, path_r, delim_r, keys_r, path_out,
-            delim_out, join, sort, headers, integers, dup_l, dup_r):
+            delim_out, join, sort, headers, integers, dup_l, dup_r,
+            method=METHOD.DICT, compact=False, binary=False):
     """
     Join two tables (delimited table formatted files) and create a new table
     (also in a delimiated table format file).
@@ -365,6 +487,8 @@ def Join_Tables(path_l, delim_l, keys_l, path_r, delim_r, keys_r, path_out,
     table.
     Return an exit code of 3/4 if the table key is non-unique in the left/right
     table.
+    Return an exit code of 5 if the merge method was specified without sorting,
+    or if the hash method was specified with sorting or an unsupported join.
     
     In the output table, the key columns will be first, followed by the non-key
     columns of the left table in their original order, followed by the non-key
@@ -446,33 +570,133 @@ def Join_Tables(path_l, delim_l, keys_l, path_r, delim_r, keys_r, path_out,
     @dup_r
             (bool)
             Whether or not duplicates would be allowed in the right table.
+    @method
+            (int - ENUM)
+            An integer denoting how the join will be carried out.
+                1 - Dict:
+                        Both tables are read into memory.
+                2 - Merge:
+                        The keys of both tables are sorted externally, using
+                        temp files, and then merged. Only a bounded number of
+                        keys are held in memory at any one time, so the tables
+                        can be larger than the available memory. Requires
+                        forward or reverse sorting.
+                3 - Hash:
+                        Only the smaller table is read into memory. The larger
+                        table is read one row at a time. Keys are compared as
+                        strings, without the integer conversion of [integers].
+                        Requires no sorting (except for right joins, which
+                        are never sorted), and inner, left or right joins.
+    @compact
+            (bool)
+            Whether or not to use compact row storage with the DICT method. If
+            so, only the byte offset of each row is held in memory, instead of
+            its values, and the row is read from the input file again when the
+            output is written.
+    @binary
+            (bool)
+            Whether or not to read the input files as raw bytes, instead of in
+            universal newline mode, with the DICT and HASH methods. Skips the
+            newline translation, but only "\n" is treated as a newline, so any
+            "\r" is kept as part of the last value of its row.
     
-    Join_Tables(str, str, str, str, str, str, str, str, int, int, bool, bool)
-            -> int
+    Join_Tables(str, str, str, str, str, str, str, str, int, int, bool, bool,
+            bool, bool, int, bool, bool) -> int
     """
     printP(STR__join_begin)
     
-    # Key types and width check
-    key_types, width_k, width_l, width_r = Get_Key_Types(path_l, delim_l,
-            keys_l, path_r, delim_r, keys_r, headers)
-    if type(key_types) == int: return key_types
-    if not integers:key_types = len(keys_l) * [False]
-    
-    # Headers and blanks
+    # Headers
     header_values = []
     if headers:
         header_values = Get_Header_Values(path_l, delim_l, keys_l, path_r,
             delim_r, keys_r, join)
-    blank_l = width_l*delim_out
-    blank_r = width_r*delim_out
     
+    # Join tables
+    if method == METHOD.MERGE:
+        metrics = Join_Tables__MERGE(path_l, delim_l, keys_l, path_r, delim_r,
+                keys_r, path_out, delim_out, join, sort, headers, integers,
+                dup_l, dup_r, header_values)
+    elif method == METHOD.HASH:
+        metrics = Join_Tables__HASH(path_l, delim_l, keys_l, path_r, delim_r,
+                keys_r, path_out, delim_out, join, sort, headers, dup_l, dup_r,
+                header_values, binary)
+    else:
+        metrics = Join_Tables__DICT(path_l, delim_l, keys_l, path_r, delim_r,
+                keys_r, path_out, delim_out, join, sort, headers, integers,
+                dup_l, dup_r, header_values, compact, binary)
+    if type(metrics) == int: return metrics
+    
+    # Metrics
+    Report_Metrics(metrics)
+    
+    #
+    printP(STR__join_complete)
+    return 0
+
+def Join_Tables__DICT(path_l, delim_l, keys_l, path_r, delim_r, keys_r,
+            path_out, delim_out, join, sort, headers, integers, dup_l, dup_r,
+            header_values, compact=False, binary=False):
+    """
+    Subfunction of Join_Tables() for the DICT method. Both tables are read into
+    dictionaries in memory before being joined.
+    
+    If [compact] is True, the dictionaries only contain the byte offsets of the
+    rows, and the rows are fetched from the input files when the output is
+    written.
+    
+    If [binary] is True, the tables are read as raw bytes. (Compact row storage
+    always reads raw bytes.)
+    
+    Return a list of the metrics of the operation, in the format expected by
+    Report_Metrics().
+    Return an exit code of 3/4 if the table key is non-unique in the left/right
+    table.
+    
+    Join_Tables__DICT(str, str, list<int>, str, str, list<int>, str, str, int,
+            int, bool, bool, bool, bool, list<str>, bool, bool) -> list<int>
+    Join_Tables__DICT(str, str, list<int>, str, str, list<int>, str, str, int,
+            int, bool, bool, bool, bool, list<str>, bool, bool) -> int
+    """
     # Process inputs
-    data_l = Process_Table(path_l, delim_l, keys_l, key_types, headers, dup_l)
+    width_k = len(keys_l)
+    if compact:
+        process_table = Process_Table__COMPACT
+        rows_fetcher_l = Row_Fetcher(path_l, delim_l, keys_l, delim_out)
+        rows_fetcher_r = Row_Fetcher(path_r, delim_r, keys_r, delim_out)
+        format_l = rows_fetcher_l.Get
+        format_r = rows_fetcher_r.Get
+    else:
+        process_table = Process_Table
+        format_l = None
+        format_r = None
+    data_l = process_table(path_l, delim_l, keys_l, headers, dup_l, integers,
+            binary)
     if not data_l: return 3
-    data_r = Process_Table(path_r, delim_r, keys_r, key_types, headers, dup_r)
+    data_r = process_table(path_r, delim_r, keys_r, headers, dup_r, integers,
+            binary)
     if not data_r: return 4
-    dict_l, keys_l, rows_l = data_l
-    dict_r, keys_r, rows_r = data_r
+    dict_l, keys_l, rows_l, width_l, digits_l = data_l
+    dict_r, keys_r, rows_r, width_r, digits_r = data_r
+    
+    # Key types
+    key_types = []
+    for i in range(width_k):
+        key_types.append(integers and digits_l[i] and digits_r[i])
+    if True in key_types:
+        data_l = Convert_Key_Types(dict_l, keys_l, key_types, dup_l)
+        if not data_l: return 3
+        data_r = Convert_Key_Types(dict_r, keys_r, key_types, dup_r)
+        if not data_r: return 4
+        dict_l, keys_l = data_l
+        dict_r, keys_r = data_r
+    
+    # Duplicates warning
+    Warn_Unequal_Duplicates(keys_l)
+    Warn_Unequal_Duplicates(keys_r)
+    
+    # Blanks
+    blank_l = width_l*delim_out
+    blank_r = width_r*delim_out
     
     # Sorting
     if sort == SORT.FORWARD:
@@ -482,129 +706,16 @@ def Join_Tables(path_l, delim_l, keys_l, path_r, delim_r, keys_r, path_out,
     
     # Join tables
     metrics_out = Write_Table__DICTs(dict_l, keys_l, blank_l, dict_r, keys_r,
-            blank_r, path_out, delim_out, join, header_values)
+            blank_r, path_out, delim_out, join, header_values, format_l,
+            format_r)
+    if compact:
+        rows_fetcher_l.Close()
+        rows_fetcher_r.Close()
     metrics_in = [rows_l, rows_r]
     metrics_widths = [width_k, width_l, width_r]
-    
-    # Metrics
-    Report_Metrics(metrics_out+metrics_in+metrics_widths)
-    
-    #
-    printP(STR__join_complete)
-    return 0
-
+    return metrics_out + metrics_in + metrics_widths
 
 
-def Get_Key_Types(path_l, delim_l, keys_l, path_r, delim_r, keys_r, headers):
-    """
-    Return a list of:
-        Booleans. Each boolean describes the two columns specified by the key in
-        the key lists in the same indexed position. The boolean will be True if
-        all values in both columns can be converted to an integer, and False
-        otherwise.
-        3 integers describing the number of key columns, the number of non-key
-        columns in the left table, and the number of non-key columns in the
-        right table.
-    Return 1/2 if the left/right table has an inconsistent number of columns.
-    
-    Example:
-        If the left table's keys are [0,1,2]
-        And the right table's keys are [5,0,1]
-        And the output of this function is [False, True, False]
-        Then that would mean that all values, in column 1 of the left table and
-        all values in column 0 of the right table, can be converted to integers.
-    
-    @path_l
-            (str - filepath)
-            The filepath of the left table file.
-    @delim_l
-            (str)
-            The delimiter to be used for the left table file. File formats and
-            their corresponding delimiters are as follows:
-                TSV - "\t" (tab character)
-                CSV - ","  (comma character)
-                SSV - " "  (whitespace character)
-    @keys_l
-            (list<int>)
-            A list of the column numbers for the columns which comprise the key
-            for the left table.
-            (Uses a 0-index system.)
-    @path_r
-            (str - filepath)
-            The filepath of the right table file.
-    @delim_r
-            (str)
-            The delimiter to be used for the right table file. File formats and
-            their corresponding delimiters are as follows:
-                TSV - "\t" (tab character)
-                CSV - ","  (comma character)
-                SSV - " "  (whitespace character)
-    @keys_r
-            (list<int>)
-            A list of the column numbers for the columns which comprise the key
-            for the right table.
-            (Uses a 0-index system.)
-    @headers
-            (bool)
-            Whether or not there are headers in the input files. If this is set
-            to True, the first line in each file will be excluded from
-            consideration for the analysis.
-    
-    Get_Key_Types(str, str, str, str, str, str, bool) ->
-            [list<bool>, int, int, int]
-    Get_Key_Types(str, str, str, str, str, str, bool) -> int
-    """
-    # Verify widths and get key types
-    keys_l, width_l = Get_Key_Types_(path_l, delim_l, keys_l, headers)
-    if not keys_l: return 1
-    keys_r, width_r = Get_Key_Types_(path_r, delim_r, keys_r, headers)
-    if not keys_r: return 2
-    # Combine key types
-    results = []
-    width_k = len(keys_l)
-    range_ = range(width_k)
-    for i in range_:
-        if keys_l[i] and keys_r[i]: results.append(True)
-        else: results.append(False)
-    #
-    return [results, width_k, width_l, width_r]
-
-def Get_Key_Types_(filepath, delim, keys, headers):
-    """
-    Subfunction of Get_Key_Types() but only for one table.
-    
-    Get_Key_Types(str, str, str, bool) -> [list<bool>, int]
-    Get_Key_Types(str, str, str, str, str, str, bool) -> int
-    """
-    # Setup
-    results = len(keys)*[True]
-    key_len = len(keys)
-    range_ = range(key_len)
-    width = 0
-    # Width
-    f = open(filepath, "U")
-    line = f.readline()
-    values = line.split(delim)
-    width = len(values)
-    f.close()
-    # Processing
-    f = open(filepath, "U")
-    if headers: f.readline()
-    line = f.readline()
-    while line:
-        # Initial processing
-        values = line.split(delim)
-        if values[-1][-1] == "\n": values[-1] = values[-1][:-1]
-        # Values
-        for i in range_:
-            key_i = keys[i]
-            value = values[key_i]
-            if not value.isdigit(): results[i] = False
-        # Next
-        line = f.readline()
-    # Close and return
-    f.close()
-    return [results, width-key_len]
 
 def Get_Header_Values(path_l, delim_l, keys_l, path_r, delim_r, keys_r, join):
     """
@@ -685,14 +796,21 @@ def Get_Header_Values(path_l, delim_l, keys_l, path_r, delim_r, keys_r, join):
     results = results + values_l + values_r
     return results
 
-def Process_Table(filepath, delim, keys, key_types, headers, repeats):
+def Process_Table(filepath, delim, keys, headers, repeats, integers,
+            binary=False):
     """
     Read in the data in a table file and store that data in a dictionary, with
     the dictionary key being a tuple composed of the values of the table's keys.
     Return that dictionary, a list of all the keys in the order in which they
-    occurred, and the number of rows of data in the file.
+    occurred, the number of rows of data in the file, the number of non-key
+    columns in the table, and a list of booleans describing whether or not each
+    key column contains only digit-only strings.
     Return an empty list if the key is non-unique.
     
+    The file is only read once. The keys are stored as strings. Key columns
+    which turn out to contain only integers can be converted afterwards, using
+    Convert_Key_Types().
+    
     When repeats are allowed, a key may return the results of multiple rows of
     data as a multi-element list. When repeats are not allowed, a key will
     return a single-element list, with that single element being the data of the
@@ -713,12 +831,6 @@ def Process_Table(filepath, delim, keys, key_types, headers, repeats):
             A list of the column numbers for the columns which comprise the key
             for the table.
             (Uses a 0-index system.)
-    @key_types
-            (list<bool>)
-            A list of booleans corresponding to the columns specified by [keys].
-            A "True" indicates that that column should be treated as integers
-            while a "False" indicates that that column should be treated as
-            strings.
     @headers
             (bool)
             Whether or not there are headers in the input file. If this is set
@@ -735,26 +847,37 @@ def Process_Table(filepath, delim, keys, key_types, headers, repeats):
             an entry with a particular key will be used for all instances. If
             two entries have the same key but different values, this will result
             in inaccuracies.
-    
-    Process_Table(str, str, list<int>, list<bool>, bool) ->
-            [dict<tuple<str>:list<list<str>>>, list<tuple<str>>, int]
-    Process_Table(str, str, list<int>, list<bool>, bool) -> []
+    @integers
+            (bool)
+            Whether or not to check if the key columns contain only digit-only
+            strings. If this is set to False, all the booleans returned will be
+            False.
+    @binary
+            (bool)
+            Whether or not to read the file as raw bytes, instead of in
+            universal newline mode. If so, only "\n" is treated as a newline,
+            and any "\r" is kept as part of the last value of its row.
+    
+    Process_Table(str, str, list<int>, bool, bool, bool, bool) ->
+            [dict<tuple<str>:list<list<str>>>, list<tuple<str>>, int, int,
+            list<bool>]
+    Process_Table(str, str, list<int>, bool, bool, bool, bool) -> []
     """
     # Setup
     results_data = {}
     results_keys = []
     rows = 0
-    warning_list = []
-    warning_list_count = 0
-    warning_list_count_u = 0
+    digits = len(keys)*[integers]
     #
     range_ = range(len(keys))
-    f = open(filepath, "U")
+    if binary: f = open(filepath, "rb")
+    else: f = open(filepath, "U")
     # Sort for popping
     sorted_keys = sorted(keys, None, None, True)
-    # Header and first line
-    if headers: f.readline()
+    # Width, header and first line
     line = f.readline()
+    width = len(line.split(delim)) - len(keys)
+    if headers: line = f.readline()
     # Iterate
     while line:
         rows += 1
@@ -764,16 +887,15 @@ def Process_Table(filepath, delim, keys, key_types, headers, repeats):
         # Key
         key = []
         for i in range_:
-            key_i = keys[i]
-            is_int = key_types[i]
-            value = values[key_i]
-            if is_int: value = int(value)
+            value = values[keys[i]]
+            if digits[i] and not value.isdigit(): digits[i] = False
             key.append(value)
         key = tuple(key)
         if key == ("",): # Empty key from bad Excel exports
             pass
         elif key in results_data and not repeats: # Non-unique key
             printE(STR__non_unique_key.format(s = key))
+            f.close()
             return []
         else: # Valid key
             # Pop
@@ -781,33 +903,214 @@ def Process_Table(filepath, delim, keys, key_types, headers, repeats):
             # Process
             if key in results_data:
                 results_data[key].append(values)
-                if results_data[key] != values:
-                    warning_list_count += 1
-                    if warning_list_count_u < UNEQUAL_DUPLICATE_EXAMPLES:
-                        if key not in warning_list:
-                            warning_list_count_u += 1
-                            if (warning_list_count_u ==
-                                    UNEQUAL_DUPLICATE_EXAMPLES):
-                                warning_list.append("...")
-                            else:
-                                warning_list.append(key)
             else:
                 results_data[key] = [values]
             results_keys.append(key)
         # Next
+        line = next(f, "")
+    #
+    f.close()
+    return [results_data, results_keys, rows, width, digits]
+
+def Process_Table__COMPACT(filepath, delim, keys, headers, repeats, integers,
+            binary=True):
+    """
+    A version of Process_Table() which uses much less memory. Instead of the
+    non-key values of each row, only the byte offset of each row is stored, in
+    an array. The rows can be read from the file again, using a Row_Fetcher.
+    
+    See Process_Table() for details on the parameters. The file is always read
+    as raw bytes, so that the byte offsets are exact, so [binary] is ignored.
+    
+    Process_Table__COMPACT(str, str, list<int>, bool, bool, bool, bool) ->
+            [dict<tuple<str>:array<int>>, list<tuple<str>>, int, int,
+            list<bool>]
+    Process_Table__COMPACT(str, str, list<int>, bool, bool, bool, bool) -> []
+    """
+    # Setup
+    results_data = {}
+    results_keys = []
+    rows = 0
+    digits = len(keys)*[integers]
+    range_ = range(len(keys))
+    max_split = max(keys) + 1
+    f = open(filepath, "rb")
+    # Width, header and first line
+    offset = 0
+    line = f.readline()
+    width = len(line.split(delim)) - len(keys)
+    if headers:
+        offset += len(line)
+        line = f.readline()
+    # Iterate
+    while line:
+        rows += 1
+        # String to values
+        values = line.split(delim, max_split)
+        if len(values) <= max_split: # Last column is part of the key
+            last = values[-1]
+            if last[-1:] == "\n": last = last[:-1]
+            if last[-1:] == "\r": last = last[:-1]
+            values[-1] = last
+        # Key
+        key = []
+        for i in range_:
+            value = values[keys[i]]
+            if digits[i] and not value.isdigit(): digits[i] = False
+            key.append(value)
+        key = tuple(key)
+        if key == ("",): # Empty key from bad Excel exports
+            pass
+        elif key in results_data:
+            if not repeats: # Non-unique key
+                printE(STR__non_unique_key.format(s = key))
+                f.close()
+                return []
+            results_data[key].append(offset)
+            results_keys.append(key)
+        else: # Valid key
+            results_data[key] = array(ARRAY_TYPE__offsets, [offset])
+            results_keys.append(key)
+        # Next
+        offset += len(line)
         line = f.readline()
-    # Duplicates warning
-    if WARN_UNEQUAL_DUPLICATES and warning_list_count:
-        warning_list = [str(i) for i in warning_list]
-        warning_string = "\n    ".join(warning_list)
-        printM(STR__unequal_duplicates.format(n=warning_list_count,
-                s=warning_string))
     #
     f.close()
-    return [results_data, results_keys, rows]
+    return [results_data, results_keys, rows, width, digits]
+
+def Convert_Key_Types(dict_, keys, key_types, repeats):
+    """
+    Convert the values in the specified key columns from strings to integers,
+    and return a new dictionary and list of keys, in the same format as those
+    returned by Process_Table().
+    Return an empty list if the converted key is non-unique.
+    
+    Rows whose keys only become identical after conversion (such as "01" and
+    "1") are treated as duplicates, in the order in which they occurred in the
+    file.
+    
+    @dict_
+            (dict<tuple<str>:list<list<str>>>)
+            A dictionary containing the data from a table, as returned by
+            Process_Table().
+    @keys
+            (list<tuple<str>>)
+            A list of all the keys in the order in which they occurred, as
+            returned by Process_Table().
+    @key_types
+            (list<bool>)
+            A list of booleans corresponding to the key columns. A "True"
+            indicates that that column should be treated as integers while a
+            "False" indicates that that column should be treated as strings.
+    @repeat
+            (bool)
+            Whether or not duplicate entries (as determined by the key) are
+            allowed.
+    
+    Convert_Key_Types(dict<tuple<str>:list<list<str>>>, list<tuple<str>>,
+            list<bool>, bool) -> [dict<tuple:list<list<str>>>, list<tuple>]
+    Convert_Key_Types(dict<tuple<str>:list<list<str>>>, list<tuple<str>>,
+            list<bool>, bool) -> []
+    """
+    # Setup
+    results_data = {}
+    results_keys = []
+    converted = {}
+    cursors = {}
+    range_ = range(len(key_types))
+    # Iterate, in the original order of the rows
+    for key in keys:
+        if key in converted:
+            new_key = converted[key]
+        else:
+            new_key = []
+            for i in range_:
+                value = key[i]
+                if key_types[i]: value = int(value)
+                new_key.append(value)
+            new_key = tuple(new_key)
+            converted[key] = new_key
+            cursors[key] = 0
+        index = cursors[key]
+        cursors[key] = index + 1
+        rows = dict_[key]
+        if new_key in results_data:
+            if not repeats: # Non-unique key
+                printE(STR__non_unique_key.format(s = new_key))
+                return []
+            results_data[new_key].append(rows[index])
+        else:
+            results_data[new_key] = rows[index:index+1] # Same type as [rows]
+        results_keys.append(new_key)
+    #
+    return [results_data, results_keys]
+
+def Warn_Unequal_Duplicates(keys):
+    """
+    Print a warning if any of the keys in [keys] occur more than once, along
+    with a number of examples of those keys.
+    
+    @keys
+            (list<tuple>)
+            A list of all the keys of a table, in the order in which they
+            occurred, as returned by Process_Table().
+    
+    Warn_Unequal_Duplicates(list<tuple>) -> None
+    """
+    if not WARN_UNEQUAL_DUPLICATES: return
+    # Setup
+    seen = set([])
+    warnings = [0, []]
+    # Iterate
+    for key in keys:
+        if key in seen:
+            Add_Unequal_Duplicate(warnings, key)
+        else:
+            seen.add(key)
+    # Print
+    Print_Unequal_Duplicates(warnings[0], warnings[1])
+
+def Add_Unequal_Duplicate(warnings, key):
+    """
+    Record a duplicate entry with the key [key] in [warnings], which is a list
+    containing the number of duplicate entries so far, and a list of examples
+    of their keys.
+    
+    Add_Unequal_Duplicate([int, list<tuple>], tuple) -> None
+    """
+    warnings[0] += 1
+    examples = warnings[1]
+    if len(examples) < UNEQUAL_DUPLICATE_EXAMPLES and key not in examples:
+        if len(examples) + 1 == UNEQUAL_DUPLICATE_EXAMPLES:
+            examples.append("...")
+        else:
+            examples.append(key)
+
+def Hash_Key(key):
+    """
+    Return a 64-bit digest of the key [key], as an integer. Used in place of the
+    key itself, to detect duplicate keys in a streamed table, in much less
+    memory. Two different keys have a negligible chance of sharing a digest.
+    
+    Hash_Key(tuple<str>) -> int
+    """
+    return struct.unpack("<q", hashlib.md5(repr(key)).digest()[:8])[0]
+
+def Print_Unequal_Duplicates(count, examples):
+    """
+    Print a warning about [count] duplicate entries, listing the keys in
+    [examples], if [count] is not 0.
+    
+    Print_Unequal_Duplicates(int, list<tuple>) -> None
+    """
+    if count:
+        examples = [str(i) for i in examples]
+        string = "\n    ".join(examples)
+        printM(STR__unequal_duplicates.format(n=count, s=string))
 
 def Write_Table__DICTs(dict_l, keys_l, blank_l, dict_r, keys_r, blank_r,
-            path_out, delim_out, join, header_values):
+            path_out, delim_out, join, header_values, format_l=None,
+            format_r=None):
     """
     Write the data, obtained from the input table files, into the output file.
     Return the metrics of the operation as a list. The integers in this list
@@ -866,13 +1169,23 @@ def Write_Table__DICTs(dict_l, keys_l, blank_l, dict_r, keys_r, blank_r,
             A list of the column header strings for the output file. An empty
             list is supplied here if no headers are to be written to the output
             file.
+    @format_l/format_r
+            (function)
+            (Optional)
+            The functions which turn a row of the left/right table, as stored
+            in [dict_l]/[dict_r], into a string for the output file. By
+            default, the non-key values are joined using [delim_out]. For
+            compact row storage, where only the byte offsets of the rows are
+            stored, the Get() method of a Row_Fetcher is used instead.
         
     Write_Table__DICTs(dict<tuple:list<str>>, list<tuple>, str,
-            dict<tuple:list<str>>, list<tuple>, str, str, str, int, bool) ->
-            [int, int, int]
+            dict<tuple:list<str>>, list<tuple>, str, str, str, int, bool,
+            function, function) -> [int, int, int]
     """
+    if not format_l: format_l = delim_out.join
+    if not format_r: format_r = delim_out.join
     # Setup
-    o = open(path_out, "w")
+    o = WRITER.Open_Buffered(path_out)
     # Metrics
     lines_o = 0
     lines_l_o = 0
@@ -883,121 +1196,827 @@ def Write_Table__DICTs(dict_l, keys_l, blank_l, dict_r, keys_r, blank_r,
         o.write(header_str)
     # Join type
     if join == JOIN.INNER:
-        all_keys = []
-        for key in keys_l:
-            if key in dict_r: all_keys.append(key)
+        all_keys = [key for key in keys_l if key in dict_r]
     elif join == JOIN.LEFT:
         all_keys = keys_l
     elif join == JOIN.RIGHT:
         all_keys = keys_r
     elif join == JOIN.OUTER:
-        all_keys = keys_l
-        for k in keys_r:
-            if k not in dict_l:
-                all_keys.append(k)
+        all_keys = keys_l + [key for key in keys_r if key not in dict_l]
     else: # XOR
-        all_keys = []
-        for key in keys_l:
-            if key not in dict_r: all_keys.append(key)
-        for key in keys_r:
-            if key not in dict_l: all_keys.append(key)
+        all_keys = ([key for key in keys_l if key not in dict_r] +
+                [key for key in keys_r if key not in dict_l])
     lines_o = len(all_keys)
-    # Duplicate handler
-    registrar_l = {}
-    registrar_r = {}
-    for key in keys_l: registrar_l[key] = 0
-    for key in keys_r: registrar_r[key] = 0
-    # Iterate 
+    # Duplicate handler - Which tables output every row of a duplicate key,
+    # instead of only the first row. The cursors track the next row to output,
+    # and are only created for keys with more than one row.
+    all_rows_l = join in [JOIN.LEFT, JOIN.XOR]
+    all_rows_r = join in [JOIN.RIGHT, JOIN.XOR]
+    cursors_l = {}
+    cursors_r = {}
+    # Iterate
     for key in all_keys:
-        key_list = []
-        for k in key:
-            key_list.append(str(k))
-        key_str = delim_out.join(key_list)
-        o.write(key_str)
-        if join == JOIN.INNER:
+        sb = delim_out.join([str(k) for k in key])
+        # Left
+        rows = dict_l.get(key)
+        if rows:
             lines_l_o += 1
-            lines_r_o += 1
-            val_l = dict_l[key][0]
-            str_l = delim_out.join(val_l)
-            if str_l: o.write(delim_out + str_l)
-            val_r = dict_r[key][0]
-            str_r = delim_out.join(val_r)
-            if str_r: o.write(delim_out + str_r)
-        elif join == JOIN.LEFT:
-            #
-            index_l = registrar_l[key]
-            registrar_l[key] += 1
-            #
-            lines_l_o += 1
-            val_l = dict_l[key][index_l]
-            str_l = delim_out.join(val_l)
-            if str_l: o.write(delim_out + str_l)
-            if key in dict_r:
-                lines_r_o += 1
-                val_r = dict_r[key][0]
-                str_r = delim_out.join(val_r)
-                if str_r: o.write(delim_out + str_r)
+            if all_rows_l and len(rows) > 1:
+                index = cursors_l.get(key, 0)
+                cursors_l[key] = index + 1
+                str_l = format_l(rows[index])
             else:
-                o.write(blank_r)
-        elif join == JOIN.RIGHT:
-            #
-            index_r = registrar_r[key]
-            registrar_r[key] += 1
-            #
+                str_l = format_l(rows[0])
+            if str_l: sb += delim_out + str_l
+        else:
+            sb += blank_l
+        # Right
+        rows = dict_r.get(key)
+        if rows:
             lines_r_o += 1
-            if key in dict_l:
-                lines_l_o += 1
-                val_l = dict_l[key][0]
-                str_l = delim_out.join(val_l)
-                if str_l: o.write(delim_out + str_l)
+            if all_rows_r and len(rows) > 1:
+                index = cursors_r.get(key, 0)
+                cursors_r[key] = index + 1
+                str_r = format_r(rows[index])
+            else:
+                str_r = format_r(rows[0])
+            if str_r: sb += delim_out + str_r
+        else:
+            sb += blank_r
+        o.write(sb + "\n")
+    #
+    o.close()
+    return [lines_o, lines_l_o, lines_r_o]
+
+def Join_Tables__HASH(path_l, delim_l, keys_l, path_r, delim_r, keys_r,
+            path_out, delim_out, join, sort, headers, dup_l, dup_r,
+            header_values, binary=False):
+    """
+    Subfunction of Join_Tables() for the HASH method. Only the smaller of the
+    two tables is read into memory, as a dictionary. The larger table is read
+    one row at a time, and probed against the dictionary.
+    
+    The order of the output is determined by the "driving" table, which is the
+    left table for inner and left joins, and the right table for right joins.
+    If the driving table is the larger table, the output is written as it is
+    read. Otherwise, the driving table is kept in memory, only the first row of
+    each of its keys is kept from the larger table, and the output is written
+    afterwards.
+    
+    Keys are compared as strings. The keys of the larger table are kept in
+    memory, to detect duplicate keys.
+    
+    If [binary] is True, both tables are read as raw bytes.
+    
+    Return a list of the metrics of the operation, in the format expected by
+    Report_Metrics().
+    Return an exit code of 3/4 if the table key is non-unique in the left/right
+    table.
+    Return an exit code of 5 if sorting, or an unsupported join, was specified.
+    
+    Join_Tables__HASH(str, str, list<int>, str, str, list<int>, str, str, int,
+            int, bool, bool, bool, list<str>, bool) -> list<int>
+    Join_Tables__HASH(str, str, list<int>, str, str, list<int>, str, str, int,
+            int, bool, bool, bool, list<str>, bool) -> int
+    """
+    if join not in [JOIN.INNER, JOIN.LEFT, JOIN.RIGHT]:
+        printE(STR__invalid_method_join)
+        return 5
+    if sort != SORT.NO and join != JOIN.RIGHT:
+        printE(STR__invalid_method_sort_hash)
+        return 5
+    width_k = len(keys_l)
+    # Driving table, and the other table
+    if join == JOIN.RIGHT:
+        table_d = [path_r, delim_r, keys_r, dup_r, 4]
+        table_o = [path_l, delim_l, keys_l, dup_l, 3]
+    else:
+        table_d = [path_l, delim_l, keys_l, dup_l, 3]
+        table_o = [path_r, delim_r, keys_r, dup_r, 4]
+    stream_driving = os.path.getsize(table_o[0]) <= os.path.getsize(table_d[0])
+    # Read the smaller table into memory
+    if stream_driving: path, delim, keys, repeats, error = table_o
+    else: path, delim, keys, repeats, error = table_d
+    data = Process_Table(path, delim, keys, headers, repeats, False, binary)
+    if not data: return error
+    dict_, keys_list, rows_b, width_b = data[:4]
+    Warn_Unequal_Duplicates(keys_list)
+    # Stream the larger table
+    if stream_driving:
+        metrics = Write_Table__HASH(table_d, dict_, width_b, path_out,
+                delim_out, join, headers, header_values, binary)
+    else:
+        metrics = Probe_Table__HASH(table_o, dict_, headers, binary)
+        if type(metrics) != int:
+            first_rows, rows_s, width_s = metrics
+            metrics = Write_Table__HASH_BUILT(dict_, keys_list, width_b,
+                    first_rows, width_s, path_out, delim_out, join,
+                    header_values)
+            metrics += [rows_s, width_s]
+    if type(metrics) == int: return metrics
+    lines_o, lines_l_o, lines_r_o, rows_s, width_s = metrics
+    # Metrics
+    if stream_driving != (join == JOIN.RIGHT): # Left table was streamed
+        rows_l, width_l, rows_r, width_r = rows_s, width_s, rows_b, width_b
+    else:
+        rows_l, width_l, rows_r, width_r = rows_b, width_b, rows_s, width_s
+    return [lines_o, lines_l_o, lines_r_o, rows_l, rows_r, width_k, width_l,
+            width_r]
+
+def Read_Table__HASH(filepath, delim, keys, headers, binary=False):
+    """
+    A generator which reads a table file one row at a time, and yields the key
+    and the non-key values of each row, in the same way as Process_Table().
+    Rows with empty keys are skipped. The file is read as raw bytes if [binary]
+    is True.
+    
+    Before any rows, yields the number of non-key columns in the table. After
+    all the rows, yields the number of rows of data in the file.
+    """
+    key_len = len(keys)
+    range_ = range(key_len)
+    sorted_keys = sorted(keys, None, None, True)
+    rows = 0
+    if binary: f = open(filepath, "rb")
+    else: f = open(filepath, "U")
+    # Width, header and first line
+    line = f.readline()
+    yield len(line.split(delim)) - key_len
+    if headers: line = f.readline()
+    # Iterate
+    while line:
+        rows += 1
+        values = line.split(delim)
+        if values[-1][-1] == "\n": values[-1] = values[-1][:-1]
+        key = tuple([values[keys[i]] for i in range_])
+        if key != ("",): # Not an empty key from bad Excel exports
+            for i in sorted_keys: values.pop(i)
+            yield (key, values)
+        line = next(f, "")
+    f.close()
+    yield rows
+
+def Write_Table__HASH(table_d, dict_, width_b, path_out, delim_out, join,
+            headers, header_values, binary=False):
+    """
+    Read the driving table one row at a time, probe each row against [dict_],
+    the in-memory data of the other table, and write the output as it goes.
+    
+    Return the number of lines in the output, the number of left and right
+    table lines in the output, and the number of rows and the number of non-key
+    columns in the driving table.
+    Return an exit code of 3/4 if the table key of the driving table is
+    non-unique. The output file is deleted.
+    
+    The keys of the driving table are only tracked if they are needed, to
+    detect invalid duplicates or to warn about duplicates. Only a 64-bit digest
+    of each key is kept, using Hash_Key().
+    
+    Write_Table__HASH(list, dict<tuple<str>:list<list<str>>>, int, str, str,
+            int, bool, list<str>, bool) -> list<int>
+    Write_Table__HASH(list, dict<tuple<str>:list<list<str>>>, int, str, str,
+            int, bool, list<str>, bool) -> int
+    """
+    path, delim, keys, repeats, error = table_d
+    right = (join == JOIN.RIGHT)
+    # Setup
+    o = WRITER.Open_Buffered(path_out)
+    lines_o = 0
+    lines_l_o = 0
+    lines_r_o = 0
+    track = not repeats or WARN_UNEQUAL_DUPLICATES
+    seen = set([])
+    warnings = [0, []]
+    first_rows = {}
+    # Headers
+    if header_values:
+        header_str = delim_out.join(header_values) + "\n"
+        o.write(header_str)
+    # Iterate
+    reader = Read_Table__HASH(path, delim, keys, headers, binary)
+    width_d = next(reader)
+    blank_o = width_b*delim_out
+    for item in reader:
+        if type(item) == int: # Finished
+            rows_d = item
+            break
+        key, values = item
+        # Duplicates
+        if track:
+            digest = Hash_Key(key)
+            if digest in seen:
+                if not repeats:
+                    printE(STR__non_unique_key.format(s = key))
+                    o.close()
+                    os.remove(path_out)
+                    return error
+                Add_Unequal_Duplicate(warnings, key)
+            else:
+                seen.add(digest)
+        # Probe
+        if key in dict_:
+            str_o = delim_out.join(dict_[key][0])
+            if join == JOIN.INNER:
+                if key not in first_rows: first_rows[key] = values
+                values = first_rows[key]
+        elif join == JOIN.INNER:
+            continue
+        else:
+            str_o = None
+        str_d = delim_out.join(values)
+        # Write
+        sb = delim_out.join(key)
+        if right:
+            if str_o == None: sb += blank_o
             else:
-                o.write(blank_l)
-            val_r = dict_r[key][index_r]
-            str_r = delim_out.join(val_r)
-            if str_r: o.write(delim_out + str_r)
-        elif join == JOIN.OUTER: # Outer
-            if key in dict_l:
                 lines_l_o += 1
-                val_l = dict_l[key][0]
-                str_l = delim_out.join(val_l)
-                if str_l: o.write(delim_out + str_l)
+                if str_o: sb += delim_out + str_o
+            lines_r_o += 1
+            if str_d: sb += delim_out + str_d
+        else:
+            lines_l_o += 1
+            if str_d: sb += delim_out + str_d
+            if str_o == None: sb += blank_o
             else:
-                o.write(blank_l)
-            if key in dict_r:
                 lines_r_o += 1
-                val_r = dict_r[key][0]
-                str_r = delim_out.join(val_r)
-                if str_r: o.write(delim_out + str_r)
+                if str_o: sb += delim_out + str_o
+        o.write(sb + "\n")
+        lines_o += 1
+    o.close()
+    Print_Unequal_Duplicates(warnings[0], warnings[1])
+    return [lines_o, lines_l_o, lines_r_o, rows_d, width_d]
+
+def Probe_Table__HASH(table_o, dict_, headers, binary=False):
+    """
+    Read the other (non-driving) table one row at a time, and keep only the
+    first row of each key which is also in [dict_], the in-memory data of the
+    driving table.
+    
+    Return a dictionary of those first rows, the number of rows in the table,
+    and the number of non-key columns in the table.
+    Return an exit code of 3/4 if the table key is non-unique.
+    
+    The keys of the table are tracked in the same way as in Write_Table__HASH().
+    
+    Probe_Table__HASH(list, dict<tuple<str>:list<list<str>>>, bool, bool) ->
+            [dict<tuple<str>:list<str>>, int, int]
+    Probe_Table__HASH(list, dict<tuple<str>:list<list<str>>>, bool, bool) ->
+            int
+    """
+    path, delim, keys, repeats, error = table_o
+    # Setup
+    track = not repeats or WARN_UNEQUAL_DUPLICATES
+    seen = set([])
+    warnings = [0, []]
+    first_rows = {}
+    # Iterate
+    reader = Read_Table__HASH(path, delim, keys, headers, binary)
+    width = next(reader)
+    for item in reader:
+        if type(item) == int: # Finished
+            rows = item
+            break
+        key, values = item
+        # Duplicates
+        if track:
+            digest = Hash_Key(key)
+            if digest in seen:
+                if not repeats:
+                    printE(STR__non_unique_key.format(s = key))
+                    return error
+                Add_Unequal_Duplicate(warnings, key)
+            else:
+                seen.add(digest)
+        # First rows
+        if key in dict_ and key not in first_rows: first_rows[key] = values
+    Print_Unequal_Duplicates(warnings[0], warnings[1])
+    return [first_rows, rows, width]
+
+def Write_Table__HASH_BUILT(dict_d, keys_d, width_d, first_rows, width_o,
+            path_out, delim_out, join, header_values):
+    """
+    Write the output of a hash join where the driving table has been read into
+    memory, in the order of the rows of the driving table.
+    
+    Return the number of lines in the output, and the number of left and right
+    table lines in the output.
+    
+    Write_Table__HASH_BUILT(dict<tuple<str>:list<list<str>>>, list<tuple<str>>,
+            int, dict<tuple<str>:list<str>>, int, str, str, int, list<str>)
+            -> [int, int, int]
+    """
+    right = (join == JOIN.RIGHT)
+    blank_o = width_o*delim_out
+    # Setup
+    o = WRITER.Open_Buffered(path_out)
+    lines_o = 0
+    lines_l_o = 0
+    lines_r_o = 0
+    cursors = {}
+    # Headers
+    if header_values:
+        header_str = delim_out.join(header_values) + "\n"
+        o.write(header_str)
+    # Iterate
+    for key in keys_d:
+        if key in first_rows:
+            str_o = delim_out.join(first_rows[key])
+        elif join == JOIN.INNER:
+            continue
+        else:
+            str_o = None
+        if join == JOIN.INNER:
+            values = dict_d[key][0]
+        else:
+            rows = dict_d[key]
+            if len(rows) > 1:
+                index = cursors.get(key, 0)
+                cursors[key] = index + 1
+                values = rows[index]
+            else:
+                values = rows[0]
+        str_d = delim_out.join(values)
+        # Write
+        sb = delim_out.join(key)
+        if right:
+            if str_o == None: sb += blank_o
             else:
-                o.write(blank_r)
-        else: # XOR
-            if key in dict_l:
-                #
-                index_l = registrar_l[key]
-                registrar_l[key] += 1
-                #
                 lines_l_o += 1
-                val_l = dict_l[key][index_l]
-                str_l = delim_out.join(val_l)
-                if str_l: o.write(delim_out + str_l)
+                if str_o: sb += delim_out + str_o
+            lines_r_o += 1
+            if str_d: sb += delim_out + str_d
+        else:
+            lines_l_o += 1
+            if str_d: sb += delim_out + str_d
+            if str_o == None: sb += blank_o
             else:
-                o.write(blank_l)
-            if key in dict_r:
-                #
-                index_r = registrar_r[key]
-                registrar_r[key] += 1
-                #
                 lines_r_o += 1
-                val_r = dict_r[key][index_r]
-                str_r = delim_out.join(val_r)
-                if str_r: o.write(delim_out + str_r)
-            else:
-                o.write(blank_r)
-        o.write("\n")
+                if str_o: sb += delim_out + str_o
+        o.write(sb + "\n")
+        lines_o += 1
+    o.close()
+    return [lines_o, lines_l_o, lines_r_o]
+
+def Join_Tables__MERGE(path_l, delim_l, keys_l, path_r, delim_r, keys_r,
+            path_out, delim_out, join, sort, headers, integers, dup_l, dup_r,
+            header_values):
+    """
+    Subfunction of Join_Tables() for the MERGE method. Only the keys of each
+    row, and the byte offsets of those rows, are processed. These are sorted
+    externally, in runs of up to MERGE_RUN_SIZE keys which are spilled to temp
+    files, and then merged. The rows themselves are read back from the input
+    files, using their byte offsets, as the output is written.
+    
+    The output is identical to that of the DICT method, for forward and reverse
+    sorting.
+    
+    Return a list of the metrics of the operation, in the format expected by
+    Report_Metrics().
+    Return an exit code of 3/4 if the table key is non-unique in the left/right
+    table.
+    Return an exit code of 5 if no sorting was specified.
+    
+    Join_Tables__MERGE(str, str, list<int>, str, str, list<int>, str, str, int,
+            int, bool, bool, bool, bool, list<str>) -> list<int>
+    Join_Tables__MERGE(str, str, list<int>, str, str, list<int>, str, str, int,
+            int, bool, bool, bool, bool, list<str>) -> int
+    """
+    if sort == SORT.NO:
+        printE(STR__invalid_method_sort)
+        return 5
+    reverse = (sort == SORT.REVERSE)
+    temp_dir = tempfile.mkdtemp(dir=(TEMP_DIR or None))
+    try:
+        # Scan inputs
+        width_k = len(keys_l)
+        runs_l, rows_l, width_l, digits_l = Scan_Table__MERGE(path_l, delim_l,
+                keys_l, headers, integers, temp_dir)
+        runs_r, rows_r, width_r, digits_r = Scan_Table__MERGE(path_r, delim_r,
+                keys_r, headers, integers, temp_dir)
+        
+        # Key types
+        key_types = []
+        for i in range(width_k):
+            key_types.append(integers and digits_l[i] and digits_r[i])
+        
+        # Sort keys
+        sorted_l = Sort_Table__MERGE(runs_l, key_types, reverse, dup_l,
+                temp_dir)
+        if not sorted_l: return 3
+        sorted_r = Sort_Table__MERGE(runs_r, key_types, reverse, dup_r,
+                temp_dir)
+        if not sorted_r: return 4
+        
+        # Join tables
+        blank_l = width_l*delim_out
+        blank_r = width_r*delim_out
+        metrics_out = Write_Table__MERGE(path_l, delim_l, keys_l, sorted_l,
+                blank_l, path_r, delim_r, keys_r, sorted_r, blank_r, path_out,
+                delim_out, join, reverse, header_values, temp_dir)
+    finally:
+        shutil.rmtree(temp_dir, True)
+    metrics_in = [rows_l, rows_r]
+    metrics_widths = [width_k, width_l, width_r]
+    return metrics_out + metrics_in + metrics_widths
+
+def Scan_Table__MERGE(filepath, delim, keys, headers, integers, temp_dir):
+    """
+    Read through a table file and record the key, and the byte offset, of every
+    row, in the order in which they occur. These are spilled into temp files in
+    runs of up to MERGE_RUN_SIZE keys.
+    
+    Return a list of the filepaths of the runs, the number of rows of data in
+    the file, the number of non-key columns in the table, and a list of
+    booleans describing whether or not each key column contains only digit-only
+    strings.
+    
+    See Process_Table() for details on the parameters.
+    
+    Scan_Table__MERGE(str, str, list<int>, bool, bool, str) ->
+            [list<str>, int, int, list<bool>]
+    """
+    # Setup
+    runs = []
+    run = []
+    rows = 0
+    digits = len(keys)*[integers]
+    range_ = range(len(keys))
+    max_split = max(keys) + 1
+    f = open(filepath, "rb")
+    # Width, header and first line
+    offset = 0
+    line = f.readline()
+    width = len(line.split(delim)) - len(keys)
+    if headers:
+        offset += len(line)
+        line = f.readline()
+    # Iterate
+    while line:
+        rows += 1
+        # String to values
+        values = line.split(delim, max_split)
+        if len(values) <= max_split: # Last column is part of the key
+            last = values[-1]
+            if last[-1:] == "\n": last = last[:-1]
+            if last[-1:] == "\r": last = last[:-1]
+            values[-1] = last
+        # Key
+        key = []
+        for i in range_:
+            value = values[keys[i]]
+            if digits[i] and not value.isdigit(): digits[i] = False
+            key.append(value)
+        key = tuple(key)
+        if key != ("",): # Not an empty key from bad Excel exports
+            run.append((key, offset))
+            if len(run) >= MERGE_RUN_SIZE:
+                runs.append(Write_Run(run, temp_dir))
+                run = []
+        # Next
+        offset += len(line)
+        line = f.readline()
+    if run: runs.append(Write_Run(run, temp_dir))
+    #
+    f.close()
+    return [runs, rows, width, digits]
+
+def Sort_Table__MERGE(runs, key_types, reverse, repeats, temp_dir):
+    """
+    Sort the keys and byte offsets in [runs], as produced by
+    Scan_Table__MERGE(), and merge them into a single run. Keys are converted to
+    integers first, where specified by [key_types].
+    
+    Keys are sorted in ascending order, or descending order if [reverse] is
+    True. Entries with the same key remain in the order in which they occurred
+    in the file, the same as the sorting used by the DICT method.
+    
+    Return the filepath of the merged run.
+    Return an empty string if the key is non-unique.
+    
+    Sort_Table__MERGE(list<str>, list<bool>, bool, bool, str) -> str
+    """
+    # Sort individual runs
+    convert = True in key_types
+    range_ = range(len(key_types))
+    sorted_runs = []
+    for path in runs:
+        entries = list(Read_Run(path))
+        os.remove(path)
+        if convert:
+            for i in range(len(entries)):
+                key, offset = entries[i]
+                new_key = []
+                for j in range_:
+                    value = key[j]
+                    if key_types[j]: value = int(value)
+                    new_key.append(value)
+                entries[i] = (tuple(new_key), offset)
+        entries.sort(key=itemgetter(0), reverse=reverse) # Stable
+        sorted_runs.append(Write_Run(entries, temp_dir))
+        entries = []
+    # Merge runs, checking for duplicates
+    warning_count = 0
+    warning_examples = [] # Heap of the earliest duplicates
+    merged = []
+    path_out = Get_Temp_Path(temp_dir)
+    o = open(path_out, "wb")
+    previous = None
+    for entry in Merge_Runs(sorted_runs, reverse):
+        key = entry[0]
+        if previous and key == previous[0]: # Duplicate
+            if not repeats:
+                printE(STR__non_unique_key.format(s = key))
+                o.close()
+                return ""
+            warning_count += 1
+            if first_duplicate:
+                first_duplicate = False
+                heapq.heappush(warning_examples, (-entry[1], key))
+                if len(warning_examples) > UNEQUAL_DUPLICATE_EXAMPLES:
+                    heapq.heappop(warning_examples)
+        else:
+            first_duplicate = True
+        previous = entry
+        merged.append(entry)
+        if len(merged) >= MERGE_CHUNK_SIZE:
+            marshal.dump(merged, o)
+            merged = []
+    if merged: marshal.dump(merged, o)
+    o.close()
+    for path in sorted_runs: os.remove(path)
+    # Duplicates warning
+    if WARN_UNEQUAL_DUPLICATES:
+        warning_examples.sort(reverse=True) # In the order they occurred
+        warning_list = [pair[1] for pair in warning_examples]
+        if len(warning_list) == UNEQUAL_DUPLICATE_EXAMPLES:
+            warning_list[-1] = "..."
+        Print_Unequal_Duplicates(warning_count, warning_list)
+    return path_out
+
+def Write_Table__MERGE(path_l, delim_l, keys_l, sorted_l, blank_l, path_r,
+            delim_r, keys_r, sorted_r, blank_r, path_out, delim_out, join,
+            reverse, header_values, temp_dir):
+    """
+    Join two tables by merging their sorted keys, and write the data into the
+    output file.
+    Return the metrics of the operation as a list, in the same format as
+    Write_Table__DICTs().
+    
+    Rows driven by the left table are written as the keys are merged. Rows
+    which are driven by the right table are output in the order they occur in
+    the right table, so these are sorted by their byte offsets in the right
+    table file, externally, and written afterwards.
+    
+    @sorted_l/sorted_r
+            (str - filepath)
+            The filepaths of the merged runs produced by Sort_Table__MERGE().
+    
+    See Join_Tables() and Write_Table__DICTs() for details on the other
+    parameters.
+    
+    Write_Table__MERGE(str, str, list<int>, str, str, str, str, list<int>, str,
+            str, str, str, int, bool, list<str>, str) -> [int, int, int]
+    """
+    # Setup
+    rows_l = Row_Fetcher(path_l, delim_l, keys_l, delim_out)
+    rows_r = Row_Fetcher(path_r, delim_r, keys_r, delim_out)
+    o = WRITER.Open_Buffered(path_out)
+    # Metrics
+    lines_o = 0
+    lines_l_o = 0
+    lines_r_o = 0
+    # Headers
+    if header_values:
+        header_str = delim_out.join(header_values) + "\n"
+        o.write(header_str)
+    # Join type
+    left_only = join in [JOIN.LEFT, JOIN.OUTER, JOIN.XOR]
+    left_match = join in [JOIN.INNER, JOIN.LEFT, JOIN.OUTER]
+    right_only = join in [JOIN.RIGHT, JOIN.OUTER, JOIN.XOR]
+    right_match = join == JOIN.RIGHT
+    first_only = join in [JOIN.INNER, JOIN.OUTER] # Use first rows only
+    # Right-driven rows: (offset_r, key, offset_l, offset_r_data)
+    deferred = []
+    deferred_runs = []
+    # Merge
+    stream_l = Read_Run(sorted_l)
+    stream_r = Read_Run(sorted_r)
+    entry_l = next(stream_l, None)
+    entry_r = next(stream_r, None)
+    while entry_l or entry_r:
+        # Which table(s) the next key is in
+        if not entry_r: in_l, in_r = True, False
+        elif not entry_l: in_l, in_r = False, True
+        else:
+            key_l = entry_l[0]
+            key_r = entry_r[0]
+            if key_l == key_r: in_l, in_r = True, True
+            elif (key_l < key_r) != reverse: in_l, in_r = True, False
+            else: in_l, in_r = False, True
+        # Key and first rows
+        if in_l:
+            key = entry_l[0]
+            first_l = entry_l[1]
+        else:
+            first_l = -1
+        if in_r:
+            key = entry_r[0]
+            first_r = entry_r[1]
+        else:
+            first_r = -1
+        key_str = delim_out.join([str(k) for k in key])
+        # Left-driven rows
+        if in_l and ((in_r and left_match) or (not in_r and left_only)):
+            if in_r: str_r = rows_r.Get(first_r)
+            while entry_l and entry_l[0] == key:
+                if first_only: str_l = rows_l.Get(first_l)
+                else: str_l = rows_l.Get(entry_l[1])
+                sb = key_str
+                lines_l_o += 1
+                if str_l: sb += delim_out + str_l
+                if in_r:
+                    lines_r_o += 1
+                    if str_r: sb += delim_out + str_r
+                else:
+                    sb += blank_r
+                o.write(sb + "\n")
+                lines_o += 1
+                entry_l = next(stream_l, None)
+        else:
+            while entry_l and entry_l[0] == key:
+                entry_l = next(stream_l, None)
+        # Right-driven rows
+        if in_r and ((in_l and right_match) or (not in_l and right_only)):
+            while entry_r and entry_r[0] == key:
+                offset_r = entry_r[1]
+                if first_only: data_r = first_r
+                else: data_r = offset_r
+                deferred.append((offset_r, key, first_l, data_r))
+                if len(deferred) >= MERGE_RUN_SIZE:
+                    deferred.sort()
+                    deferred_runs.append(Write_Run(deferred, temp_dir))
+                    deferred = []
+                entry_r = next(stream_r, None)
+        else:
+            while entry_r and entry_r[0] == key:
+                entry_r = next(stream_r, None)
+    # Write right-driven rows, in the order they occur in the right table
+    deferred.sort()
+    deferred_runs.append(Write_Run(deferred, temp_dir))
+    deferred = []
+    for entry in Merge_Runs(deferred_runs, False):
+        offset_r, key, offset_l, data_r = entry
+        sb = delim_out.join([str(k) for k in key])
+        if offset_l == -1:
+            sb += blank_l
+        else:
+            lines_l_o += 1
+            str_l = rows_l.Get(offset_l)
+            if str_l: sb += delim_out + str_l
+        lines_r_o += 1
+        str_r = rows_r.Get(data_r)
+        if str_r: sb += delim_out + str_r
+        o.write(sb + "\n")
+        lines_o += 1
     #
+    rows_l.Close()
+    rows_r.Close()
     o.close()
     return [lines_o, lines_l_o, lines_r_o]
 
+class Row_Fetcher:
+    """
+    Reads individual rows of a table file by their byte offsets, using a
+    memory-mapping of the file, and returns their non-key values joined into a
+    string, ready for output.
+    
+    The most recently fetched row is cached, as the same row is often fetched
+    many times in a row.
+    """
+    def __init__(self, filepath, delim, keys, delim_out):
+        self.file = open(filepath, "rb")
+        try:
+            self.buffer = mmap.mmap(self.file.fileno(), 0,
+                    access=mmap.ACCESS_READ)
+        except (ValueError, EnvironmentError): # Empty file
+            self.buffer = None
+        self.delim = delim
+        self.delim_out = delim_out
+        self.sorted_keys = sorted(keys, None, None, True)
+        self.last_offset = -1
+        self.last_string = ""
+    
+    def Get(self, offset):
+        """
+        Return the non-key values of the row starting at byte [offset], joined
+        using the output delimiter.
+        """
+        if offset == self.last_offset: return self.last_string
+        offset = int(offset) # Offsets may be stored as floats in arrays
+        buffer = self.buffer
+        end = buffer.find("\n", offset)
+        if end == -1: end = len(buffer)
+        values = buffer[offset:end].split(self.delim)
+        if values[-1][-1:] == "\r": values[-1] = values[-1][:-1]
+        for i in self.sorted_keys: values.pop(i)
+        self.last_offset = offset
+        self.last_string = self.delim_out.join(values)
+        return self.last_string
+    
+    def Close(self):
+        """
+        Close the file.
+        """
+        if self.buffer: self.buffer.close()
+        self.file.close()
+
+class _Reverse:
+    """
+    Wrapper which reverses the ordering of the object it wraps, for use with
+    heapq, which can only produce ascending orders.
+    """
+    def __init__(self, item):
+        self.item = item
+    def __lt__(self, other):
+        return other.item < self.item
+    def __eq__(self, other):
+        return self.item == other.item
+
+def Get_Temp_Path(temp_dir):
+    """
+    Create a new, empty, temp file in [temp_dir] and return its filepath.
+    
+    Get_Temp_Path(str) -> str
+    """
+    handle, path = tempfile.mkstemp(dir=temp_dir)
+    os.close(handle)
+    return path
+
+def Write_Run(entries, temp_dir):
+    """
+    Write a list of entries (tuples of strings and integers) into a new temp
+    file, in chunks of MERGE_CHUNK_SIZE entries, and return its filepath.
+    
+    Write_Run(list<tuple>, str) -> str
+    """
+    path = Get_Temp_Path(temp_dir)
+    o = open(path, "wb")
+    for i in range(0, len(entries), MERGE_CHUNK_SIZE):
+        marshal.dump(entries[i:i+MERGE_CHUNK_SIZE], o)
+    o.close()
+    return path
+
+def Read_Run(path):
+    """
+    A generator which yields the entries in a temp file written by Write_Run(),
+    one at a time.
+    """
+    f = open(path, "rb")
+    try:
+        while True:
+            try:
+                chunk = marshal.load(f)
+            except EOFError:
+                break
+            for entry in chunk:
+                yield entry
+    finally:
+        f.close()
+
+def Merge_Runs(paths, reverse):
+    """
+    A generator which merges the sorted runs in the temp files in [paths], and
+    yields their entries in sorted order.
+    
+    Entries are sorted by their first value, in descending order if [reverse]
+    is True, and then by their second value, in ascending order.
+    """
+    heap = []
+    streams = [Read_Run(path) for path in paths]
+    for i in range(len(streams)):
+        entry = next(streams[i], None)
+        if entry != None:
+            heap.append(Merge_Item(entry, i, reverse))
+    heapq.heapify(heap)
+    while heap:
+        item = heap[0]
+        entry = item[-1]
+        i = item[-2]
+        yield entry
+        entry = next(streams[i], None)
+        if entry == None: heapq.heappop(heap)
+        else: heapq.heapreplace(heap, Merge_Item(entry, i, reverse))
+
+def Merge_Item(entry, i, reverse):
+    """
+    Return the item used to order [entry] from run [i] in the heap used by
+    Merge_Runs().
+    
+    Merge_Item(tuple, int, bool) -> tuple
+    """
+    if reverse: return (_Reverse(entry[0]), entry[1], i, entry)
+    return (entry[0], entry[1], i, entry)
+
 def Report_Metrics(metrics):
     """
     Takes a set of numbers representing the metrics of the join operation and
@@ -1146,6 +2165,9 @@ def Parse_Command_Line_Input__Join_Tables(raw_command_line_input):
     integers = DEFAULT__integers
     dup_l = DEFAULT__left_dup
     dup_r = DEFAULT__right_dup
+    method = DEFAULT__method
+    compact = DEFAULT__compact
+    binary = DEFAULT__binary
     
     # Parse the rest
     while inputs:
@@ -1154,7 +2176,8 @@ def Parse_Command_Line_Input__Join_Tables(raw_command_line_input):
             if arg in ["-o"]:
                 arg2 = inputs.pop(0)
                 arg3 = inputs.pop(0)
-            elif arg in ["-j", "-s", "-h", "-i", "-l", "-r"]:
+            elif arg in ["-j", "-s", "-h", "-i", "-l", "-r", "-m", "-c",
+                    "-b"]:
                 arg2 = inputs.pop(0)
             else:
                 printE(STR__invalid_flag.format(s = arg))
@@ -1179,7 +2202,7 @@ def Parse_Command_Line_Input__Join_Tables(raw_command_line_input):
             else:
                 printE(STR__invalid_file_format.format(io = "output", s = arg3))
                 return 1
-        elif arg in ["-h", "-i", "-l", "-r"]:
+        elif arg in ["-h", "-i", "-l", "-r", "-c", "-b"]:
             bool_ = Validate_Bool(arg2)
             if bool_ == None:
                 printE(STR__invalid_bool.format(s = arg2))
@@ -1189,17 +2212,36 @@ def Parse_Command_Line_Input__Join_Tables(raw_command_line_input):
                 elif arg == "-i": integers = bool_
                 elif arg == "-l": dup_l = bool_
                 elif arg == "-r": dup_r = bool_
+                elif arg == "-c": compact = bool_
+                elif arg == "-b": binary = bool_
         elif arg in ["-s"]:
             sort = Validate_Sort(arg2)
             if not sort:
                 printE(STR__invalid_sort.format(s = arg2))
                 return 1
+        elif arg in ["-m"]:
+            method = DICT__method.get(arg2, 0)
+            if not method:
+                printE(STR__invalid_method.format(s = arg2))
+                return 1
         else: # "-j" Flag - Join options
             join = DICT__join.get(arg2, 0)
             if not join:
                 printE(STR__invalid_join.format(s = arg2))
                 return 1
     
+    # Method and sorting
+    if method == METHOD.MERGE and sort == SORT.NO:
+        printE(STR__invalid_method_sort)
+        return 1
+    if method == METHOD.HASH:
+        if join not in [JOIN.INNER, JOIN.LEFT, JOIN.RIGHT]:
+            printE(STR__invalid_method_join)
+            return 1
+        if sort != SORT.NO and join != JOIN.RIGHT:
+            printE(STR__invalid_method_sort_hash)
+            return 1
+    
     # Default path generation
     if not path_out:
         delim_out = delim_l
@@ -1207,7 +2249,8 @@ def Parse_Command_Line_Input__Join_Tables(raw_command_line_input):
     
     # Run program
     exit_code = Join_Tables(path_l, delim_l, keys_l, path_r, delim_r, keys_r,
-            path_out, delim_out, join, sort, headers, integers, dup_l, dup_r)
+            path_out, delim_out, join, sort, headers, integers, dup_l, dup_r,
+            method, compact, binary)
     
     # Irregular exit codes
     if exit_code == 1:
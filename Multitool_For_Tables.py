@@ -1,6 +1,6 @@
 HELP_DOC = """
 MULTITOOL FOR TABLES
-(version 1.1)
+(version 1.10.2)
 by Angelo Chan
 
 This is a multi-purpose tool for parsing table files. It combines the
@@ -77,7 +77,9 @@ USAGE:
             [-f include|exclude <col_no> <criteria> C|V <col_no>|<value>]...
             [-k <col_nos>]... [-n <header> <contents>]...
             [-c <header> <col_operation> <col_nos>]...
-            [-u <col_nos>]
+            [-u <col_nos>] [-w <workers>] [-q Y|N] [-v Y|N]
+            [-d exact|hash64|hash128|disk|bloom]
+            [-b <expected_keys> <error_rate>]
 
 
 
@@ -277,6 +279,89 @@ OPTIONAL:
                             rounded to the nearest integer.
             {G}eo_{IN}t   - Calculate the geometric mean of multiple columns,
                             rounded to the nearest integer.
+    
+    workers
+        
+        (DEFAULT: 1)
+        
+        The number of processes to use. If more than one is specified, the file
+        is split into chunks, which are filtered and processed in parallel, and
+        then combined in the original order. Cannot be used with "-u", as rows
+        can only be checked for uniqueness in order.
+    
+    (-q)
+        
+        (DEFAULT: N)
+        
+        Whether or not to use the fast filtering mode. Each row stops being
+        checked as soon as it fails an "include" filter or meets an "exclude"
+        filter. The filters are also reordered, so that the filters which are
+        cheap to check, and which reject the most rows at the start of the file,
+        are checked first. The number of rows which met each criteria will not
+        be reported.
+    
+    (-v)
+        
+        (DEFAULT: N)
+        
+        Whether or not to use the vectorised mode, which requires NumPy. Rows
+        are processed in blocks. Each filter is checked against a whole block at
+        once, and the calculated columns of each block are calculated as
+        arrays. The output is the same, but the reported column totals may
+        differ slightly, in the last few significant digits. Blocks which cannot
+        be processed this way, such as blocks with calculated columns which
+        contain values which are not numbers, are processed one row at a time.
+    
+    exact|hash64|hash128|disk|bloom
+        
+        (DEFAULT: exact)
+        
+        How the keys of rows are stored when removing non-unique rows with
+        "-u". The amount of memory used is reported with the other metrics.
+        
+        exact
+            Store the values of every key. Uses the most memory.
+        
+        hash64
+            Store a 64-bit hash of every key, which uses much less memory for
+            large keys. There is a very small chance of two different keys
+            having the same hash, in which case a unique row will be removed.
+            This becomes likely with around a billion unique keys or more.
+        
+        hash128
+            Store a 128-bit hash of every key. Uses a little more memory than
+            hash64, but the chance of two keys having the same hash is
+            negligible.
+        
+        disk
+            Store the keys in temp files, which are split by the hash of the
+            key. The file is read twice: once to find the non-unique rows, one
+            temp file at a time, and once to write the output. Uses the least
+            memory, regardless of the number of keys, but is slower.
+        
+        bloom
+            Store the keys in a Bloom filter, which uses a fixed amount of
+            memory, set by <expected_keys> and <error_rate>. A small fraction of
+            unique rows, up to around <error_rate>, may be wrongly removed as
+            non-unique. An estimate of how many rows this may have happened to
+            is reported with the other metrics. For exploratory use only.
+    
+    expected_keys
+        
+        (DEFAULT: 100000000)
+        
+        The number of unique keys the Bloom filter is sized for. If more unique
+        keys than this are found, the chance of a unique row being wrongly
+        removed will exceed <error_rate>. The default uses around 170 MB of
+        memory with the default <error_rate>. The memory used is proportional
+        to <expected_keys>.
+    
+    error_rate
+        
+        (DEFAULT: 0.001)
+        
+        The chance of a unique row being wrongly removed as non-unique, once
+        <expected_keys> unique keys have been found. Must be between 0 and 1.
 
 
 
@@ -328,6 +413,29 @@ EXAMPLES EXPLANATION:
     11:
     Keep all the data, except rows where the 4th column contains "A", "B", or
     "C".
+    
+    12:
+    Keep only the data entries whose value in column 3 is greater than or equal
+    to 1000, using 8 processes.
+    
+    13:
+    Keep only the data entries which meet many criteria, using the fast
+    filtering mode.
+    
+    14:
+    Calculate the sum of columns 4 and 5, and the product of columns 4, 5 and 6,
+    using the vectorised mode.
+    
+    15:
+    Keep all the data, but remove all duplicate entries after the first
+    occurence, where duplicates are defined by the values in columns 1, 2 and
+    3. Store the keys in temp files rather than in memory.
+    
+    16:
+    Keep all the data, but remove all duplicate entries after the first
+    occurence, where duplicates are defined by the values in column 1. Use a
+    Bloom filter sized for 10 million unique keys, which will wrongly remove
+    no more than 1 in 10000 unique rows.
 
 EXAMPLES:
     
@@ -370,6 +478,24 @@ EXAMPLES:
     
     11:
     python27 Multitool_For_Tables.py Path/Input.tsv tsv -k ALL -f 4 IN ABC
+    
+    12:
+    python27 Multitool_For_Tables.py Path/Input.tsv tsv -f 3 ">=" v 1000 -w 8
+    
+    13:
+    python27 Multitool_For_Tables.py Path/Input.tsv tsv -f 1 str_eq v A
+            -f 2 flo_eq! v 0 -f 3 cont! v X -f 4 ">" c 5 -q Y
+    
+    14:
+    python27 Multitool_For_Tables.py Path/Input.tsv tsv -k ALL
+            -c Total sum 4_5 -c Product product 4_5_6 -v Y
+    
+    15:
+    python27 Multitool_For_Tables.py Path/Input.tsv tsv -u 1_2_3 -k ALL -d disk
+    
+    16:
+    python27 Multitool_For_Tables.py Path/Input.tsv tsv -u 1 -k ALL -d bloom -b
+            10000000 0.0001
 
 
 
@@ -381,7 +507,9 @@ USAGE:
             [-f include|exclude <col_no> <criteria> C|V <col_no>|<value>]...
             [-k <col_nos>]... [-n <header> <contents>]...
             [-c <header> <col_operation> <col_nos>]...
-            [-u <col_nos>]
+            [-u <col_nos>] [-w <workers>] [-q Y|N] [-v Y|N]
+            [-d exact|hash64|hash128|disk|bloom]
+            [-b <expected_keys> <error_rate>]
 """
 
 
@@ -429,12 +557,26 @@ COL_NAME_MIN_DIGITS = 3
 
 FILEMOD = "__MT"
 
+FAST_SAMPLE_SIZE = 1000 # Number of rows used to reorder filters, in fast mode
+
+DEDUP_PARTITIONS = 64 # Number of temp files the keys are split into, disk mode
+UNIQUE_KEYS_SAMPLE = 100 # Number of keys used to estimate their memory usage
+
+VECTORISED_BLOCK_SIZE = 10000 # Number of rows per block, in vectorised mode
+VECTORISED_INT_LIMIT = 2**53 # Largest integer which a float can hold exactly
+
 
 
 # Defaults #####################################################################
 "NOTE: altering these will not alter the values displayed in the HELP DOC"
 
 DEFAULT__new_headers = False
+DEFAULT__workers = 1
+DEFAULT__fast = False
+DEFAULT__vectorised = False
+DEFAULT__dedup = 1 #EXACT
+DEFAULT__bloom_keys = 100000000
+DEFAULT__bloom_error = 0.001
 
 DEFAULT_list_delim = "_"
 
@@ -443,9 +585,28 @@ DEFAULT_list_delim = "_"
 # Imported Modules #############################################################
 
 import sys
+import os
+import shutil
+import tempfile
+import multiprocessing
+import itertools
+import hashlib
+import struct
+
+try:
+    import resource # Optional. Only used to report peak memory usage
+except ImportError:
+    resource = None
+
+try:
+    import numpy # Optional. Only used in vectorised mode
+except ImportError:
+    numpy = None
 
 import _Controlled_Print as PRINT
 from _Command_Line_Parser import * # 2.7
+import _Sketches as SKETCHES # 1.0
+import _Buffered_Writer as WRITER # 1.0
 
 from Table_File_Reader import * # 2.0
 
@@ -504,6 +665,15 @@ class COL_TYPE:
 
 
 
+class DEDUP:
+    EXACT=1
+    HASH64=2
+    HASH128=3
+    DISK=4
+    BLOOM=5
+
+
+
 # Strings ######################################################################
 
 STR__use_help = "\nUse the -h option for help:\n\t python "\
@@ -576,6 +746,36 @@ STR__invalid_header_order = """
 ERROR: Invalid header order. Please ensure that REARRANGE is specified last.
 """
 
+STR__invalid_workers = """
+ERROR: Invalid number of workers: {s}
+Please specify a positive integer.
+"""
+STR__workers_unique = """
+ERROR: Multiple workers cannot be used when removing non-unique rows.
+"""
+
+STR__invalid_dedup = """
+ERROR: Invalid method for removing non-unique rows: {s}
+Please specify one of the following:
+    exact
+    hash64
+    hash128
+    disk
+    bloom
+"""
+STR__invalid_bloom_keys = """
+ERROR: Invalid number of expected keys: {s}
+Please specify a positive integer.
+"""
+STR__invalid_bloom_error = """
+ERROR: Invalid error rate: {s}
+Please specify a number between 0 and 1.
+"""
+
+STR__no_numpy = """
+ERROR: The vectorised mode requires NumPy, which could not be imported.
+"""
+
 
 
 STR__m4t_begin = "\nRunning Multitool_For_Tables..."
@@ -606,6 +806,25 @@ STR__metrics = """
 
 STR__metrics_spacer = "\n                      "
 
+STR__metrics_memory = """
+    MEMORY
+        
+        Unique keys method: {M}
+        Unique keys stored: {N}
+          Unique keys size: {S}
+         Peak memory usage: {P}
+"""
+
+STR__metrics_bloom = """
+    BLOOM FILTER
+        
+       False positive rate: {R:.2g}
+        Wrongly eliminated: Up to {E} (estimated)
+"""
+
+STR__memory_size = "{N:.1f} MB"
+STR__memory_unknown = "Unknown"
+
 
 
 # Lists ########################################################################
@@ -696,12 +915,40 @@ LIST__2_col_ops = [OPERATION.SUB, OPERATION.DIV, OPERATION.DIF]
 
 
 
+# Unique keys methods
+LIST__exact = ["E", "e", "EXACT", "Exact", "exact"]
+LIST__hash64 = ["H64", "h64", "HASH64", "Hash64", "hash64", "HASH_64",
+        "Hash_64", "hash_64"]
+LIST__hash128 = ["H128", "h128", "HASH128", "Hash128", "hash128", "HASH_128",
+        "Hash_128", "hash_128"]
+LIST__disk = ["D", "d", "DISK", "Disk", "disk"]
+LIST__bloom = ["B", "b", "BLOOM", "Bloom", "bloom"]
+
+
+
 # Dictionaries #################################################################
 
 DICT__header = DICT__keep_skip_rear
 
 
 
+DICT__dedup = {}
+for i in LIST__exact: DICT__dedup[i] = DEDUP.EXACT
+for i in LIST__hash64: DICT__dedup[i] = DEDUP.HASH64
+for i in LIST__hash128: DICT__dedup[i] = DEDUP.HASH128
+for i in LIST__disk: DICT__dedup[i] = DEDUP.DISK
+for i in LIST__bloom: DICT__dedup[i] = DEDUP.BLOOM
+
+DICT__dedup_str = {
+    DEDUP.EXACT: "Exact",
+    DEDUP.HASH64: "64-bit hashes",
+    DEDUP.HASH128: "128-bit hashes",
+    DEDUP.DISK: "Disk",
+    DEDUP.BLOOM: "Bloom filter"
+    }
+
+
+
 DICT__criteria = {}
 for i in LIST__str_eq: DICT__criteria[i] = CRITERIA.STR_EQ
 for i in LIST__str_neq: DICT__criteria[i] = CRITERIA.STR_NOT_EQ
@@ -735,6 +982,54 @@ DICT__criteria_str = {
     CRITERIA.FLO_NOT_EQ: "float!="
     }
 
+DICT__criteria_code = { # Used by Compile_Filters(). {A} and {B} are the values
+    CRITERIA.STR_EQ: "{A} == {B}",
+    CRITERIA.STR_NOT_EQ: "{A} != {B}",
+    CRITERIA.CONTAINS: "{B} in {A}",
+    CRITERIA.NOT_CONTAIN: "{B} not in {A}",
+    CRITERIA.IN: "{A} in {B}",
+    CRITERIA.NOT_IN: "{A} not in {B}",
+    CRITERIA.GREATER_THAN: "{A} > {B}",
+    CRITERIA.GREAQUALS: "{A} >= {B}",
+    CRITERIA.LESS_THAN: "{A} < {B}",
+    CRITERIA.LEQUALS: "{A} <= {B}",
+    CRITERIA.INT_EQ: "{A} == {B}",
+    CRITERIA.INT_NOT_EQ: "{A} != {B}",
+    CRITERIA.FLO_EQ: "{A} == {B}",
+    CRITERIA.FLO_NOT_EQ: "{A} != {B}"
+    }
+
+DICT__criteria_convert = { # Numeric criteria, and their conversion functions
+    CRITERIA.INT_EQ: int,
+    CRITERIA.INT_NOT_EQ: int,
+    CRITERIA.FLO_EQ: float,
+    CRITERIA.FLO_NOT_EQ: float
+    }
+
+DICT__typed_code = { # Used by Compile_Filters() when typed values are shared.
+    #                  The function which gets the typed value, and a check for
+    #                  whether the conversion succeeded. {V} is the value.
+    int: ["Get_Number", "type({V}) in INTEGER_TYPES"],
+    float: ["Get_Float", "{V} != None"]
+    }
+
+DICT__criteria_cost = { # Rough relative cost of each criteria, per value
+    CRITERIA.STR_EQ: 1,
+    CRITERIA.STR_NOT_EQ: 1,
+    CRITERIA.CONTAINS: 2,
+    CRITERIA.NOT_CONTAIN: 2,
+    CRITERIA.IN: 2,
+    CRITERIA.NOT_IN: 2,
+    CRITERIA.GREATER_THAN: 1,
+    CRITERIA.GREAQUALS: 1,
+    CRITERIA.LESS_THAN: 1,
+    CRITERIA.LEQUALS: 1,
+    CRITERIA.INT_EQ: 4,
+    CRITERIA.INT_NOT_EQ: 4,
+    CRITERIA.FLO_EQ: 4,
+    CRITERIA.FLO_NOT_EQ: 4
+    }
+
 
 
 DICT__operation = {}
@@ -778,10 +1073,61 @@ PRINT.PRINT_METRICS = PRINT_METRICS
 
 
 
+# Classes ######################################################################
+
+class Duplicate_Flags:
+    """
+    A set-like record of which rows have a non-unique key, as found by
+    Find_Duplicates__DISK(). Used in place of a set of keys when removing
+    non-unique rows.
+    
+    Each row which passes the filters is given an ordinal by Generate_Key(), in
+    the order they are read, which is then checked against the flags instead of
+    the key itself.
+    """
+    def __init__(self, flags, count, size):
+        """
+        @flags
+                (bytearray)
+                One bit for every row which passes the filters. The bit is set
+                if the row has a key which was already seen in an earlier row.
+        @count
+                (int)
+                The number of unique keys in the largest temp file.
+        @size
+                (int)
+                The memory used, in bytes, to store the keys of the largest temp
+                file.
+        """
+        self.flags = flags
+        self.count = count
+        self.size = size
+        self.index = -1
+    
+    def Generate_Key(self, values, key_cols):
+        """
+        Return the ordinal of the current row. Takes the same arguments as
+        the Generate_Key() function so it can be used in its place.
+        
+        Generate_Key(list<str>, list<int>) -> int
+        """
+        self.index += 1
+        return self.index
+    
+    def __contains__(self, index):
+        return self.flags[index >> 3] & (1 << (index & 7))
+    
+    def add(self, index):
+        pass
+
+
+
 # Table Processing Functions ###################################################
 
 def Multitool_For_Tables(path_in, delim_in, path_out, delim_out,
-        new_headers, header_specs, filters, new_column_specs, unique_cols):
+        new_headers, header_specs, filters, new_column_specs, unique_cols,
+        workers=1, fast=False, vectorised=False, dedup=DEDUP.EXACT,
+        bloom_keys=DEFAULT__bloom_keys, bloom_error=DEFAULT__bloom_error):
     """
     Parse a table file. Possible functionality includes:
         - Converting the file format
@@ -908,10 +1254,46 @@ def Multitool_For_Tables(path_in, delim_in, path_out, delim_out,
             the specified columns needs to be unique across the entire file.
             Uses the 1-index system. (The first column's index number is 1)
             0 is used to signify an empty column.
+    @workers
+            (int)
+            The number of processes to use. If more than one, the rows of the
+            file are processed in chunks, in parallel, using
+            Process_Chunks_Parallel(). Cannot be used with [unique_cols].
+    @fast
+            (bool)
+            Whether or not to use the fast filtering mode, in which filters are
+            reordered using Order_Filters(), and each row is only checked until
+            it fails a filter. The number of rows which meet each filtering
+            criteria is not tracked or reported.
+    @vectorised
+            (bool)
+            Whether or not to use the vectorised mode, in which rows are
+            filtered and the new columns are constructed for blocks of rows at
+            a time, using Process_Rows__VECTORISED(). Requires NumPy.
+    @dedup
+            (int) - Pseudo ENUM
+            How the keys of rows are stored when removing non-unique rows:
+                1:  EXACT - A set of the keys
+                2:  HASH64 - A set of the 64-bit hashes of the keys
+                3:  HASH128 - A set of the 128-bit hashes of the keys
+                4:  DISK - Temp files, using Find_Duplicates__DISK()
+                5:  BLOOM - A Bloom filter, which may wrongly find a small
+                        fraction of unique keys to be non-unique
+    @bloom_keys
+            (int)
+            The number of unique keys the Bloom filter is sized for, if used.
+    @bloom_error
+            (float)
+            The chance of the Bloom filter wrongly finding a key to be
+            non-unique, once [bloom_keys] unique keys have been found.
     
     Multitool_For_Tables(str, str, str, str, bool, list<*>, list<*>, list<*>,
-            list<int>) -> int
+            list<int>, int, bool, bool, int, int, float) -> int
     """
+    if vectorised and not numpy:
+        PRINT.printE(STR__no_numpy)
+        return 1
+    
     PRINT.printP(STR__m4t_begin)
     
     # Setup reporting
@@ -921,19 +1303,37 @@ def Multitool_For_Tables(path_in, delim_in, path_out, delim_out,
     cols_out = Get_No_Columns_Out(new_column_specs)
     repeats_elim = 0
     col_metrics = Create_Col_Metrics(new_column_specs)
-    filter_metrics = Create_Filter_Metrics(filters)
+    if fast: filter_metrics = []
+    else: filter_metrics = Create_Filter_Metrics(filters)
     
     # Setup unique
     if not unique_cols: unique_cols = False
     unique_keys = set([])
+    generate_key = Generate_Key
+    if dedup == DEDUP.HASH64:
+        generate_key = Generate_Key__HASH64
+    elif dedup == DEDUP.HASH128:
+        generate_key = Generate_Key__HASH128
+    elif dedup == DEDUP.DISK and unique_cols:
+        flags, count, size = Find_Duplicates__DISK(path_in, delim_in,
+                header_specs, filters, unique_cols)
+        unique_keys = Duplicate_Flags(flags, count, size)
+        generate_key = unique_keys.Generate_Key
+    elif dedup == DEDUP.BLOOM and unique_cols:
+        unique_keys = SKETCHES.Bloom_Filter(bloom_keys, bloom_error)
     
     # I/O setup
     f = Table_Reader()
     f.Set_New_Path(path_in)
     f.Set_Delimiter(delim_in)
     f.Set_Adv_Header_Params(header_specs)
+    if vectorised: width = 0
+    else: width = Get_Passthrough_Width(new_column_specs, delim_in, delim_out)
+    if width: f.Set_Max_Column(Get_Max_Column(filters, [], unique_cols))
+    else: f.Set_Max_Column(Get_Max_Column(filters, new_column_specs,
+            unique_cols))
     f.Open()
-    o = open(path_out, "w")
+    o = WRITER.Open_Buffered(path_out)
     
     # Header
     header_out_str, new_col_headers = f.Adv_Process_Header_Text()
@@ -944,16 +1344,103 @@ def Multitool_For_Tables(path_in, delim_in, path_out, delim_out,
         o.write(string)
     
     # Main loop
-    while not f.EOF:
+    if workers > 1:
+        chunks = f.Get_Chunks(workers)
+        f.Close()
+        rows_in, rows_out = Process_Chunks_Parallel(path_in, delim_in,
+                header_specs, chunks, o, delim_out, filters,
+                new_column_specs, workers, filter_metrics, col_metrics, fast,
+                vectorised)
+    elif width:
+        rows_in, rows_out, repeats_elim = Process_Rows__PASSTHROUGH(
+                f.rows_with_raw(), o, delim_out, width, filters, unique_cols,
+                unique_keys, filter_metrics, fast, generate_key)
+        f.Close()
+    else:
+        rows_in, rows_out, repeats_elim = Process_Rows(f.rows(), o, delim_out,
+                filters, new_column_specs, unique_cols, unique_keys,
+                filter_metrics, col_metrics, fast, vectorised, generate_key)
+        f.Close()
+    
+    # Finish
+    o.close()
+    PRINT.printP(STR__m4t_complete)
+    
+    # Reporting
+    memory = None
+    error = None
+    if unique_cols:
+        count, size = Get_Unique_Keys_Size(unique_keys)
+        memory = [DICT__dedup_str[dedup], count, size, Get_Peak_Memory()]
+    if unique_cols and dedup == DEDUP.BLOOM:
+        bound = unique_keys.Get_Error_Bound(rows_out + repeats_elim)
+        error = [unique_keys.Get_Error_Rate(), min(bound, repeats_elim)]
+    Report_Metrics(rows_in, cols_in, rows_out, cols_out, repeats_elim,
+            filter_metrics, col_metrics, memory, error)
+    
+    # Wrap up
+    return 0
+
+
+
+def Process_Rows(rows, o, delim_out, filters, new_column_specs, unique_cols,
+        unique_keys, filter_metrics, col_metrics, fast=False, vectorised=False,
+        generate_key=None):
+    """
+    Filter and process the rows of data in [rows], and write the resulting lines
+    into the output file [o].
+    
+    Return the number of rows processed, the number of rows written, and the
+    number of rows eliminated for having a non-unique key. [unique_keys],
+    [filter_metrics] and [col_metrics] are updated as the rows are processed.
+    
+    In fast mode, the first FAST_SAMPLE_SIZE rows are used to reorder the
+    filters, and [filter_metrics] is not updated.
+    
+    If any column is converted into a number more than once per row, the typed
+    values of each row are shared between the filters and the new columns, so
+    that each column is only converted once.
+    
+    In vectorised mode, the rows are processed in blocks, using
+    Process_Rows__VECTORISED().
+    
+    The key of each row is generated using [generate_key], which is
+    Generate_Key() if None, and checked against [unique_keys]. Any function
+    and set-like object which work together can be used in their place.
+    
+    See Multitool_For_Tables() for details on the other parameters.
+    
+    Process_Rows(iterable<list<str>>, file, str, list<*>, list<*>, list<int>,
+            set<tuple<str>>, list<int>, list<float>, bool, bool, function) ->
+            [int, int, int]
+    """
+    rows_in = 0
+    rows_out = 0
+    repeats_elim = 0
+    typed = None
+    if not generate_key: generate_key = Generate_Key
+    if vectorised: shared = Share_Typed_Values(filters, [])
+    else: shared = Share_Typed_Values(filters, new_column_specs)
+    if fast:
+        sample = list(itertools.islice(rows, FAST_SAMPLE_SIZE))
+        order = Order_Filters(filters, sample)
+        filter_line = Compile_Filters(filters, False, order, shared)
+        rows = itertools.chain(sample, rows)
+    else:
+        filter_line = Compile_Filters(filters, True, None, shared)
+    if vectorised:
+        return Process_Rows__VECTORISED(rows, o, delim_out, filters,
+                new_column_specs, unique_cols, unique_keys, filter_metrics,
+                col_metrics, filter_line, shared, generate_key)
+    for values in rows:
         rows_in += 1
-        f.Read()
-        values = f.current_element
+        if shared: typed = {}
         # Filter and unique
-        filter_pass = Filter_Line(values, filters, filter_metrics)
+        filter_pass = filter_line(values, filter_metrics, typed)
         if filter_pass:
             flag = True
             if unique_cols:
-                new_key = Generate_Key(values, unique_cols)
+                new_key = generate_key(values, unique_cols)
                 if new_key in unique_keys:
                     flag = False
                     repeats_elim += 1
@@ -962,22 +1449,259 @@ def Multitool_For_Tables(path_in, delim_in, path_out, delim_out,
             if flag:
                 rows_out += 1
                 new_line = Construct_Line(values, delim_out, new_column_specs,
-                        col_metrics)
+                        col_metrics, typed)
                 o.write(new_line + "\n")
+    return [rows_in, rows_out, repeats_elim]
+
+def Process_Rows__VECTORISED(rows, o, delim_out, filters, new_column_specs,
+        unique_cols, unique_keys, filter_metrics, col_metrics, filter_line,
+        shared, generate_key):
+    """
+    Filter and process the rows of data in [rows] in blocks of
+    VECTORISED_BLOCK_SIZE rows, and write the resulting lines into the output
+    file [o]. Used by Process_Rows() in vectorised mode.
     
-    # Finish
-    f.Close()
-    o.close()
-    PRINT.printP(STR__m4t_complete)
+    Each block of rows is filtered using Filter_Rows__VECTORISED() if possible,
+    and one row at a time using [filter_line], the compiled filters, otherwise.
+    The rows which pass are written in blocks using Write_Rows__VECTORISED().
     
-    # Reporting
-    Report_Metrics(rows_in, cols_in, rows_out, cols_out, repeats_elim,
-            filter_metrics, col_metrics)
+    [shared] is whether or not [filter_line] takes the typed values of each row.
+    See Process_Rows() for details on the other parameters and the return
+    values.
     
-    # Wrap up
-    return 0
-
+    Process_Rows__VECTORISED(iterable<list<str>>, file, str, list<*>, list<*>,
+            list<int>, set<tuple<str>>, list<int>, list<float>, function,
+            bool, function) -> [int, int, int]
+    """
+    rows_in = 0
+    rows_out = 0
+    repeats_elim = 0
+    typed = None
+    block_out = []
+    rows = iter(rows)
+    block_in = list(itertools.islice(rows, VECTORISED_BLOCK_SIZE))
+    while block_in:
+        rows_in += len(block_in)
+        # Filter
+        passed = Filter_Rows__VECTORISED(block_in, filters, filter_metrics)
+        if passed == None:
+            passed = []
+            for values in block_in:
+                if shared: typed = {}
+                if filter_line(values, filter_metrics, typed):
+                    passed.append(values)
+        # Unique and write
+        for values in passed:
+            if unique_cols:
+                new_key = generate_key(values, unique_cols)
+                if new_key in unique_keys:
+                    repeats_elim += 1
+                    continue
+                unique_keys.add(new_key)
+            rows_out += 1
+            block_out.append(values)
+            if len(block_out) == VECTORISED_BLOCK_SIZE:
+                Write_Rows__VECTORISED(block_out, o, delim_out,
+                        new_column_specs, col_metrics)
+                block_out = []
+        block_in = list(itertools.islice(rows, VECTORISED_BLOCK_SIZE))
+    if block_out:
+        Write_Rows__VECTORISED(block_out, o, delim_out, new_column_specs,
+                col_metrics)
+    return [rows_in, rows_out, repeats_elim]
+
+def Process_Rows__PASSTHROUGH(rows, o, delim, width, filters, unique_cols,
+        unique_keys, filter_metrics, fast=False, generate_key=None):
+    """
+    Filter the rows of data in [rows], and write the raw text of the rows which
+    pass into the output file [o], unchanged. Used instead of Process_Rows()
+    when the output lines would be identical to the input lines, which is when
+    all of the columns are kept, in order, and no others are added. See
+    Get_Passthrough_Width().
+    
+    Only rows with exactly [width] values are written out unchanged. Any other
+    rows are constructed from their values in the usual way, so that the
+    results are always the same as those of Process_Rows().
+    
+    @rows
+            (iterable<tuple<list<str>, str>>)
+            The rows of data, each with its raw text, as returned by the Table
+            Reader's rows_with_raw().
+    @delim
+            (str)
+            The delimiter used by both the input file and the output file.
+    @width
+            (int)
+            The number of columns kept.
+    
+    See Process_Rows() for details on the other parameters and the return
+    values.
+    
+    Process_Rows__PASSTHROUGH(iterable<tuple<list<str>, str>>, file, str, int,
+            list<*>, list<int>, set<tuple<str>>, list<int>, bool, function) ->
+            [int, int, int]
+    """
+    rows_in = 0
+    rows_out = 0
+    repeats_elim = 0
+    typed = None
+    if not generate_key: generate_key = Generate_Key
+    shared = Share_Typed_Values(filters, [])
+    if fast:
+        sample = list(itertools.islice(rows, FAST_SAMPLE_SIZE))
+        order = Order_Filters(filters, [values for values, raw in sample])
+        filter_line = Compile_Filters(filters, False, order, shared)
+        rows = itertools.chain(sample, rows)
+    else:
+        filter_line = Compile_Filters(filters, True, None, shared)
+    new_column_specs = [[COL_TYPE.KEEP, range(width)]]
+    delims = width - 1
+    for values, raw in rows:
+        rows_in += 1
+        if shared: typed = {}
+        # Filter and unique
+        if not filter_line(values, filter_metrics, typed): continue
+        if unique_cols:
+            new_key = generate_key(values, unique_cols)
+            if new_key in unique_keys:
+                repeats_elim += 1
+                continue
+            unique_keys.add(new_key)
+        # Write
+        rows_out += 1
+        if raw.count(delim) != delims: # Not identical, construct normally
+            values = raw.split(delim)
+            last = values[-1]
+            if last and last[-1] in LIST__newline: values[-1] = last[:-1]
+            raw = Construct_Line(values, delim, new_column_specs) + "\n"
+        elif raw[-1] == "\r": # Old Mac newline
+            raw = raw[:-1] + "\n"
+        elif raw[-1] != "\n": # Last line
+            raw += "\n"
+        o.write(raw)
+    return [rows_in, rows_out, repeats_elim]
+
+def Process_Chunks_Parallel(path_in, delim_in, header_specs, chunks, o,
+        delim_out, filters, new_column_specs, workers, filter_metrics,
+        col_metrics, fast=False, vectorised=False):
+    """
+    Filter and process the [chunks] of the data rows of the input file, as
+    returned by Table_Reader.Get_Chunks(), in parallel using a pool of [workers]
+    processes. The output of each chunk is written into a temp file, and the
+    temp files are then copied into the output file [o], in order.
+    
+    If a chunk ends early because it contains an empty line, which the Table
+    Reader treats as the end of the file, the chunks after it are discarded, the
+    same as when the file is processed in a single process. This includes any
+    errors raised while processing them, as those rows would never have been
+    read. An error raised by an earlier chunk is raised again.
+    
+    The temp files are created here, rather than by the chunks, so that all of
+    them are removed afterwards, even if the pool is stopped early.
+    
+    Return the number of rows processed, and the number of rows written.
+    [filter_metrics] and [col_metrics] are updated with the combined metrics of
+    all the chunks.
+    
+    Process_Chunks_Parallel(str, str, list<*>, list<[int, int]>, file, str,
+            list<*>, list<*>, int, list<int>, list<float>, bool, bool) ->
+            [int, int]
+    """
+    rows_in = 0
+    rows_out = 0
+    paths_temp = []
+    for chunk in chunks:
+        handle, path_temp = tempfile.mkstemp()
+        os.close(handle)
+        paths_temp.append(path_temp)
+    jobs = [[path_in, delim_in, header_specs, chunks[i][0], chunks[i][1],
+            paths_temp[i], delim_out, filters, new_column_specs, fast,
+            vectorised] for i in range(len(chunks))]
+    pool = multiprocessing.Pool(workers)
+    try:
+        results = pool.imap(Process_Chunk, jobs)
+        for i, result in enumerate(results):
+            if isinstance(result, Exception): raise result
+            chunk_in, chunk_out, chunk_f, chunk_c, chunk_end = result
+            rows_in += chunk_in
+            rows_out += chunk_out
+            for j in range(len(chunk_f)): filter_metrics[j] += chunk_f[j]
+            for j in range(len(chunk_c)): col_metrics[j] += chunk_c[j]
+            t = open(paths_temp[i], "rb")
+            shutil.copyfileobj(t, o)
+            t.close()
+            if chunk_end: break # Stopped at an empty line
+    finally:
+        pool.terminate()
+        pool.join()
+        for path_temp in paths_temp:
+            if os.path.exists(path_temp): os.remove(path_temp)
+    return [rows_in, rows_out]
+
+def Process_Chunk(job):
+    """
+    Filter and process the rows of data which lie between two byte offsets of
+    the input file, and write the resulting lines into a temp file. Used by
+    Process_Chunks_Parallel(), in a separate process.
+    
+    [job] is a list containing the input filepath, the input delimiter, the
+    header specs, the start and end offsets of the chunk, the filepath of the
+    temp file, the output delimiter, the filters, the new column specs, and
+    whether or not to use the fast filtering mode and the vectorised mode.
+    
+    Return the number of rows processed, the number of rows written, the filter
+    metrics, the new column metrics, and whether or not an empty line was found
+    before the end of the chunk.
+    Return the exception instead, if one is raised. Whether or not it matters
+    depends on whether an earlier chunk ended early, which only
+    Process_Chunks_Parallel() knows.
+    
+    Process_Chunk(list<*>) -> [int, int, list<int>, list<float>, bool]
+    Process_Chunk(list<*>) -> Exception
+    """
+    try:
+        return Process_Chunk__RAISE(job)
+    except Exception as e:
+        return e
 
+def Process_Chunk__RAISE(job):
+    """
+    Subfunction of Process_Chunk() which does the actual work, and raises any
+    errors.
+    
+    Process_Chunk__RAISE(list<*>) -> [int, int, list<int>, list<float>, bool]
+    """
+    path_in, delim_in, header_specs, start, end, path_temp, delim_out, \
+            filters, new_column_specs, fast, vectorised = job
+    if fast: filter_metrics = []
+    else: filter_metrics = Create_Filter_Metrics(filters)
+    col_metrics = Create_Col_Metrics(new_column_specs)
+    # I/O setup
+    f = Table_Reader()
+    f.Set_New_Path(path_in)
+    f.Set_Delimiter(delim_in)
+    f.Set_Adv_Header_Params(header_specs)
+    if vectorised: width = 0
+    else: width = Get_Passthrough_Width(new_column_specs, delim_in, delim_out)
+    if width: f.Set_Max_Column(Get_Max_Column(filters, [], []))
+    else: f.Set_Max_Column(Get_Max_Column(filters, new_column_specs, []))
+    f.Open()
+    f.Seek(start, end)
+    o = WRITER.Open_Buffered(path_temp)
+    # Process
+    if width:
+        rows_in, rows_out, repeats_elim = Process_Rows__PASSTHROUGH(
+                f.rows_with_raw(), o, delim_out, width, filters, [], set([]),
+                filter_metrics, fast)
+    else:
+        rows_in, rows_out, repeats_elim = Process_Rows(f.rows(), o,
+                delim_out, filters, new_column_specs, [], set([]),
+                filter_metrics, col_metrics, fast, vectorised)
+    chunk_end = bool(f.current_raw) # Stopped at an empty line, not the end
+    # Finish
+    f.Close()
+    o.close()
+    return [rows_in, rows_out, filter_metrics, col_metrics, chunk_end]
 
 def Get_No_Columns_Out(new_column_specs):
     """
@@ -1004,6 +1728,56 @@ def Get_No_Columns_Out(new_column_specs):
             result += 1
     return result    
 
+def Get_Passthrough_Width(new_column_specs, delim_in, delim_out):
+    """
+    Return the number of columns kept if the new column specs would produce
+    output lines identical to the input lines, for input lines with that many
+    columns. This is when only existing columns are kept, all of the columns
+    from the first column up to the last column kept are kept in order, and the
+    input and output delimiters are the same.
+    
+    Return 0 otherwise.
+    
+    See Multitool_For_Tables() for details on the parameters.
+    
+    Get_Passthrough_Width(list<*>, str, str) -> int
+    """
+    if delim_in != delim_out or len(delim_in) != 1: return 0
+    col_nos = []
+    for spec in new_column_specs:
+        if spec[0] != COL_TYPE.KEEP: return 0
+        col_nos += spec[1]
+    if list(col_nos) != range(len(col_nos)): return 0
+    return len(col_nos)
+
+def Get_Max_Column(filters, new_column_specs, unique_cols):
+    """
+    Return the number of columns which need to be split from each row of the
+    input file, which is one more than the highest column number used by the
+    filters, the new column specs and the unique columns. Used as a hint for the
+    Table Reader, so that the columns after it are not split.
+    
+    Return 0 if any negative column numbers are used, in which case every row
+    needs to be split fully. Return 1 if no columns are used at all.
+    
+    See Multitool_For_Tables() for details on the parameters.
+    
+    Get_Max_Column(list<*>, list<*>, list<int>) -> int
+    """
+    col_nos = []
+    for filt in filters:
+        col_nos.append(filt[1])
+        if type(filt[3]) == int: col_nos.append(filt[3])
+    for spec in new_column_specs:
+        if spec[0] == COL_TYPE.KEEP:
+            col_nos += spec[1]
+        elif spec[0] == COL_TYPE.CALC:
+            col_nos += spec[3]
+    if unique_cols: col_nos += unique_cols
+    if not col_nos: return 1
+    if min(col_nos) < 0: return 0
+    return max(col_nos) + 1
+
 def Generate_Headers(old_headers, new_column_specs):
     """
     Return a list of column headers.
@@ -1197,22 +1971,31 @@ def Create_Filter_Metrics(filters):
 
 
 
-def Filter_Line(data, filters, filter_metrics=None):
+def Compile_Filters(filters, metrics=True, order=None, typed=False):
     """
-    Assess a row of data to see which filters if passes.
-    Return True if it passes all "include" filters and fails all "exclude"
-    filters. Return False otherwise.
-    
-    If the metrics for each individual filter are being tracked, a list can be
-    added as an argument which is updated in accordance with the outcome. The
-    list is assumed to be a tracker for the number of lines which meet each
-    filtering criteria.
+    Compile a list of filters into a function which assesses a row of data to
+    see which filters it passes. The function is generated as Python code once,
+    before any rows are filtered, so that for each row:
+        - The filters are not unpacked, and their types are not checked
+        - The criteria are not looked up in a chain of if/elif statements
+        - The values of numeric criteria are only converted once, if they are
+          specified as values rather than columns
+    
+    The compiled function takes a row of data and a list of filter metrics. It
+    returns True if the row passes all "include" filters and fails all
+    "exclude" filters, and False otherwise. The count in the filter metrics of
+    each filter the row meets is increased by 1. It returns None if a filter is
+    invalid.
+    
+    If [metrics] is False, the compiled function does not update the filter
+    metrics. It instead returns False as soon as the row fails an "include"
+    filter or meets an "exclude" filter, without checking the other filters.
+    
+    If [typed] is True, the compiled function also takes a dictionary of typed
+    values for the row, as used by Get_Number(), and numeric criteria get their
+    values from it. Each column is then converted at most once per row, even if
+    it is used by several filters, or by the new columns in Construct_Line().
     
-    Return None if there is any kind of problem with the process.
-    
-    @data
-            (list<str>)
-            The row of data being filtered.
     @filters
             (list<FILTER>)
                 FILTER = [int(ENUM), int, int(ENUM), int/str]
@@ -1233,113 +2016,308 @@ def Filter_Line(data, filters, filter_metrics=None):
                     containing the value to be used for the comparison, or the
                     value itself to be used for the comparison.
                     0-index system for column numbers.
-    @filter_metrics
+    @metrics
+            (bool)
+            Whether or not the compiled function updates the filter metrics.
+    @order
             (list<int>)
-            A list of counts for the number of lines (so far) which have met the
-            corresponding criteria.
+            (Optional)
+            The order in which the filters are checked, as a list of indexes
+            into [filters]. By default, filters are checked in the order given.
+            Only useful if [metrics] is False.
+    @typed
+            (bool)
+            Whether or not the compiled function shares typed values.
     
-    Filter_Line(list<str>, list<list<>(4)>, list<int>) -> bool
-    Filter_Line(list<str>, list<list<>(4)>, list<int>) -> None
+    Compile_Filters(list<list<>(4)>, bool, list<int>, bool) -> function
     """
-    # Setup
-    all_inc = True
-    any_exc = False
-    index = 0
-    # Main loop
-    for filt in filters:
-        inc_exc, target, criteria, val_ref = filt
-        # Get values
-        val_1 = data[target]
+    if order == None: order = range(len(filters))
+    namespace = {"Get_Number": Get_Number, "Get_Float": Get_Float,
+            "INTEGER_TYPES": (int, long)}
+    code = ["def Filter_Line__COMPILED(data, filter_metrics=None, typed=None):",
+            "    passed = True"]
+    for index in order:
+        inc_exc, target, criteria, val_ref = filters[index]
+        # Values
+        value_1 = "data[{n}]".format(n = target)
         if type(val_ref) == int:
-            val_2 = data[val_ref]
+            value_2 = "data[{n}]".format(n = val_ref)
         elif type(val_ref) == str:
-            val_2 = val_ref
-        else: # Shouldn't happen
-            return None
-        # Compare
-        flag = False
-        if criteria == CRITERIA.STR_EQ:
-            if val_1 == val_2:
-                flag = True
-        elif criteria == CRITERIA.STR_NOT_EQ:
-            if val_1 != val_2:
-                flag = True
-        elif criteria == CRITERIA.CONTAINS:
-            if val_2 in val_1:
-                flag = True
-        elif criteria == CRITERIA.NOT_CONTAIN:
-            if val_2 not in val_1:
-                flag = True
-        elif criteria == CRITERIA.IN:
-            if val_1 in val_2:
-                flag = True
-        elif criteria == CRITERIA.NOT_IN:
-            if val_1 not in val_2:
-                flag = True
-        elif criteria == CRITERIA.GREATER_THAN:
-            if val_1 > val_2:
-                flag = True
-        elif criteria == CRITERIA.GREAQUALS:
-            if val_1 >= val_2:
-                flag = True
-        elif criteria == CRITERIA.LESS_THAN:
-            if val_1 < val_2:
-                flag = True
-        elif criteria == CRITERIA.LEQUALS:
-            if val_1 <= val_2:
-                flag = True
-        elif criteria == CRITERIA.INT_EQ:
-            try:
-                val_1 = int(val_1)
-                val_2 = int(val_2)
-                if val_1 == val_2:
-                    flag = True
-            except:
-                pass
-        elif criteria == CRITERIA.INT_NOT_EQ:
-            try:
-                val_1 = int(val_1)
-                val_2 = int(val_2)
-                if val_1 != val_2:
-                    flag = True
-            except:
-                pass
-        elif criteria == CRITERIA.FLO_EQ:
-            try:
-                val_1 = float(val_1)
-                val_2 = float(val_2)
-                if val_1 == val_2:
-                    flag = True
-            except:
-                pass
-        elif criteria == CRITERIA.FLO_NOT_EQ:
-            try:
-                val_1 = float(val_1)
-                val_2 = float(val_2)
-                if val_1 != val_2:
-                    flag = True
-            except:
-                pass
+            value_2 = "v{n}".format(n = index)
+            namespace[value_2] = val_ref
         else: # Shouldn't happen
-            return None
-        # Update flags
-        if inc_exc == INC_EXC.INCLUDE:
-            if not flag:
-                all_inc = False
-        elif inc_exc == INC_EXC.EXCLUDE:
-            if flag:
-                any_exc = True
+            code.append("    return None")
+            break
+        if (criteria not in DICT__criteria_code or
+                inc_exc not in [INC_EXC.INCLUDE, INC_EXC.EXCLUDE]):
+            code.append("    return None") # Shouldn't happen
+            break
+        # Comparison
+        convert = DICT__criteria_convert.get(criteria)
+        if not convert:
+            comparison = DICT__criteria_code[criteria].format(A = value_1,
+                    B = value_2)
+            code.append("    flag = " + comparison)
+        elif typed:
+            get, check = DICT__typed_code[convert]
+            checks = [check.format(V = "a")]
+            code.append("    a = {f}(data, {n}, typed)".format(f = get,
+                    n = target))
+            if type(val_ref) == str: # Convert once
+                try:
+                    namespace[value_2] = convert(val_ref)
+                except ValueError:
+                    checks = ["False"]
+            else:
+                value_2 = "b"
+                checks.append(check.format(V = "b"))
+                code.append("    b = {f}(data, {n}, typed)".format(f = get,
+                        n = val_ref))
+            comparison = DICT__criteria_code[criteria].format(A = "a",
+                    B = value_2)
+            code.append("    flag = " + " and ".join(checks + [comparison]))
         else:
-            return None
-        # Update metrics
+            if type(val_ref) == str: # Convert once
+                try:
+                    namespace[value_2] = convert(val_ref)
+                except ValueError:
+                    value_2 = None
+            else:
+                value_2 = "{f}({v})".format(f = convert.__name__, v = value_2)
+            if value_2:
+                value_1 = "{f}({v})".format(f = convert.__name__, v = value_1)
+                comparison = DICT__criteria_code[criteria].format(A = value_1,
+                        B = value_2)
+                code += ["    try: flag = " + comparison,
+                        "    except ValueError: flag = False"]
+            else: # The value can never be converted
+                code.append("    flag = False")
+        # Outcome
+        if metrics:
+            code += ["    if flag:",
+                    "        filter_metrics[{n}] += 1".format(n = index)]
+            if inc_exc == INC_EXC.INCLUDE:
+                code.append("    else: passed = False")
+            else:
+                code.append("        passed = False")
+        else:
+            if inc_exc == INC_EXC.INCLUDE:
+                code.append("    if not flag: return False")
+            else:
+                code.append("    if flag: return False")
+    code.append("    return passed")
+    # Compile
+    exec("\n".join(code), namespace)
+    return namespace["Filter_Line__COMPILED"]
+
+def Order_Filters(filters, sample):
+    """
+    Return the order in which the filters should be checked, in the fast
+    filtering mode, as a list of indexes into [filters].
+    
+    Each filter is checked against the rows in [sample], to measure how often it
+    rejects a row. Filters are then ordered by their estimated cost, from
+    DICT__criteria_cost, divided by the proportion of rows they reject. Cheap
+    filters which reject many rows are checked first, and filters which reject
+    none of the rows are checked last. Otherwise, filters stay in the order
+    given.
+    
+    @filters
+            (list<FILTER>)
+                FILTER = [int(ENUM), int, int(ENUM), int/str]
+            A list of filtering criteria, each consisting of whether to include
+            or exclude lines which meet it, the target column, the criteria,
+            and either a value or the column number of a reference column.
+            (See Compile_Filters() for details.)
+    @sample
+            (list<list<str>>)
+            A list of rows of data, used to measure the rejection rates.
+    
+    Order_Filters(list<list<>(4)>, list<list<str>>) -> list<int>
+    """
+    ranks = []
+    for index in range(len(filters)):
+        inc_exc, target, criteria, val_ref = filters[index]
+        # Rejection rate
+        check = Compile_Filters([filters[index]])
+        metrics = [0]
+        rejected = 0
+        for values in sample:
+            if not check(values, metrics): rejected += 1
+        # Cost
+        cost = DICT__criteria_cost.get(criteria, 1)
+        if criteria in DICT__criteria_convert and type(val_ref) == int:
+            cost = cost * 2 # Both values need to be converted
+        # Rank
+        if rejected: ranks.append([0, float(cost)*len(sample)/rejected, index])
+        else: ranks.append([1, cost, index])
+    ranks.sort()
+    return [rank[2] for rank in ranks]
+
+def Filter_Rows__VECTORISED(rows, filters, filter_metrics):
+    """
+    Return the rows in a block of rows which pass all "include" filters and fail
+    all "exclude" filters. Each filter is checked against the whole block at
+    once, using NumPy arrays, instead of one row at a time. Each filter produces
+    a mask of the rows which meet it, and the masks are then combined.
+    [filter_metrics] is updated using the sums of the masks.
+    
+    String comparisons are done on arrays of the original strings. Numeric
+    criteria convert each column into an array of numbers once per block.
+    
+    Return None if the block cannot be filtered this way, such as when a row has
+    too few columns. Such blocks need to be filtered one row at a time, which
+    will have the same result, or raise the same error, as before.
+    
+    @rows
+            (list<list<str>>)
+            The block of rows being filtered.
+    @filters
+            (list<FILTER>)
+                FILTER = [int(ENUM), int, int(ENUM), int/str]
+            A list of filtering criteria, each consisting of whether to include
+            or exclude rows which meet it, the target column, the criteria,
+            and either a value or the column number of a reference column.
+            (See Compile_Filters() for details.)
+    @filter_metrics
+            (list<int>)
+            A list of counts for the number of rows (so far) which have met the
+            corresponding criteria. Not updated if empty.
+    
+    Filter_Rows__VECTORISED(list<list<str>>, list<list<>(4)>, list<int>) ->
+            list<list<str>>
+    Filter_Rows__VECTORISED(list<list<str>>, list<list<>(4)>, list<int>) ->
+            None
+    """
+    # Setup
+    strings = {}
+    numbers = {}
+    masks = []
+    # Masks
+    try:
+        for inc_exc, target, criteria, val_ref in filters:
+            if inc_exc not in [INC_EXC.INCLUDE, INC_EXC.EXCLUDE]: return None
+            # Values
+            col_nos = [target]
+            if type(val_ref) == int: col_nos.append(val_ref)
+            elif type(val_ref) != str: return None
+            for col_no in col_nos:
+                if col_no not in strings:
+                    strings[col_no] = numpy.array([values[col_no] for values
+                            in rows], dtype=object)
+            values_1 = strings[target]
+            if type(val_ref) == int: values_2 = strings[val_ref]
+            else: values_2 = val_ref
+            # Compare
+            convert = DICT__criteria_convert.get(criteria)
+            if criteria == CRITERIA.STR_EQ:
+                mask = values_1 == values_2
+            elif criteria == CRITERIA.STR_NOT_EQ:
+                mask = values_1 != values_2
+            elif criteria == CRITERIA.GREATER_THAN:
+                mask = values_1 > values_2
+            elif criteria == CRITERIA.GREAQUALS:
+                mask = values_1 >= values_2
+            elif criteria == CRITERIA.LESS_THAN:
+                mask = values_1 < values_2
+            elif criteria == CRITERIA.LEQUALS:
+                mask = values_1 <= values_2
+            elif criteria in [CRITERIA.CONTAINS, CRITERIA.NOT_CONTAIN]:
+                if type(val_ref) == int:
+                    mask = [b in a for a, b in zip(values_1, values_2)]
+                else:
+                    mask = [values_2 in a for a in values_1]
+                mask = numpy.array(mask, dtype=bool)
+                if criteria == CRITERIA.NOT_CONTAIN: mask = ~mask
+            elif criteria in [CRITERIA.IN, CRITERIA.NOT_IN]:
+                if type(val_ref) == int:
+                    mask = [a in b for a, b in zip(values_1, values_2)]
+                else:
+                    mask = [a in values_2 for a in values_1]
+                mask = numpy.array(mask, dtype=bool)
+                if criteria == CRITERIA.NOT_IN: mask = ~mask
+            elif convert:
+                # Convert to numbers
+                for col_no in col_nos:
+                    if (col_no, convert) not in numbers:
+                        numbers[col_no, convert] = Convert_Column__VECTORISED(
+                                strings[col_no], convert)
+                    if numbers[col_no, convert] == None:
+                        return None
+                nums_1, valid = numbers[target, convert]
+                if type(val_ref) == int:
+                    nums_2, valid_2 = numbers[val_ref, convert]
+                    valid = valid & valid_2
+                else:
+                    try:
+                        nums_2 = convert(val_ref)
+                    except ValueError: # The value can never be converted
+                        nums_2 = 0
+                        valid = numpy.zeros(len(rows), dtype=bool)
+                    if abs(nums_2) > VECTORISED_INT_LIMIT and convert == int:
+                        return None
+                if criteria in [CRITERIA.INT_EQ, CRITERIA.FLO_EQ]:
+                    mask = valid & (nums_1 == nums_2)
+                else:
+                    mask = valid & (nums_1 != nums_2)
+            else:
+                return None
+            masks.append(mask)
+    except IndexError:
+        return None
+    # Combine
+    passed = numpy.ones(len(rows), dtype=bool)
+    for index in range(len(filters)):
+        mask = masks[index]
         if filter_metrics:
-            if flag:
-                filter_metrics[index] += 1
-            index += 1
+            filter_metrics[index] += int(mask.sum())
+        if filters[index][0] == INC_EXC.INCLUDE:
+            passed = passed & mask
+        else:
+            passed = passed & ~mask
     # Return
-    if all_inc and not any_exc:
-        return True
-    return False
+    return [rows[index] for index in numpy.flatnonzero(passed).tolist()]
+
+def Convert_Column__VECTORISED(strings, convert):
+    """
+    Convert an array of strings into an array of numbers, using [convert],
+    which is either int or float. Return the array of numbers, and an array of
+    whether or not each value could be converted. Values which could not be
+    converted are 0 in the array of numbers.
+    
+    Return None if any value is an integer too large to be held exactly by a
+    float.
+    
+    Convert_Column__VECTORISED(array<str>, function) -> [array, array]
+    Convert_Column__VECTORISED(array<str>, function) -> None
+    """
+    length = len(strings)
+    if convert == int: dtype = numpy.int64
+    else: dtype = numpy.float64
+    # All values
+    joined = "".join(strings)
+    if convert == float or ("L" not in joined and "l" not in joined):
+        try:
+            nums = numpy.array(strings, dtype=dtype)
+            valid = numpy.ones(length, dtype=bool)
+            if convert == int:
+                if (nums > VECTORISED_INT_LIMIT).any(): return None
+                if (nums < -VECTORISED_INT_LIMIT).any(): return None
+            return [nums, valid]
+        except (ValueError, OverflowError):
+            pass
+    # One value at a time
+    nums = numpy.zeros(length, dtype=dtype)
+    valid = numpy.zeros(length, dtype=bool)
+    for index in range(length):
+        try:
+            num = convert(strings[index])
+        except ValueError:
+            continue
+        if convert == int and abs(num) > VECTORISED_INT_LIMIT: return None
+        nums[index] = num
+        valid[index] = True
+    return [nums, valid]
 
 def Generate_Key(values, key_cols):
     """
@@ -1363,7 +2341,167 @@ def Generate_Key(values, key_cols):
     result = tuple(result)
     return result
 
-def Construct_Line(values, delim, specs, new_col_metrics=None):
+def Generate_Key__HASH64(values, key_cols):
+    """
+    Return a 64-bit hash of the key generated by Generate_Key(), as an integer.
+    
+    Generate_Key__HASH64(list<str>, list<int>) -> int
+    """
+    key = repr(Generate_Key(values, key_cols))
+    return struct.unpack("<q", hashlib.md5(key).digest()[:8])[0]
+
+def Generate_Key__HASH128(values, key_cols):
+    """
+    Return a 128-bit hash of the key generated by Generate_Key(), as a string
+    of 16 bytes.
+    
+    Generate_Key__HASH128(list<str>, list<int>) -> str
+    """
+    key = repr(Generate_Key(values, key_cols))
+    return hashlib.md5(key).digest()
+
+def Find_Duplicates__DISK(path_in, delim_in, header_specs, filters,
+            key_cols):
+    """
+    Find which rows of a table file have a key which already appeared in an
+    earlier row, without holding all the keys in memory at once.
+    
+    The file is read once, and the key of each row which passes the filters is
+    written, along with the row's ordinal, into one of DEDUP_PARTITIONS temp
+    files chosen by the hash of the key. Rows with the same key therefore end
+    up in the same temp file. The temp files are then checked one at a time.
+    
+    Return a list containing the flags for every row which passes the filters,
+    (see Duplicate_Flags), the number of unique keys in the largest temp file,
+    and the memory used to store them, in bytes.
+    
+    See Multitool_For_Tables() for details on the parameters.
+    
+    Find_Duplicates__DISK(str, str, list<list<int, int/str>>, list<*>,
+            list<int>) -> [bytearray, int, int]
+    """
+    shared = Share_Typed_Values(filters, [])
+    filter_line = Compile_Filters(filters, False, None, shared)
+    typed = None
+    count = 0
+    largest_count = 0
+    largest_size = 0
+    # I/O setup
+    f = Table_Reader()
+    f.Set_New_Path(path_in)
+    f.Set_Delimiter(delim_in)
+    f.Set_Adv_Header_Params(header_specs)
+    f.Set_Max_Column(Get_Max_Column(filters, [], key_cols))
+    f.Open()
+    f.Adv_Process_Header_Text()
+    dir_temp = tempfile.mkdtemp()
+    paths = [os.path.join(dir_temp, str(i)) for i in range(DEDUP_PARTITIONS)]
+    files = []
+    try:
+        # Partition
+        files = [open(path, "w") for path in paths]
+        for values in f.rows():
+            if shared: typed = {}
+            if filter_line(values, None, typed):
+                key = Generate_Key(values, key_cols)
+                line = "{N}\t{K}\n".format(N = count, K = repr(key))
+                files[hash(key) % DEDUP_PARTITIONS].write(line)
+                count += 1
+        for o in files: o.close()
+        # Check each partition
+        flags = bytearray((count + 7) // 8)
+        for path in paths:
+            seen = set([])
+            size = 0
+            partition = open(path, "U")
+            for line in partition:
+                index, key = line.split("\t", 1)
+                if key in seen:
+                    index = int(index)
+                    flags[index >> 3] |= 1 << (index & 7)
+                else:
+                    seen.add(key)
+                    size += sys.getsizeof(key)
+            partition.close()
+            if len(seen) > largest_count:
+                largest_count = len(seen)
+                largest_size = sys.getsizeof(seen) + size
+    finally:
+        f.Close()
+        for o in files: o.close()
+        shutil.rmtree(dir_temp)
+    return [flags, largest_count, largest_size]
+
+def Get_Number(values, col_no, typed):
+    """
+    Return the value in column [col_no] of [values] as a number. The value is
+    converted into an integer if possible, and into a float otherwise. Return
+    None if it cannot be converted into either.
+    
+    Converted values are stored in [typed], a dictionary of the typed values of
+    the current row, so that each column is only converted once per row.
+    
+    @values
+            (list<str>)
+            A row of data from a table file.
+    @col_no
+            (int)
+            The column number of the value. (0-index system)
+    @typed
+            (dict<int:int/float/None>)
+            The typed values of the row which have been converted so far.
+    
+    Get_Number(list<str>, int, dict<int:int/float/None>) -> int
+    Get_Number(list<str>, int, dict<int:int/float/None>) -> float
+    Get_Number(list<str>, int, dict<int:int/float/None>) -> None
+    """
+    if col_no in typed: return typed[col_no]
+    s = values[col_no]
+    try:
+        num = int(s)
+    except ValueError:
+        try:
+            num = float(s)
+        except ValueError:
+            num = None
+    typed[col_no] = num
+    return num
+
+def Get_Float(values, col_no, typed):
+    """
+    Return the value in column [col_no] of [values] as a float, using the typed
+    value from Get_Number(). Return None if it cannot be converted.
+    
+    Get_Float(list<str>, int, dict<int:int/float/None>) -> float
+    Get_Float(list<str>, int, dict<int:int/float/None>) -> None
+    """
+    num = Get_Number(values, col_no, typed)
+    if num == None or type(num) == float: return num
+    try:
+        return float(num)
+    except OverflowError: # Too large for a float, unlike the string
+        return float(values[col_no])
+
+def Share_Typed_Values(filters, specs):
+    """
+    Return True if any column is converted into a number more than once per row,
+    by the numeric filters in [filters] and the derived columns in [specs], in
+    which case it is worth sharing the typed values of each row. Return False
+    otherwise.
+    
+    Share_Typed_Values(list<list<>(4)>, list<*>) -> bool
+    """
+    col_nos = []
+    for inc_exc, target, criteria, val_ref in filters:
+        if criteria in DICT__criteria_convert:
+            col_nos.append(target)
+            if type(val_ref) == int: col_nos.append(val_ref)
+    for spec in specs:
+        if spec[0] == COL_TYPE.CALC and spec[2] != OPERATION.CAT:
+            col_nos += spec[3]
+    return len(set(col_nos)) < len(col_nos)
+
+def Construct_Line(values, delim, specs, new_col_metrics=None, typed=None):
     """
     Return a new line to write to the output file based on the original values
     in the file, a delimiter, and a set of criteria to show which values to keep
@@ -1434,9 +2572,16 @@ def Construct_Line(values, delim, specs, new_col_metrics=None):
     @new_column_metrics
             (list<int>)
             A list of totals for the new columns produced.
-    
-    Construct_Line(list<str>, str, list<*>, list<float>) -> str
-    Construct_Line(list<str>, str, list<*>, list<float>) -> None
+    @typed
+            (dict<int:int/float/None>)
+            (Optional)
+            The typed values of the row, shared with the filters. If provided,
+            values are converted into numbers using Get_Number().
+    
+    Construct_Line(list<str>, str, list<*>, list<float>,
+            dict<int:int/float/None>) -> str
+    Construct_Line(list<str>, str, list<*>, list<float>,
+            dict<int:int/float/None>) -> None
     """
     # Setup
     result = []
@@ -1467,16 +2612,26 @@ def Construct_Line(values, delim, specs, new_col_metrics=None):
             else:
                 # Convert to numbers
                 nums = []
-                for s in raws:
-                    try:
-                        temp = int(s)
+                if typed != None:
+                    for col_no in col_nos:
+                        if col_no in typed:
+                            temp = typed[col_no]
+                        else:
+                            temp = Get_Number(values, col_no, typed)
+                        if temp == None:
+                            return None
                         nums.append(temp)
-                    except:
+                else:
+                    for s in raws:
                         try:
-                            temp = float(s)
+                            temp = int(s)
                             nums.append(temp)
                         except:
-                            return None
+                            try:
+                                temp = float(s)
+                                nums.append(temp)
+                            except:
+                                return None
                 # Other operations
                 if (op == OPERATION.ADD) or (op == OPERATION.SUM):
                     temp = sum(nums)
@@ -1539,10 +2694,281 @@ def Construct_Line(values, delim, specs, new_col_metrics=None):
     result = delim.join(result)
     return result
 
+def Write_Rows__VECTORISED(rows, o, delim, specs, new_col_metrics=None):
+    """
+    Construct the new lines for a block of rows, and write them into the output
+    file [o]. The lines are constructed using Construct_Lines__VECTORISED() if
+    possible, and using Construct_Line() one row at a time otherwise.
+    
+    See Construct_Line() for details on the parameters.
+    
+    Write_Rows__VECTORISED(list<list<str>>, file, str, list<*>, list<float>)
+            -> None
+    """
+    lines = Construct_Lines__VECTORISED(rows, delim, specs, new_col_metrics)
+    if lines == None:
+        for values in rows:
+            new_line = Construct_Line(values, delim, specs, new_col_metrics)
+            o.write(new_line + "\n")
+    else:
+        o.writelines([line + "\n" for line in lines])
+
+def Construct_Lines__VECTORISED(rows, delim, specs, new_col_metrics=None):
+    """
+    Return the new lines for a block of rows, the same as Construct_Line() would
+    return for each row, except that the derived columns are calculated for the
+    whole block at once, using NumPy arrays.
+    
+    Return None if the block cannot be processed this way with exactly the same
+    results. This includes blocks with values which are not numbers, integers
+    too large to be held exactly by a float, and rows which would cause an error
+    in Construct_Line(), such as a division by zero. Such blocks need to be
+    processed one row at a time, using Construct_Line().
+    
+    The new column metrics are updated using the sums of the arrays, which may
+    differ from the sums of the individual values in the last few significant
+    digits.
+    
+    See Construct_Line() for details on the parameters.
+    
+    Construct_Lines__VECTORISED(list<list<str>>, str, list<*>, list<float>)
+            -> list<str>
+    Construct_Lines__VECTORISED(list<list<str>>, str, list<*>, list<float>)
+            -> None
+    """
+    # Setup
+    columns = {}
+    fields = []
+    totals = []
+    # Loop
+    try:
+        for spec in specs:
+            spec_type = spec[0]
+            if spec_type == COL_TYPE.KEEP:
+                for col_no in spec[1]:
+                    fields.append([values[col_no] for values in rows])
+            elif spec_type == COL_TYPE.NEW:
+                fields.append(len(rows)*[spec[2]])
+            elif spec_type == COL_TYPE.CALC:
+                op = spec[2]
+                col_nos = spec[3]
+                # Concatenate string
+                if op == OPERATION.CAT:
+                    fields.append(["".join([values[col_no] for col_no in
+                            col_nos]) for values in rows])
+                    continue
+                # Convert to arrays
+                for col_no in col_nos:
+                    if col_no not in columns:
+                        columns[col_no] = Vectorise_Column(rows, col_no)
+                    if columns[col_no] == None:
+                        return None
+                # Other operations
+                with numpy.errstate(all = "ignore"): # inf and nan, as in Python
+                    result = Calculate_Column__VECTORISED(op,
+                            [columns[col_no] for col_no in col_nos])
+                if result == None:
+                    return None
+                nums, total = result
+                fields.append([str(num) for num in nums])
+                totals.append(total)
+            else:
+                return None
+    except IndexError:
+        return None
+    # Metrics
+    if new_col_metrics:
+        for index in range(len(totals)):
+            new_col_metrics[index] += totals[index]
+    # Return
+    if not fields: return len(rows)*[""]
+    return [delim.join(line) for line in zip(*fields)]
 
+def Vectorise_Column(rows, col_no):
+    """
+    Convert the values in column [col_no] of a block of rows into NumPy arrays.
+    Return a list containing:
+        - An array of the values as floats
+        - An array of the values as integers, where they are integers, and 0
+          otherwise
+        - An array of whether or not each value is an integer
+    
+    Values are treated as integers if int() can convert them, the same as in
+    Construct_Line(). Return None if any value cannot be converted into a
+    number, or is an integer too large to be held exactly by a float.
+    
+    Vectorise_Column(list<list<str>>, int) -> [array, array, array]
+    Vectorise_Column(list<list<str>>, int) -> None
+    """
+    strings = [values[col_no] for values in rows]
+    length = len(strings)
+    # All integers
+    joined = "".join(strings)
+    if "L" not in joined and "l" not in joined: # long() accepts an "L" suffix
+        try:
+            ints = numpy.array(strings, dtype=numpy.int64)
+            if (ints > VECTORISED_INT_LIMIT).any(): return None
+            if (ints < -VECTORISED_INT_LIMIT).any(): return None
+            return [ints.astype(numpy.float64), ints,
+                    numpy.ones(length, dtype=bool)]
+        except (ValueError, OverflowError):
+            pass
+    # Floats, and some integers
+    try:
+        floats = numpy.array(strings, dtype=numpy.float64)
+    except ValueError:
+        return None
+    ints = numpy.zeros(length, dtype=numpy.int64)
+    is_int = numpy.zeros(length, dtype=bool)
+    for index in numpy.flatnonzero(floats == numpy.floor(floats)).tolist():
+        try:
+            num = int(strings[index])
+        except ValueError: # Whole number written as a float
+            continue
+        if abs(num) > VECTORISED_INT_LIMIT: return None
+        floats[index] = num # "-0" is 0, not -0.0
+        ints[index] = num
+        is_int[index] = True
+    return [floats, ints, is_int]
+
+def Calculate_Column__VECTORISED(op, columns):
+    """
+    Calculate the values of a derived column for a block of rows, using the
+    arrays produced by Vectorise_Column() for each column used by the operation.
+    The calculations are done in the same order as in Construct_Line(), so that
+    the results are the same.
+    
+    Return a list of the values, as Python integers or floats, and their total.
+    Return None if the results would not be exactly the same as those of
+    Construct_Line(), or if Construct_Line() would raise an error for any row.
+    
+    @op
+            (int) - Pseudo ENUM
+            The operation used to derive the new column. See Construct_Line().
+    @columns
+            (list<[array, array, array]>)
+            The converted values of each column used by the operation.
+    
+    Calculate_Column__VECTORISED(int, list<[array, array, array]>) ->
+            [list<int/float>, float]
+    Calculate_Column__VECTORISED(int, list<[array, array, array]>) -> None
+    """
+    length = len(columns[0][0])
+    floats = [column[0] for column in columns]
+    # Operations which keep integers as integers
+    if op in [OPERATION.ADD, OPERATION.SUM, OPERATION.MUL, OPERATION.PRO]:
+        # Like Construct_Line(), each row is totalled as an integer, until the
+        # first value which is not an integer
+        if op in [OPERATION.ADD, OPERATION.SUM]:
+            combine = numpy.add
+            limit = sum([int(numpy.abs(column[1]).max()) for column in
+                    columns])
+            temp_i = numpy.zeros(length, dtype=numpy.int64)
+        else:
+            combine = numpy.multiply
+            limit = 1
+            for column in columns:
+                limit = limit * int(numpy.abs(column[1]).max())
+            temp_i = numpy.ones(length, dtype=numpy.int64)
+        if limit > VECTORISED_INT_LIMIT: return None
+        temp_f = numpy.zeros(length)
+        is_int = numpy.ones(length, dtype=bool)
+        for floats_, ints_, is_int_ in columns:
+            temp_f = numpy.where(is_int, combine(temp_i, floats_),
+                    combine(temp_f, floats_))
+            temp_i = combine(temp_i, ints_)
+            is_int = is_int & is_int_
+    elif op in [OPERATION.SUB, OPERATION.DIF]:
+        temp_f = floats[0] - floats[1]
+        temp_i = columns[0][1] - columns[1][1]
+        is_int = columns[0][2] & columns[1][2]
+        if op == OPERATION.DIF:
+            temp_f = numpy.abs(temp_f)
+            temp_i = numpy.abs(temp_i)
+    # Operations which produce floats
+    else:
+        if op == OPERATION.DIV:
+            if (floats[1] == 0).any(): return None
+            temp = floats[0] / floats[1]
+        else:
+            temp = 1.0
+            for f in floats:
+                temp = temp * f
+            if op in [OPERATION.AVG, OPERATION.AVG_INT]:
+                temp = temp / len(floats)
+            elif op in [OPERATION.GEO, OPERATION.GEO_INT]:
+                root = 1.0/(len(floats))
+                if len(floats) > 1:
+                    if (temp < 0).any(): return None
+                    temp = temp + 0.0 # Python gives 0.0, not -0.0
+                temp = temp ** root
+            else:
+                return None
+        if op in [OPERATION.AVG_INT, OPERATION.GEO_INT]:
+            if not numpy.isfinite(temp).all(): return None
+            temp = numpy.where(temp > 0, temp + 0.5,
+                    numpy.where(temp < 0, temp - 0.5, temp))
+            if (numpy.abs(temp) >= 2**63).any(): return None
+            temp = temp.astype(numpy.int64).tolist()
+            return [temp, sum(temp)]
+        return [temp.tolist(), float(temp.sum())]
+    # Integers and floats
+    if is_int.all():
+        temp = temp_i.tolist()
+        return [temp, sum(temp)]
+    if not is_int.any():
+        return [temp_f.tolist(), float(temp_f.sum())]
+    temp = [i if flag else f for i, f, flag in zip(temp_i.tolist(),
+            temp_f.tolist(), is_int.tolist())]
+    total = sum(temp_i[is_int].tolist()) + float(temp_f[~is_int].sum())
+    return [temp, total]
+
+
+
+def Get_Unique_Keys_Size(unique_keys):
+    """
+    Return the number of keys stored in [unique_keys], and an estimate of the
+    memory used to store them, in bytes.
+    
+    For a set of keys, the memory used by the keys themselves is estimated from
+    a sample of UNIQUE_KEYS_SAMPLE keys. For Duplicate_Flags, this is the size
+    of the flags plus the keys of the largest temp file. For a Bloom filter,
+    this is the size of its array of bits, and the number of keys is an
+    estimate.
+    
+    Get_Unique_Keys_Size(set<*>/Duplicate_Flags/Bloom_Filter) -> [int, int]
+    """
+    if isinstance(unique_keys, Duplicate_Flags):
+        size = sys.getsizeof(unique_keys.flags) + unique_keys.size
+        return [unique_keys.count, size]
+    if isinstance(unique_keys, SKETCHES.Bloom_Filter):
+        return [len(unique_keys), unique_keys.Get_Memory()]
+    count = len(unique_keys)
+    size = sys.getsizeof(unique_keys)
+    sample = list(itertools.islice(unique_keys, UNIQUE_KEYS_SAMPLE))
+    if sample:
+        sample_size = 0
+        for key in sample:
+            sample_size += sys.getsizeof(key)
+            if type(key) == tuple:
+                for value in key: sample_size += sys.getsizeof(value)
+        size += (sample_size * count) // len(sample)
+    return [count, size]
+
+def Get_Peak_Memory():
+    """
+    Return the peak memory usage of this process, in bytes, or None if it
+    cannot be determined on this system.
+    
+    Get_Peak_Memory() -> int
+    """
+    if not resource: return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin": return peak # Bytes
+    return peak * 1024 # Kilobytes
 
 def Report_Metrics(rows_in, cols_in, rows_out, cols_out, repeats_elim,
-        filter_metrics, col_metrics):
+        filter_metrics, col_metrics, memory=None, error=None):
     """
     Print a report into the command line interface of the metrics of the
     operation.
@@ -1569,8 +2995,19 @@ def Report_Metrics(rows_in, cols_in, rows_out, cols_out, repeats_elim,
     @col_metrics
             (list<float>)
             The total value of each calculated column
-    
-    Report_Metrics(int, int, list<int>) -> None
+    @memory
+            (None/list<str, int, int, int>)
+            If non-unique rows were removed, the name of the method used to
+            store the keys, the number of keys stored, the memory used to store
+            them and the peak memory usage of the process, in bytes.
+    @error
+            (None/list<float, int>)
+            If a Bloom filter was used to remove non-unique rows, its estimated
+            false positive rate, and the estimated maximum number of unique rows
+            which were wrongly removed, and counted in [repeats_elim].
+    
+    Report_Metrics(int, int, list<int>, list<float>, list<*>, list<*>) ->
+            None
     """
     # Averages
     divisor = float(rows_out)
@@ -1609,6 +3046,16 @@ def Report_Metrics(rows_in, cols_in, rows_out, cols_out, repeats_elim,
             A = rows_in, B = cols_in, C = rows_out, D = cols_out,
             E = repeats_elim,
             F = filter_metrics_, G = col_metrics_))
+    if memory:
+        method, count, size, peak = memory
+        size = STR__memory_size.format(N = size/1048576.0)
+        if peak == None: peak = STR__memory_unknown
+        else: peak = STR__memory_size.format(N = peak/1048576.0)
+        PRINT.printM(STR__metrics_memory.format(M = method, N = count,
+                S = size, P = peak))
+    if error:
+        rate, bound = error
+        PRINT.printM(STR__metrics_bloom.format(R = rate, E = bound))
 
 
 
@@ -1843,15 +3290,21 @@ def Parse_Command_Line_Input__Multitool_For_Tables(raw_command_line_input):
     new_column_specs = []
     unique_cols = []
     new_headers = DEFAULT__new_headers
+    workers = DEFAULT__workers
+    fast = DEFAULT__fast
+    vectorised = DEFAULT__vectorised
+    dedup = DEFAULT__dedup
+    bloom_keys = DEFAULT__bloom_keys
+    bloom_error = DEFAULT__bloom_error
     
     # Validate optional inputs (except output path)
     while inputs:
         arg = inputs.pop(0)
         flag = 0
         try: # Following arguments
-            if arg in ["-a", "-u", "-k"]:
+            if arg in ["-a", "-u", "-k", "-w", "-q", "-v", "-d"]:
                 arg2 = inputs.pop(0)
-            elif arg in ["-n", "-o"]:
+            elif arg in ["-n", "-o", "-b"]:
                 arg2 = inputs.pop(0)
                 arg3 = inputs.pop(0)
             elif arg in ["-c"]:
@@ -1899,6 +3352,42 @@ def Parse_Command_Line_Input__Multitool_For_Tables(raw_command_line_input):
                 PRINT.printE(STR__use_help)
                 return 1
             unique_cols = [i-1 for i in unique_cols]
+        elif arg == "-q":
+            fast = Validate_Bool(arg2)
+            if fast == None:
+                PRINT.printE(STR__invalid_bool.format(s = arg2))
+                return 1
+        elif arg == "-v":
+            vectorised = Validate_Bool(arg2)
+            if vectorised == None:
+                PRINT.printE(STR__invalid_bool.format(s = arg2))
+                return 1
+            if vectorised and not numpy:
+                PRINT.printE(STR__no_numpy)
+                return 1
+        elif arg == "-d":
+            dedup = DICT__dedup.get(arg2, None)
+            if not dedup:
+                PRINT.printE(STR__invalid_dedup.format(s = arg2))
+                PRINT.printE(STR__use_help)
+                return 1
+        elif arg == "-b":
+            bloom_keys = Validate_Int_Positive(arg2)
+            if bloom_keys < 1:
+                PRINT.printE(STR__invalid_bloom_keys.format(s = arg2))
+                PRINT.printE(STR__use_help)
+                return 1
+            bloom_error = Validate_Float_Positive(arg3)
+            if not 0 < bloom_error < 1:
+                PRINT.printE(STR__invalid_bloom_error.format(s = arg3))
+                PRINT.printE(STR__use_help)
+                return 1
+        elif arg == "-w":
+            workers = Validate_Int_Positive(arg2)
+            if workers < 1:
+                PRINT.printE(STR__invalid_workers.format(s = arg2))
+                PRINT.printE(STR__use_help)
+                return 1
         elif arg == "-k":
             if arg2 in LIST__all:
                 temp = None
@@ -1982,6 +3471,12 @@ def Parse_Command_Line_Input__Multitool_For_Tables(raw_command_line_input):
                     return 1
                 header_specs.append([header_treatment, temp])
     
+    # Validate workers
+    if workers > 1 and unique_cols:
+        PRINT.printE(STR__workers_unique)
+        PRINT.printE(STR__use_help)
+        return 1
+    
     # Validate header order
     valid_header = Validate_Header_Order(header_specs)
     if not valid_header:
@@ -2010,7 +3505,8 @@ def Parse_Command_Line_Input__Multitool_For_Tables(raw_command_line_input):
     # Run program
     exit_state = Multitool_For_Tables(
         input_path, input_delim, output_path, output_delim, new_headers,
-        header_specs, filters, new_column_specs, unique_cols)
+        header_specs, filters, new_column_specs, unique_cols, workers, fast,
+        vectorised, dedup, bloom_keys, bloom_error)
     
     # Exit
     if exit_state == 0: return 0
@@ -1,6 +1,6 @@
 """
 TABLE FILE READER
-(version 2.1)
+(version 2.9.2)
 by Angelo Chan
 
 This module contains a Class capable of reading and interpretting files which
@@ -9,6 +9,9 @@ contain data tables and returning the values of each row, line by line.
 
 # Imported Modules #############################################################
 
+import os
+import mmap
+
 from File_Reader import *
 
 
@@ -79,6 +82,52 @@ class Table_Reader(File_Reader):
         f.Read()
         # Your code - You may access buffered elements in f
     f.Close()
+    
+    Alternatively, rows can be read in batches, which avoids most of the per-row
+    overhead of the above:
+    
+    f.Open()
+    for batch in f.iter_batches(): # OR batch = f.Read_Batch(1000)
+        for values in batch:
+            # Your code - [values] is the list of strings of one row
+    f.Close()
+    
+    Or iterated over directly, which reads in batches behind the scenes:
+    
+    f.Open()
+    for values in f: # OR for values in f.rows():
+        # Your code - [values] is the list of strings of one row
+    f.Close()
+    
+    Lines are read from the file in large blocks of bytes and buffered, for both
+    methods of reading.
+    
+    For read-only scans of large files, the file can instead be memory-mapped:
+    
+    f.Set_Mmap(True) # Before Open()
+    
+    In this mode, blocks of lines are sliced directly out of the mapped file,
+    and rows can be read starting from any byte offset, using Seek().
+    
+    This allows the rows of a file to be divided between several processes:
+    
+    f.Open()
+    chunks = f.Get_Chunks(4) # For 4 processes
+    f.Close()
+    # In each process, for one [start, end] in [chunks]:
+    f.Open()
+    f.Seek(start, end)
+    for values in f:
+        # Your code - [values] is the list of strings of one row of the chunk
+    f.Close()
+    
+    If only the first few columns of a wide file are needed, the rest of each
+    line can be left unsplit:
+    
+    f.Set_Max_Column(3) # Only columns 1-3 (index 0-2) are needed
+    
+    Each row then contains the first 3 values, followed by the unsplit remainder
+    of the line, if any.
     """
     
     # Minor Configurations #####################################################
@@ -91,6 +140,12 @@ class Table_Reader(File_Reader):
     _CONFIG__print_progress = False
     _CONFIG__print_metrics = True
     
+    _CONFIG__batch_size = 4096 # Default number of rows per batch
+    _CONFIG__block_size = 1048576 # Approximate number of bytes read at once
+    
+    _CONFIG__chunks_per_worker = 4 # Number of chunks per process, Get_Chunks()
+    _CONFIG__min_chunk_size = 1048576 # Minimum size of each chunk, in bytes
+    
     
     
     # Strings ##################################################################
@@ -121,12 +176,27 @@ class Table_Reader(File_Reader):
         self.Set_Keep_Enclosers(keep_enclosers)
         self.Set_Header_Params(header_params)
         self.prev_raw = self.current_raw = self.next_raw = ""
+        self.batch_raw = []
+        self.raw_lines = []
+        self.raw_index = 0
         self.header_text = ""
+        self.data_offset = 0
+        self.max_split = -1
+        self.use_mmap = False
+        self.mmap_buffer = None
+        self.mmap_pos = 0
+        self.mmap_end = 0
     
     
     
     # Property Methods #########################################################
     
+    def __iter__(self):
+        """
+        Iterate over the remaining rows of the file. See rows().
+        """
+        return self.rows()
+    
     def __getitem__(self, arg):
         """
         Access items using square brackets, the same way one would access items
@@ -188,6 +258,30 @@ class Table_Reader(File_Reader):
         """
         self.keep_enclosers = boolean
 
+    def Set_Max_Column(self, max_column):
+        """
+        Set the number of columns which need to be split from each row. Lines
+        are only split as far as the [max_column]th delimiter, so that the rest
+        of the line is not split into values which are never used. The rest of
+        the line, if any, is kept as a single value at the end of the row.
+        
+        A [max_column] of 0 means that every line is split fully.
+        
+        Only used for lines which contain no enclosers.
+        """
+        if max_column > 0: self.max_split = max_column
+        else: self.max_split = -1
+
+    def Set_Mmap(self, boolean):
+        """
+        Set whether or not to memory-map the file when it is opened. Takes
+        effect the next time the file is opened.
+        
+        Memory-mapping is only used after the header rows have been read.
+        Empty files are always read normally.
+        """
+        self.use_mmap = boolean
+
     def Set_Header_Params(self, params):
         """
         Set the header params of the file.
@@ -324,29 +418,31 @@ class Table_Reader(File_Reader):
     
     def Get_Size(self):
         """
-        Return the size of the table file.
+        Return the number of rows in the table file, excluding the header rows.
         
         Return -1 if no filepath has been set.
         """
-        if self.file_path:
-            count = 0
-            f = open(self.file_path, "U")
-            line = f.readline()
-            if self.header_params:
-                for param in self.header_params:
-                    if type(param) == int:
-                        while param > 0:
-                            line = self.file.readline()
-                            param -= 0
-                    if type(param) == str:
-                        while line.find(param) == 0:
-                            line = self.file.readline()
-            while line:
-                count += 1
-                line = f.readline()
+        if not self.file_path: return -1
+        f = open(self.file_path, "U")
+        header_text, line, offset = self._read_header_lines(f)
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, EnvironmentError): # Empty file
             f.close()
-            return count
-        return -1
+            return 0
+        # Count newlines (Windows, Unix and old Mac) in blocks
+        count = 0
+        size = len(buffer)
+        while offset < size:
+            end = min(offset + self._CONFIG__block_size, size)
+            while end < size and buffer[end-1] == "\r": end += 1 # Keep "\r\n"
+            text = buffer[offset:end]
+            count += text.count("\n") + text.count("\r") - text.count("\r\n")
+            offset = end
+            if offset == size and text[-1] not in "\r\n": count += 1
+        buffer.close()
+        f.close()
+        return count
     
     def Get_Raw(self):
         """
@@ -366,11 +462,115 @@ class Table_Reader(File_Reader):
         Requires at least one delimiter to be set.
         """
         if self.delimiter:
+            self.batch_raw = []
+            self.raw_lines = []
+            self.raw_index = 0
+            self._close_mmap()
             File_Reader.Open(self, new_path)
         else:
             self.printE(self._MSG__no_delimiter)
             return
     
+    def Close(self):
+        """
+        Close the file, and release the memory-mapping if there is one.
+        """
+        self._close_mmap()
+        File_Reader.Close(self)
+    
+    def Seek(self, offset, end=-1):
+        """
+        Move the reader so that the next row to be read is the row which starts
+        at byte [offset] of the file. [offset] must be the start of a line, such
+        as [data_offset], which is the offset of the first row after the header.
+        
+        If [end] is specified, the reader will treat byte [end] of the file as
+        the end of the file. [end] must also be the start of a line, or the end
+        of the file.
+        
+        Random access requires memory-mapping. The file is memory-mapped if it
+        is not already.
+        
+        Seek(int, int) -> None
+        """
+        if not self.mmap_buffer: self._open_mmap(offset)
+        self.raw_lines = []
+        self.raw_index = 0
+        self.batch_raw = []
+        if self.mmap_buffer:
+            self.mmap_pos = offset
+            size = len(self.mmap_buffer)
+            if end < 0 or end > size: end = size
+            self.mmap_end = end
+        self.prev_raw = self.current_raw = ""
+        self.next_raw = self._get_raw_lines(1)[0]
+        self.current_element = self.empty_element
+        self.next_element = self._get_next_element()
+        self.EOF = self.Is_Empty_Element(self.next_element)
+    
+    def Get_Chunks(self, workers):
+        """
+        Divide the rows of the file after the header into chunks, to be shared
+        between [workers] processes, and return the start and end offsets of
+        each chunk, for use with Seek().
+        
+        The rows are divided into up to _CONFIG__chunks_per_worker chunks per
+        process, of roughly equal size. Each chunk starts at the start of a
+        line. No chunk is smaller than _CONFIG__min_chunk_size bytes, except for
+        the last one.
+        
+        Requires the header to have been read, by Open().
+        
+        Get_Chunks(int) -> list<[int, int]>
+        """
+        start = self.data_offset
+        size = os.path.getsize(self.file_path)
+        if start >= size: return []
+        count = workers * self._CONFIG__chunks_per_worker
+        chunk_size = max((size - start)/count + 1, self._CONFIG__min_chunk_size)
+        f = open(self.file_path, "rb")
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        results = []
+        while start < size:
+            end = start + chunk_size
+            if end >= size:
+                end = size
+            else:
+                end = buffer.find("\n", end - 1)
+                if end == -1: end = size
+                else: end += 1
+            results.append([start, end])
+            start = end
+        buffer.close()
+        f.close()
+        return results
+    
+    def _open_mmap(self, offset):
+        """
+        Memory-map the currently open file, and continue reading it from byte
+        [offset].
+        
+        Return True if successful, and False if the file could not be mapped,
+        such as when it is empty.
+        """
+        try:
+            self.mmap_buffer = mmap.mmap(self.file.fileno(), 0,
+                    access=mmap.ACCESS_READ)
+        except (ValueError, EnvironmentError):
+            self.mmap_buffer = None
+            return False
+        self.mmap_pos = offset
+        self.mmap_end = len(self.mmap_buffer)
+        return True
+    
+    def _close_mmap(self):
+        """
+        Release the memory-mapping of the file, if there is one.
+        """
+        if self.mmap_buffer:
+            self.mmap_buffer.close()
+            self.mmap_buffer = None
+    
     
     
     # File Reading Methods #####################################################
@@ -385,21 +585,39 @@ class Table_Reader(File_Reader):
         variable. For strings, rows will be added directly to the "header_text"
         variable as long as those rows begin with the string specified.
         """
+        sb, line, offset = self._read_header_lines(self.file)
+        self.next_raw = line
+        self.header_text = sb
+        self.data_offset = offset
+        if self.use_mmap: self._open_mmap(self.file.tell())
+    
+    def _read_header_lines(self, f):
+        """
+        Read in the header rows of file object [f], according to the header
+        params.
+        
+        Return the header text, the first line after the header, and the byte
+        offset of that line.
+        
+        _read_header_lines(file) -> [str, str, int]
+        """
         params = self.header_params
         sb = ""
-        line = self.file.readline()
+        offset = f.tell()
+        line = f.readline()
         for param in params:
             if type(param) == int:
                 while param > 0:
                     sb += line
-                    line = self.file.readline()
+                    offset = f.tell()
+                    line = f.readline()
                     param -= 1
             if type(param) == str:
                 while line.find(param) == 0:
                     sb += line
-                    line = self.file.readline()
-        self.next_raw = line
-        self.header_text = sb
+                    offset = f.tell()
+                    line = f.readline()
+        return [sb, line, offset]
     
     def _get_next_element(self):
         """
@@ -409,60 +627,263 @@ class Table_Reader(File_Reader):
         """
         self.prev_raw = self.current_raw
         self.current_raw = self.next_raw
-        self.next_raw = self.file.readline()
+        if self.raw_index < len(self.raw_lines):
+            self.next_raw = self.raw_lines[self.raw_index]
+            self.raw_index += 1
+        else:
+            self.next_raw = self._get_raw_lines(1)[0]
         if self.enclosers:
             return self._process_raw(self.current_raw, self.delimiter,
                     self.enclosers, self.keep_enclosers)
-        return self._process_raw__SIMPLE(self.current_raw, self.delimiter)
+        return self._process_raw__SIMPLE(self.current_raw, self.delimiter,
+                self.max_split)
+    
+    def _get_raw_lines(self, n):
+        """
+        Return the next [n] lines of raw text from the file.
+        
+        Lines are read from the file in blocks of roughly
+        _CONFIG__block_size bytes, and kept in a buffer until they are needed.
+        
+        Once the end of the file has been reached, empty strings are returned in
+        place of lines, the same as file.readline().
+        """
+        index = self.raw_index
+        lines = self.raw_lines[index:index+n]
+        self.raw_index = index + len(lines)
+        while len(lines) < n:
+            block = self._read_block()
+            if not block:
+                lines.extend([""]*(n - len(lines)))
+                break
+            needed = n - len(lines)
+            lines.extend(block[:needed])
+            self.raw_lines = block
+            self.raw_index = min(needed, len(block))
+        return lines
+    
+    def _read_block(self):
+        """
+        Read in a block of roughly _CONFIG__block_size bytes and return it as a
+        list of complete lines, or an empty list at the end of the file.
+        
+        In memory-mapped mode, the block is sliced out of the mapped file in one
+        piece and then split, with Windows and old Mac newlines converted to
+        Unix newlines, the same as when reading in universal newline mode.
+        """
+        if not self.mmap_buffer:
+            return self.file.readlines(self._CONFIG__block_size)
+        buffer = self.mmap_buffer
+        start = self.mmap_pos
+        stop = self.mmap_end
+        if start >= stop: return []
+        end = start + self._CONFIG__block_size
+        if end >= stop:
+            end = stop
+        else:
+            end = buffer.find("\n", end - 1, stop)
+            if end == -1: end = stop
+            else: end += 1
+        self.mmap_pos = end
+        text = buffer[start:end]
+        if "\r" in text: text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text.splitlines(True)
+    
+    def _unget_raw_lines(self, lines):
+        """
+        Return lines of raw text which have been taken from the buffer, but not
+        used, to the front of the buffer.
+        """
+        self.raw_lines = lines + self.raw_lines[self.raw_index:]
+        self.raw_index = 0
+    
+    def Read_Batch(self, n=0):
+        """
+        Read in the next [n] rows, or as many rows as remain in the file, and
+        return them as a list of rows. Each row is a list of strings, the same
+        as would be returned by Get().
+        
+        If [n] is not specified, _CONFIG__batch_size is used.
+        
+        Afterwards, the reader is left in the same state it would be in if
+        Read() had been called once for each row in the batch. The current
+        element is the last row of the batch, and the raw text of every row in
+        the batch is stored in [batch_raw].
+        
+        Return an empty list if the end of the file has already been reached.
+        
+        Read_Batch(int) -> list<list<str>>
+        """
+        if self.EOF:
+            self.batch_raw = []
+            return []
+        if n < 1: n = self._CONFIG__batch_size
+        # Raw text
+        #   raws[i] is the raw text of elements[i]. The final entry is the line
+        #   after the new "next" element.
+        raws = [self.current_raw, self.next_raw] + self._get_raw_lines(n)
+        # Process
+        delim = self.delimiter
+        if self.enclosers:
+            process = self._process_raw
+            enclosers = self.enclosers
+            keep_enclosers = self.keep_enclosers
+            elements = [process(raw, delim, enclosers, keep_enclosers)
+                    for raw in raws[1:n+1]]
+        else:
+            process = self._process_raw__SIMPLE
+            max_split = self.max_split
+            elements = [process(raw, delim, max_split) for raw in raws[1:n+1]]
+        elements.insert(0, self.next_element)
+        # Number of rows in batch
+        try:
+            count = elements.index(self.empty_element, 1)
+        except ValueError:
+            count = n
+        # Update state
+        batch = elements[:count]
+        self.batch_raw = raws[:count]
+        self.current_element = batch[-1]
+        self.next_element = elements[count]
+        self.prev_raw = raws[count-1]
+        self.current_raw = raws[count]
+        self.next_raw = raws[count+1]
+        if count+2 < len(raws): self._unget_raw_lines(raws[count+2:])
+        if self.Is_Empty_Element(self.next_element): self.EOF = True
+        return batch
+    
+    def iter_batches(self, n=0):
+        """
+        A generator which reads the rest of the file, [n] rows at a time, and
+        yields each batch of rows as it is read.
+        
+        If [n] is not specified, _CONFIG__batch_size is used.
+        
+        See Read_Batch() for more details.
+        """
+        while not self.EOF:
+            yield self.Read_Batch(n)
+    
+    def rows(self, n=0):
+        """
+        A generator which reads the rest of the file and yields each row, one at
+        a time, as a list of strings.
+        
+        Rows are read from the file in batches of [n] rows. Only one batch is
+        held in memory at any one time, regardless of the size of the file. If
+        [n] is not specified, _CONFIG__batch_size is used.
+        
+        As rows are read a batch at a time, the current element and raw text of
+        the reader will be those of the last row of the current batch, and not
+        necessarily those of the row most recently yielded.
+        
+        Generators can be chained onto this one to build a pipeline:
+        
+            rows = f.rows()
+            rows = (values for values in rows if values[0])   # Filter
+            rows = (values[1:3] for values in rows)           # Project
+            o.writelines("\\t".join(values) + "\\n" for values in rows) # Write
+        """
+        for batch in self.iter_batches(n):
+            for values in batch:
+                yield values
+    
+    def rows_with_raw(self, n=0):
+        """
+        A generator which reads the rest of the file and yields each row, one at
+        a time, as a tuple of the list of strings and the raw text of the row.
+        
+        Useful for writing out rows which do not need to be changed, without
+        joining their values back together.
+        
+        See rows() for more details.
+        """
+        for batch in self.iter_batches(n):
+            for pair in zip(batch, self.batch_raw):
+                yield pair
     
     def _process_raw(self, raw_str, delim, enclosers, keep_enclosers):
         """
         Process a line of raw text from the table file into a list of strings.
         
         Delimiters enclosed within [enclosers] chars are not treated delimiters.
-        """
-        flag = False
-        active_encloser = ""
-        sb = ""
+        
+        The line is first split on every delimiter. Pieces containing no
+        enclosers are complete fields and are used as they are. The remaining
+        pieces are scanned by jumping from one encloser to the next, and are
+        joined back together (along with the delimiters between them) until the
+        active encloser is closed.
+        
+        Lines which contain no enclosers are only split as far as the column set
+        by Set_Max_Column(). Lines which do are always split fully.
+        """
+        enclosers = [e for e in enclosers if len(e) == 1 and e in raw_str]
+        if not enclosers: # No enclosers in this line
+            return self._process_raw__SIMPLE(raw_str, delim, self.max_split)
+        if len(delim) != 1 or delim in enclosers: # Delimiter never splits
+            pieces = [raw_str]
+        else:
+            pieces = raw_str.split(delim)
         results = []
-        for c in raw_str:
-            if flag:
-                if c == active_encloser:
-                    if keep_enclosers: sb += c
-                    flag = False
-                else:
-                    sb += c
+        sb = []
+        active_encloser = ""
+        for piece in pieces:
+            if active_encloser: # Delimiter was enclosed
+                sb.append(delim)
             else:
-                if c in enclosers:
-                    if keep_enclosers: sb += c
-                    flag = True
-                    active_encloser = c
-                elif c == delim:
-                    results.append(sb)
-                    sb = ""
+                for e in enclosers:
+                    if e in piece: break
+                else: # No enclosers
+                    results.append(piece)
+                    continue
+            # Scan piece
+            index = 0
+            while True:
+                if active_encloser:
+                    pos = piece.find(active_encloser, index)
+                    if pos == -1:
+                        sb.append(piece[index:])
+                        break
+                    if keep_enclosers: sb.append(piece[index:pos+1])
+                    else: sb.append(piece[index:pos])
+                    active_encloser = ""
+                    index = pos + 1
                 else:
-                    sb += c
-        if sb and sb[-1] in LIST__newline: sb = sb[:-1]
-        results.append(sb)
+                    pos = -1
+                    for e in enclosers:
+                        p = piece.find(e, index)
+                        if p != -1 and (pos == -1 or p < pos):
+                            pos = p
+                            active_encloser = e
+                    if pos == -1:
+                        sb.append(piece[index:])
+                        break
+                    if keep_enclosers: sb.append(piece[index:pos+1])
+                    else: sb.append(piece[index:pos])
+                    index = pos + 1
+            if not active_encloser: # End of field
+                results.append("".join(sb))
+                sb = []
+        if active_encloser: # Never closed; runs to the end of the line
+            results.append("".join(sb))
+        last = results[-1]
+        if last and last[-1] in LIST__newline: results[-1] = last[:-1]
         return results
     
-    def _process_raw__SIMPLE(self, raw_str, delim):
+    def _process_raw__SIMPLE(self, raw_str, delim, max_split=-1):
         """
         Process a line of raw text from the table file into a list of strings.
         
         This is the simple version of the function for when there are no
-        enclosers.
+        enclosers, and splits the whole line in a single call to str.split.
+        
+        If [max_split] is specified, the line is split no more than [max_split]
+        times. See Set_Max_Column().
         """
-        sb = ""
-        results = []
-        for c in raw_str:
-            if c == delim:
-                results.append(sb)
-                sb = ""
-            else:
-                sb += c
-        if sb and sb[-1] in LIST__newline: sb = sb[:-1]
-        results.append(sb)
+        if len(delim) == 1: results = raw_str.split(delim, max_split)
+        else: results = [raw_str]
+        last = results[-1]
+        if last and last[-1] in LIST__newline: results[-1] = last[:-1]
         return results
     
     def Is_Empty_Element(self, element):
@@ -509,15 +930,13 @@ def Col_No_To_Set(files, file_format, col_no=0):
     f = Table_Reader()
     delim = DICT__delimiters[file_format]
     f.Set_Delimiter(delim)
+    f.Set_Mmap(True)
     
     # Read
     for file_ in files:
         f.Set_New_Path(file_)
-        f.Open()    
-        while not f.EOF:
-            f.Read()
-            item = f[col_no]
-            result.add(item)
+        f.Open()
+        result.update(values[col_no] for values in f.rows())
         f.Close()
     
     # Return
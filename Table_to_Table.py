@@ -1,6 +1,6 @@
 HELP_DOC = """
 TABLE TO TABLE
-(version 4.1)
+(version 4.6.1)
 by Angelo Chan
 
 This is a program for basic table file parsing.
@@ -43,7 +43,7 @@ USAGE:
     python27 Table_to_Table.py <input_path> <{input_format}> <output_path>
             [-f {output_format}] <col_no>... [filter]...
             [-h keep|skip|rearrange N|C <number>|<character>]...
-            [-n <novel_unique_cols>]
+            [-n <novel_unique_cols>] [-b <expected_keys> <error_rate>]
 
 
 
@@ -191,6 +191,19 @@ OPTIONAL:
         
         If no unique columns are specified, no rows of data will be filtered
         out.
+    
+    expected_keys
+    error_rate
+        
+        Record the combinations of values seen so far in a Bloom filter, sized
+        for <expected_keys> unique combinations, instead of recording every
+        combination. This uses a fixed amount of memory, but a fraction of the
+        novel rows, up to around <error_rate>, may be wrongly rejected. An
+        estimate of how many rows this may have happened to is reported with
+        the other metrics. <error_rate> must be between 0 and 1.
+        
+        Only used if novel unique columns are specified. For exploratory use
+        only.
 
 
 
@@ -214,6 +227,10 @@ EXAMPLES EXPLANATION:
     Keep columns 1, 2, 3, and 4 in that order, keeping only unique combinations
     of values in columns 1, 2, and 3.
     
+    5:
+    As example 4, but using a Bloom filter sized for 10 million unique
+    combinations, which will wrongly reject no more than 1 in 1000 novel rows.
+    
 EXAMPLES:
 
     python27 Table_to_Table.py Test_Data_1.tsv tsv Test_Output.csv -f csv 2 3 4
@@ -228,13 +245,16 @@ EXAMPLES:
 
     python27 Table_to_Table.py Test_Data_1.tsv tsv Test_Output.csv -f csv 1 2 3
             4 -n 1n2n3
+    
+    python27 Table_to_Table.py Test_Data_1.tsv tsv Test_Output.csv -f csv 1 2 3
+            4 -n 1n2n3 -b 10000000 0.001
 
 USAGE:
     
     python27 Table_to_Table.py <input_path> <{input_format}> <output_path>
             [-f {output_format}] <col_no>... [filter]...
             [-h keep|skip|rearrange N|C <number>|<character>]...
-            [-u <col_no>]...
+            [-u <col_no>]... [-b <expected_keys> <error_rate>]
 """
 
 
@@ -255,6 +275,10 @@ PRINT_METRICS = True
 # Imported Modules #############################################################
 
 import sys
+from operator import itemgetter
+
+import _Sketches as SKETCHES # 1.0
+import _Buffered_Writer as WRITER # 1.0
 
 
 
@@ -322,6 +346,11 @@ ERROR: Please specify 3 arguments if you use the -h; whether to keep or skip the
 lines, whether to keep/skip lines beginning with a certain character or a set
 number of lines, and either character or the number of lines."""
 
+STR__specify_bloom = """
+ERROR: Please specify 2 arguments if you use the -b; the number of unique
+combinations of values expected, as a positive integer, and the acceptable error
+rate, as a number between 0 and 1."""
+
 STR__specify_unique_columns = """
 ERROR: Please specify columns for which a new unique combination of values is
 required for row of data to be accepted. Separated by the character "n" and no
@@ -359,6 +388,8 @@ STR__metrics_lines = "\nTotal_Lines:  {N}"
 
 STR__metrics_passed = "Total_Passed: {N} ( {P}% )"
 
+STR__metrics_bloom = "Wrongly_Rejected: Up to {N} (estimated)"
+
 STR__parsing_args = "\nParsing arguments..."
 
 STR__t2t_begin = "\nRunning Table_To_Table..."
@@ -437,7 +468,7 @@ for i in LIST__char: DICT__header_type[i] = HEADER_TYPE.CHAR
 # File Processing Code #########################################################
 
 def Table_To_Table(path_in, delim_in, path_out, delim_out, columns,
-            inc_filters, exc_filters, headers, novel_unique):
+            inc_filters, exc_filters, headers, novel_unique, bloom=None):
     """
     Function which performs the basic table file parsing.
     
@@ -511,23 +542,34 @@ def Table_To_Table(path_in, delim_in, path_out, delim_out, columns,
             the specified columns needs to be unique across the entire file.
             Uses the 1-index system. (The first column's index number is 1)
             0 is used to signify an empty column.
+    @bloom
+            (None/list<int, float>)
+            If specified, the combinations of values seen so far are recorded
+            in a Bloom filter instead of a set. Consists of the number of
+            unique combinations expected, and the acceptable chance of a novel
+            row being wrongly rejected.
     
     Return a value of 0 if the function runs successfully.
     
     Table_To_Table(str, str, str, str, list<int>, list<int,int,str/int/float>,
-            list<int,int,str/int/float>) -> int
+            list<int,int,str/int/float>, list<[int,int,str/int]>, list<int>,
+            list<int, float>) -> int
     """
     printP(STR__t2t_begin)
     
+    # Compile output
+    create_output = Compile_Output(columns, delim_out)
+    
     # Initialize File IO
     r = open(path_in, "U")
-    w = open(path_out, "w")
+    w = WRITER.Open_Buffered(path_out)
 
     line = r.readline()
     
     # Initialize Metrics
     count_total = 0
     count_passed = 0
+    count_repeats = 0
     
     # Header and Comments
     for header_list in headers:
@@ -536,27 +578,37 @@ def Table_To_Table(path_in, delim_in, path_out, delim_out, columns,
         # A set number of lines
         if action_type == HEADER_TYPE.NUM:
             while value > 0:
-                Process_Header(line, action, w, delim_in, delim_out, columns)
+                Process_Header(line, action, w, delim_in, create_output)
                 line = r.readline()
                 value = value - 1
         
         # Lines beginning with a specified characters
         elif action_type == HEADER_TYPE.CHAR:
             while line[0] == value:
-                Process_Header(line, action, w, delim_in, delim_out, columns)
+                Process_Header(line, action, w, delim_in, create_output)
                 line = r.readline()
     
     # Intialize Other Processing Nnecessities
+    width = Get_Passthrough_Width(columns, delim_in, delim_out)
+    if width:
+        max_column = Get_Max_Column([], inc_filters, exc_filters, novel_unique)
+    else:
+        max_column = Get_Max_Column(columns, inc_filters, exc_filters,
+                novel_unique)
+    delims = width - 1
     temp = []
     for i in novel_unique: temp.append(i - 1)
     novel_unique = temp
-    recorded_combinations = set([])    
+    if novel_unique and bloom:
+        recorded_combinations = SKETCHES.Bloom_Filter(bloom[0], bloom[1])
+    else:
+        recorded_combinations = set([])
     
     # Main Loop
     while line:
         count_total += 1
         
-        data = Parse_Line(line, delim_in)
+        data = Parse_Line(line, delim_in, max_column)
         
         test = Filter(data, inc_filters, exc_filters)
         
@@ -569,8 +621,17 @@ def Table_To_Table(path_in, delim_in, path_out, delim_out, columns,
         if test and tup:
             count_passed += 1
             recorded_combinations.add(tup)
-            string = Create_Output(data, columns, delim_out)
+            if not width:
+                string = create_output(data)
+            elif line.count(delim_in) == delims: # Unchanged
+                if line[-1] == "\n": string = line
+                elif line[-1] == "\r": string = line[:-1] + "\n"
+                else: string = line + "\n"
+            else: # Only partly split
+                string = create_output(Parse_Line(line, delim_in))
             w.write(string)
+        elif test:
+            count_repeats += 1
         
         # Main Loop (2)
         line = r.readline()
@@ -586,13 +647,17 @@ def Table_To_Table(path_in, delim_in, path_out, delim_out, columns,
 
     printM(STR__metrics_lines.format(N = s_total))
     printM(STR__metrics_passed.format(N = s_passed, P = s_percentage))
+    if novel_unique and bloom:
+        bound = recorded_combinations.Get_Error_Bound(count_passed +
+                count_repeats)
+        printM(STR__metrics_bloom.format(N = min(bound, count_repeats)))
     # Exit
     printP(STR__t2t_complete)
     return 0
 
 
 
-def Process_Header(line, action, writefile, delim_in, delim_out, columns):
+def Process_Header(line, action, writefile, delim_in, create_output):
     """
     Process the line according to the action specified.
 
@@ -601,8 +666,8 @@ def Process_Header(line, action, writefile, delim_in, delim_out, columns):
     If [action] is 2 (KRS.SKIP), then the line is ignored.
 
     If [action] is 3 (KRS.READ), then the contents of [line] are parsed using
-    [delim_in] and rearranged according to [delim_out] and [columns], before
-    being written to [writefile].
+    [delim_in] and rearranged using [create_output], before being written to
+    [writefile].
 
     Return 0 if the operation was carried out without problem.
     Return 1 if there was a problem.
@@ -623,16 +688,12 @@ def Process_Header(line, action, writefile, delim_in, delim_out, columns):
     @delim_in
             (str)
             The delimiter use by the input file. 
-    @delim_out
-            (str)
-            The delimiter use by the output file.
-    @columns
-            (list<int>)
-            An list of the columns to be retained from the input file, in that
-            specified order.
-            Uses the 1-index system. (The first column's index number is 1)
+    @create_output
+            (function)
+            The function which turns a list of data values into an output line,
+            as returned by Compile_Output().
     
-    Process_Header(str, int, file, str, str, list<int>) -> int
+    Process_Header(str, int, file, str, function) -> int
     """
     if action == KSR.KEEP: # Keep
         writefile.write(line)
@@ -641,53 +702,101 @@ def Process_Header(line, action, writefile, delim_in, delim_out, columns):
         return 0
     elif action == KSR.REAR: # Rearrange
         values = Parse_Line(line, delim_in)
-        line = Create_Output(values, columns, delim_out)
+        line = create_output(values)
         writefile.write(line)
         return 0
     return 1
 
 
 
-def Parse_Line(line, delim):
+def Parse_Line(line, delim, max_column=0):
     """
     Parse the raw output of a line from a table file and return a list
     containing all the data values in that line.
     Newline characters are excluded.
     
-    Parse_Line(str, str) -> list<str>
+    If [max_column] is specified, only the first [max_column] values are split
+    from the line. The rest of the line, if any, is kept as a single value at
+    the end of the list.
+    
+    Parse_Line(str, str, int) -> list<str>
     """
-    result = line.split(delim)
+    if max_column > 0: result = line.split(delim, max_column)
+    else: result = line.split(delim)
     if result[-1][-1] == "\n" or result[-1][-1] == "\r":
         result[-1] = result[-1][:-1]
     return result
 
 
 
-def Create_Output(data, columns, delim):
+def Get_Max_Column(columns, inc_filters, exc_filters, novel_unique):
     """
-    Take a list of data values, a list of column numbers and a delimiter and
-    produce a string intended to be written to an output table file.
-    The list of column numbers determines which values from [data] are kept, and
-    in what order.
-    The columns use a 1-index system.
+    Return the highest column number used by the output columns, the filters
+    and the novel unique columns, to be used as the [max_column] of
+    Parse_Line(). All column numbers use the 1-index system.
+    
+    Return 0 if a filter or novel unique column number of 0 or less is used, as
+    these refer to columns counted from the end of the line, in which case every
+    line needs to be split fully. Return 1 if no columns are used at all.
     
-    Create_Output(list<str>, list<int>, str) -> str
+    Get_Max_Column(list<int>, list<int,int,str/int/float>,
+            list<int,int,str/int/float>, list<int>) -> int
     """
-    first = columns[0]
-    others = columns[1:]
+    col_nos = [criteria[0] for criteria in inc_filters + exc_filters]
+    col_nos += novel_unique
+    if col_nos and min(col_nos) < 1: return 0
+    return max(col_nos + columns + [1])
 
-    if first == 0: sb = ""
-    else: sb = data[first - 1]
+def Get_Passthrough_Width(columns, delim_in, delim_out):
+    """
+    Return the number of columns kept if [columns] would produce output lines
+    identical to the input lines, for input lines with that many columns. This
+    is when all of the columns from the first column up to the last column kept
+    are kept in order, and the input and output delimiters are the same.
     
-    for i in others:
-        if i == 0:
-            sb += (delim + "")
-        else:
-            sb += (delim + data[i - 1])
-
-    sb += "\n"
+    Return 0 otherwise.
+    
+    Get_Passthrough_Width(list<int>, str, str) -> int
+    """
+    if delim_in != delim_out or not delim_in: return 0
+    if columns != range(1, len(columns) + 1): return 0
+    return len(columns)
 
-    return sb
+def Compile_Output(columns, delim):
+    """
+    Compile a list of column numbers and a delimiter into a function which takes
+    a list of data values and produces a string intended to be written to an
+    output table file. The list of column numbers determines which values from
+    the data are kept, and in what order. The columns use a 1-index system, and
+    a column number of 0 produces an empty column.
+    
+    Rather than adding the values to a string one at a time, the values are
+    picked out of each row by a single itemgetter and joined together in one
+    call.
+    
+    Empty columns (0) are picked from an empty string, which is added to the end
+    of the row before the values are picked, then removed again.
+    
+    The compiled function returns the kept values, separated by [delim], and
+    followed by a newline character.
+    
+    Compile_Output(list<int>, str) -> function
+    """
+    indexes = [i - 1 for i in columns] # Empty columns become -1
+    empty = 0 in columns
+    if len(indexes) == 1:
+        if empty: return lambda data: "\n"
+        index = indexes[0]
+        return lambda data: data[index] + "\n"
+    getter = itemgetter(*indexes)
+    join = delim.join
+    if not empty: return lambda data: join(getter(data)) + "\n"
+    def Create_Output__COMPILED(data):
+        data.append("")
+        string = join(getter(data)) + "\n"
+        data.pop()
+        return string
+    return Create_Output__COMPILED
 
 
 
@@ -995,6 +1104,7 @@ def Parse_Command_Line_Input__t2t(raw_command_line_input):
     exc_filters = []
     headers = []
     n_uniques = []
+    bloom = None
     
     # Parse the rest
     while inputs:
@@ -1046,6 +1156,22 @@ def Parse_Command_Line_Input__t2t(raw_command_line_input):
                 # Error messages already printed by Validate_Header_ALL
                 return 1
             
+        elif arg == "-b": # Bloom filter for unique value combinations
+
+            # 2 Args
+            try:
+                expected_keys = int(inputs.pop(0))
+                error_rate = float(inputs.pop(0))
+            except:
+                printE(STR__specify_bloom)
+                return 1
+
+            # Validate
+            if expected_keys < 1 or not 0 < error_rate < 1:
+                printE(STR__specify_bloom)
+                return 1
+            bloom = [expected_keys, error_rate]
+            
         else: # Column number of filtering criteria
             flag_error = True
 
@@ -1079,7 +1205,7 @@ def Parse_Command_Line_Input__t2t(raw_command_line_input):
     
     # Run program
     Table_To_Table(path_in, delim_in, path_out, delim_out, columns,
-            inc_filters, exc_filters, headers, n_uniques)
+            inc_filters, exc_filters, headers, n_uniques, bloom)
     
     # Safe exit
     return 0
@@ -1,6 +1,6 @@
 HELP_DOC = """
 TALLY COLUMN
-(version 2.1.1)
+(version 2.6.2)
 by Angelo Chan
 
 This is a program for tallying the values in a column.
@@ -14,7 +14,7 @@ USAGE:
     python27 Tally_Column.py <input_file> <input_format> <column_no>
             [-o <output_file>] [-s <separator>] [-m C|F|M|P|S|T|U]
             [-r A|D|N|R|O] [-p <placeholder_file> <placeholder_format>
-            <placeholder_column_no>]
+            <placeholder_column_no>] [-t <top_k>] [-w <workers>]
 
 
 
@@ -102,6 +102,29 @@ OPTIONAL:
         
         The number of the column containing the placeholder values. Uses an
         index-1 system. (The first column is column 1)
+    
+    top_k
+        
+        (DEFAULT: None)
+        
+        Only report the <top_k> most frequent values, using a fixed amount of
+        memory regardless of how many different values there are. The counts
+        are approximate. A third column is added to the output, which contains
+        the maximum amount by which each count may exceed the true count. Any
+        value which accounts for more than 1/(<top_k> * 10) of the total count
+        is guaranteed to be found. The number of different unique values in
+        the metrics will be the number of values being monitored at the end.
+        
+        Cannot be used with a placeholder file or the original order.
+    
+    workers
+        
+        (DEFAULT: 1)
+        
+        The number of processes to use. If more than 1, the file is split into
+        chunks, which are tallied in parallel and then combined. The results
+        are the same, but the counts in the fraction mode may differ slightly,
+        in the last few significant digits. Cannot be used with <top_k>.
 
 
 
@@ -114,6 +137,13 @@ EXAMPLES EXPLANATION:
     Tally 4th column, which contains values separated by semicolons. Use the
     fractional system when counting entries with multiple values per row.
     Specify an output file. Place highest counts at the top of the output file.
+    
+    3:
+    Report the 100 most frequent values in the 2nd column, which contains too
+    many different values to tally exactly.
+    
+    4:
+    Tally the 4th column, as in example 2, using 4 processes.
 
 EXAMPLE:
     
@@ -121,13 +151,17 @@ EXAMPLE:
     
     python27 Tally_Column.py data\data_file.tsv tsv 4 -s ; -m F
             -o results\data_column_4_tallied.csv -r D
+    
+    python27 Tally_Column.py data\data_file.tsv tsv 2 -t 100
+    
+    python27 Tally_Column.py data\data_file.tsv tsv 4 -s ; -m F -w 4
 
 USAGE:
     
     python27 Tally_Column.py <input_file> <input_format> <column_no>
             [-o <output_file>] [-s <separator>] [-m C|F|M|P|S|T|U]
             [-r A|D|N|R|O] [-p <placeholder_file> <placeholder_format>
-            <placeholder_column_no>]
+            <placeholder_column_no>] [-t <top_k>] [-w <workers>]
 """
 
 NAME = "Tally_Column.py"
@@ -151,6 +185,8 @@ PRINT_METRICS = True
 
 FILEMOD = "__TALLY_c_{N}.tsv"
 
+TOP_K_FACTOR = 10 # Number of values monitored per value reported, in top-K mode
+
 
 
 # Defaults #####################################################################
@@ -158,14 +194,21 @@ FILEMOD = "__TALLY_c_{N}.tsv"
 
 DEFAULT__mode = 3 # Count
 DEFAULT__order = 3 # Descending (numerical)
+DEFAULT__top_k = None
+DEFAULT__workers = 1
 
 
 # Imported Modules #############################################################
 
+import collections
+import multiprocessing
+
 import _Controlled_Print as PRINT
 from _Command_Line_Parser import *
 
 from Table_File_Reader import *
+import _Sketches as SKETCHES # 1.1
+import _Buffered_Writer as WRITER # 1.0
 
 
 
@@ -229,6 +272,30 @@ Please specify one of the following:
 
 
 
+STR__invalid_top_k = """
+ERROR: Invalid number of top values: {s}
+Please specify a positive integer.
+"""
+
+STR__top_k_placeholder = """
+ERROR: A placeholder file cannot be used when reporting the top values.
+"""
+
+STR__top_k_original = """
+ERROR: The original order cannot be used when reporting the top values.
+"""
+
+STR__top_k_workers = """
+ERROR: Multiple workers cannot be used when reporting the top values.
+"""
+
+STR__invalid_workers = """
+ERROR: Invalid number of workers: {s}
+Please specify a positive integer.
+"""
+
+
+
 STR__failed_placeholder = """
 ERROR: A problem occured when getting values from the placeholder file.
 """
@@ -246,6 +313,10 @@ STR__metrics = """
              Number of values counted: {D}
        Average count per unique value: {E}"""
 
+STR__metrics_top_k = """
+                  Top values reported: {A}
+          Maximum overcount per value: {B}"""
+
 
 
 STR__tally_begin = "\nRunning Tally_Column..."
@@ -313,7 +384,8 @@ PRINT.PRINT_METRICS = PRINT_METRICS
 # Functions ####################################################################
 
 def Tally_Column(path_in, delim, col_no, path_out, separator, mode, order,
-            path_placeholder, delim_placeholder, col_no_placeholder):
+            path_placeholder, delim_placeholder, col_no_placeholder,
+            top_k=None, workers=1):
     """
     Generate a series of FASTA files each containing a synthetic chromosome.
     
@@ -373,167 +445,368 @@ def Tally_Column(path_in, delim, col_no, path_out, separator, mode, order,
             (int)
             The index number of the column in the placeholder file to use as a
             placeholder.
+    @top_k
+            (None/int)
+            If specified, only the [top_k] values with the highest counts are
+            reported, along with the maximum error of each count. The counts
+            are kept in a Space_Saving sketch, which monitors [top_k] *
+            TOP_K_FACTOR values at once, instead of a dict of every value.
+            Cannot be used with [path_placeholder] or the original order.
+    @workers
+            (int)
+            The number of processes used to tally the file. If more than 1, the
+            file is split into chunks which are tallied in parallel, using
+            Tally_Chunks_Parallel(). Cannot be used with [top_k].
     
     Return a value of 0 if the function runs successfully.
     Return a value of 1 if there is a problem.
     
-    Tally_Column(str, str, int, str, str, int) -> int
+    Tally_Column(str, str, int, str, str, int, int, str, str, int, int, int) ->
+            int
     """
     
     PRINT.printP(STR__tally_begin)
     
     # Setup reporting
-    total_rows = 0
     total_unique = 0
-    total_counted = 0
-    total_value = 0
-    counts = {}
+    if top_k: counts = SKETCHES.Space_Saving(top_k * TOP_K_FACTOR)
+    elif order == ORDER.ORIGINAL: counts = collections.OrderedDict()
+    else: counts = {}
     
     # I/O setup
     f = Table_Reader()
     f.Set_New_Path(path_in)
     f.Set_Delimiter(delim)
+    f.Set_Max_Column(col_no + 1)
+    f.Set_Mmap(True)
     f.Open()
     f.Close()
-    o = open(path_out, "w")
-    
-    # Original order
-    original_order = []
+    o = WRITER.Open_Buffered(path_out)
     
     # Placeholders
     if path_placeholder:
-        counts = Get_Placeholders(path_placeholder, delim_placeholder,
+        placeholders = Get_Placeholders(path_placeholder, delim_placeholder,
                 col_no_placeholder)
-        if not counts:
+        if not placeholders:
             PRINT.printE(STR__failed_placeholder)
             return 1
+        counts.update(placeholders)
     
     # Main loop
-    f.Open()
-    while not f.EOF:
-        f.Read()
-        total_rows += 1
-        columns = f.Get()
-        # Get values
-        if separator:
-            values_raw = columns[col_no]
-            values = values_raw.split(separator)
+    if workers > 1:
+        totals = Tally_Chunks_Parallel(path_in, delim, col_no, separator, mode,
+                order, workers, counts)
+    else:
+        f.Open()
+        totals = Tally_Batches(f.iter_batches(), col_no, separator, mode,
+                counts)
+        f.Close()
+    if totals == None:
+        o.close()
+        PRINT.printE(STR__unexpected_failure)
+        return 2
+    total_rows, total_counted, total_value = totals
+    
+    # Write
+    if top_k:
+        top = {}
+        for k in counts.Get_Top(top_k): top[k] = counts[k]
+        keys = Get_Keys_Order(top, order)
+        for k in keys:
+            sb = (k + "\t" + str(counts[k]) + "\t" + str(counts.Get_Error(k)) +
+                    "\n")
+            o.write(sb)
+    else:
+        if order == ORDER.ORIGINAL:
+            keys = counts.keys()
         else:
-            values = [columns[col_no]]
-        # Mode-dependant
-        if mode == MODE.SINGLE: # Single
-            if len(values) == 1:
-                total_counted += 1
-                total_value += 1
-                value = values[0]
-                if value not in counts:
-                    counts[value] = 1
-                    original_order.append(value)
-                else:
-                    counts[value] += 1
-        elif mode == MODE.COUNT: # Count
-            for value in values:
-                total_counted += 1
-                total_value += 1
-                if value not in counts:
-                    counts[value] = 1
-                    original_order.append(value)
-                else:
-                    counts[value] += 1
-        else: # Fraction/Present/Tied/Unique
-            # Do mini count
-            mini_count = {}
-            mini_total = 0
-            for value in values:
-                mini_total += 1
-                if value not in mini_count:
-                    mini_count[value] = 1.0
-                    original_order.append(value)
-                else:
-                    mini_count[value] += 1
+            keys = Get_Keys_Order(counts, order)
+        for k in keys:
+            sb = k + "\t" + str(counts[k]) + "\n"
+            o.write(sb)
+    
+    # Finish
+    o.close()
+    PRINT.printP(STR__tally_complete)
+    
+    # Reporting
+    total_unique = len(counts)
+    Report_Metrics(total_rows, total_unique, total_counted, total_value, mode)
+    if top_k:
+        PRINT.printM(STR__metrics_top_k.format(A = len(keys),
+                B = counts.max_error))
+    
+    # Wrap up
+    return 0
+
+
+
+def Tally_Batches(batches, col_no, separator, mode, counts):
+    """
+    Tally the values in the specified column of every row in [batches], adding
+    them to [counts]. Used by Tally_Column(), and by Tally_Chunk() in parallel
+    mode.
+    
+    Return the number of rows, the number of values counted and the total value
+    of all counts, or None if [mode] is invalid.
+    
+    @batches
+            (iterable<list<list<str>>>)
+            The rows of data, in batches, as returned by the Table Reader's
+            iter_batches().
+    @counts
+            (dict<str:int/float>)
+            The counts so far. Any dict-like object can be used, such as an
+            OrderedDict or a Space_Saving sketch.
+    
+    See Tally_Column() for details on the other parameters.
+    
+    Tally_Batches(iterable<list<list<str>>>, int, str, int, dict<str:int/float>)
+            -> [int, int, int]
+    """
+    if mode in [MODE.COUNT, MODE.PRESENT] and type(counts) == dict:
+        return Tally_Batches__BULK(batches, col_no, separator, mode, counts)
+    total_rows = 0
+    total_counted = 0
+    total_value = 0
+    for batch in batches:
+        total_rows += len(batch)
+        for columns in batch:
+            # Get values
+            if separator:
+                values_raw = columns[col_no]
+                values = values_raw.split(separator)
+            else:
+                values = [columns[col_no]]
             # Mode-dependant
-            if mode == MODE.FRACTION: # Fraction
-                total_value += 1
-                for value in mini_count:
+            if mode == MODE.SINGLE: # Single
+                if len(values) == 1:
                     total_counted += 1
-                    fraction_value = mini_count[value]/mini_total
+                    total_value += 1
+                    value = values[0]
                     if value not in counts:
-                        counts[value] = fraction_value
-                        original_order.append(value)
+                        counts[value] = 1
                     else:
-                        counts[value] += fraction_value
-            elif mode == MODE.MAJORITY: # Majority
-                for value in mini_count:
-                    temp_count = mini_count[value]
-                    if temp_count*2 > mini_total:
-                        total_counted += 1
-                        total_value += 1
-                        if value not in counts:
-                            counts[value] = 1
-                            original_order.append(value)
-                        else:
-                            counts[value] += 1
-            elif mode == MODE.PRESENT: # Present
-                for value in mini_count:
+                        counts[value] += 1
+            elif mode == MODE.COUNT: # Count
+                for value in values:
                     total_counted += 1
                     total_value += 1
                     if value not in counts:
                         counts[value] = 1
-                        original_order.append(value)
                     else:
                         counts[value] += 1
-            elif mode == MODE.TIED: # Tied
-                highest = 0
-                for value in mini_count:
-                    if mini_count[value] > highest:
-                        highest = mini_count[value]
-                for value in mini_count:
-                    if mini_count[value] == highest:
+            else: # Fraction/Present/Tied/Unique
+                # Do mini count
+                mini_count = {}
+                mini_total = 0
+                for value in values:
+                    mini_total += 1
+                    if value not in mini_count:
+                        mini_count[value] = 1.0
+                    else:
+                        mini_count[value] += 1
+                # Mode-dependant
+                if mode == MODE.FRACTION: # Fraction
+                    total_value += 1
+                    for value in mini_count:
                         total_counted += 1
-                        total_value += 1
+                        fraction_value = mini_count[value]/mini_total
                         if value not in counts:
-                            counts[value] = 1
-                            original_order.append(value)
+                            counts[value] = fraction_value
                         else:
-                            counts[value] += 1
-            elif mode == MODE.UNIQUE: # Unique
-                if len(mini_count) == 1:
+                            counts[value] += fraction_value
+                elif mode == MODE.MAJORITY: # Majority
+                    for value in mini_count:
+                        temp_count = mini_count[value]
+                        if temp_count*2 > mini_total:
+                            total_counted += 1
+                            total_value += 1
+                            if value not in counts:
+                                counts[value] = 1
+                            else:
+                                counts[value] += 1
+                elif mode == MODE.PRESENT: # Present
                     for value in mini_count:
                         total_counted += 1
                         total_value += 1
                         if value not in counts:
                             counts[value] = 1
-                            original_order.append(value)
                         else:
                             counts[value] += 1
+                elif mode == MODE.TIED: # Tied
+                    highest = 0
+                    for value in mini_count:
+                        if mini_count[value] > highest:
+                            highest = mini_count[value]
+                    for value in mini_count:
+                        if mini_count[value] == highest:
+                            total_counted += 1
+                            total_value += 1
+                            if value not in counts:
+                                counts[value] = 1
+                            else:
+                                counts[value] += 1
+                elif mode == MODE.UNIQUE: # Unique
+                    if len(mini_count) == 1:
+                        for value in mini_count:
+                            total_counted += 1
+                            total_value += 1
+                            if value not in counts:
+                                counts[value] = 1
+                            else:
+                                counts[value] += 1
+                else:
+                    return None
+    return [total_rows, total_counted, total_value]
+
+def Tally_Batches__BULK(batches, col_no, separator, mode, counts):
+    """
+    Tally the values in the specified column of every row in [batches], adding
+    them to [counts], for the Count and Present modes. Gives the same results as
+    Tally_Batches().
+    
+    Rather than splitting and counting the values of each row separately, the
+    values of an entire batch are gathered into a single list first, then
+    counted in one tight loop. This avoids most of the per-row and per-value
+    overhead. Only suitable for a plain dict, as it does not preserve the order
+    in which the values first appear.
+    
+    Return the number of rows, the number of values counted and the total value
+    of all counts.
+    
+    See Tally_Batches() for details on the parameters.
+    
+    Tally_Batches__BULK(iterable<list<list<str>>>, int, str, int,
+            dict<str:int>) -> [int, int, int]
+    """
+    total_rows = 0
+    total_counted = 0
+    for batch in batches:
+        total_rows += len(batch)
+        # Get values
+        if mode == MODE.PRESENT: # Present
+            values = []
+            if separator:
+                for columns in batch:
+                    values.extend(set(columns[col_no].split(separator)))
+            else:
+                values = [columns[col_no] for columns in batch]
+        elif separator: # Count
+            values = [columns[col_no] for columns in batch]
+            values = separator.join(values).split(separator)
+        else: # Count
+            values = [columns[col_no] for columns in batch]
+        # Count
+        total_counted += len(values)
+        for value in values:
+            if value not in counts:
+                counts[value] = 1
             else:
-                f.Close()
-                o.close()
-                PRINT.printE(STR__unexpected_failure)
-                return 2
+                counts[value] += 1
+    return [total_rows, total_counted, total_counted]
+
+def Tally_Chunks_Parallel(path_in, delim, col_no, separator, mode, order,
+            workers, counts):
+    """
+    Split the rows of the input file into chunks, and tally the chunks in
+    parallel using a pool of [workers] processes. The counts of each chunk are
+    added to [counts], in order, so the values are kept in the order they first
+    appear in, for the original order.
     
-    # Write
-    if order == ORDER.ORIGINAL:
-        keys = original_order
-    else:
-        keys = Get_Keys_Order(counts, order)
-    for k in keys:
-        sb = k + "\t" + str(counts[k]) + "\n"
-        o.write(sb)
+    If a chunk ends early because it contains an empty line, which the Table
+    Reader treats as the end of the file, the chunks after it are discarded, the
+    same as when the file is tallied in a single process. This includes any
+    errors raised while tallying them, as those rows would never have been
+    read. An error raised by an earlier chunk is raised again.
     
-    # Finish
+    Return the number of rows, the number of values counted and the total value
+    of all counts, or None if [mode] is invalid.
+    
+    See Tally_Column() for details on the parameters.
+    
+    Tally_Chunks_Parallel(str, str, int, str, int, int, int,
+            dict<str:int/float>) -> [int, int, int]
+    """
+    total_rows = 0
+    total_counted = 0
+    total_value = 0
+    f = Table_Reader()
+    f.Set_New_Path(path_in)
+    f.Set_Delimiter(delim)
+    f.Set_Mmap(True)
+    f.Open()
+    chunks = f.Get_Chunks(workers)
     f.Close()
-    o.close()
-    PRINT.printP(STR__tally_complete)
+    jobs = [[path_in, delim, start, end, col_no, separator, mode, order]
+            for start, end in chunks]
+    pool = multiprocessing.Pool(workers)
+    try:
+        results = pool.imap(Tally_Chunk, jobs)
+        for result in results:
+            if isinstance(result, Exception): raise result
+            if result == None: return None
+            chunk_counts, chunk_totals, chunk_end = result
+            for value, count in chunk_counts.items():
+                if value not in counts:
+                    counts[value] = count
+                else:
+                    counts[value] += count
+            total_rows += chunk_totals[0]
+            total_counted += chunk_totals[1]
+            total_value += chunk_totals[2]
+            if chunk_end: break # Stopped at an empty line
+    finally:
+        pool.terminate()
+        pool.join()
+    return [total_rows, total_counted, total_value]
+
+def Tally_Chunk(job):
+    """
+    Tally the rows of data which lie between two byte offsets of the input file.
+    Used by Tally_Chunks_Parallel(), in a separate process.
     
-    # Reporting
-    total_unique = len(counts)
-    Report_Metrics(total_rows, total_unique, total_counted, total_value, mode)
+    [job] is a list containing the input filepath, the input delimiter, the
+    start and end offsets of the chunk, the column number, the separator, the
+    mode and the order.
     
-    # Wrap up
-    return 0
-
+    Return the counts of the chunk, the totals returned by Tally_Batches(), and
+    whether or not an empty line was found before the end of the chunk. Return
+    None if the mode is invalid.
+    Return the exception instead, if one is raised. Whether or not it matters
+    depends on whether an earlier chunk ended early, which only
+    Tally_Chunks_Parallel() knows.
+    
+    Tally_Chunk(list<*>) -> [dict<str:int/float>, list<int>, bool]
+    Tally_Chunk(list<*>) -> Exception
+    """
+    try:
+        return Tally_Chunk__RAISE(job)
+    except Exception as e:
+        return e
 
+def Tally_Chunk__RAISE(job):
+    """
+    Subfunction of Tally_Chunk() which does the actual work, and raises any
+    errors.
+    
+    Tally_Chunk__RAISE(list<*>) -> [dict<str:int/float>, list<int>, bool]
+    """
+    path_in, delim, start, end, col_no, separator, mode, order = job
+    if order == ORDER.ORIGINAL: counts = collections.OrderedDict()
+    else: counts = {}
+    f = Table_Reader()
+    f.Set_New_Path(path_in)
+    f.Set_Delimiter(delim)
+    f.Set_Max_Column(col_no + 1)
+    f.Set_Mmap(True)
+    f.Open()
+    f.Seek(start, end)
+    totals = Tally_Batches(f.iter_batches(), col_no, separator, mode, counts)
+    chunk_end = bool(f.current_raw) # Stopped at an empty line, not the end
+    f.Close()
+    if totals == None: return None
+    return [counts, totals, chunk_end]
 
 def Get_Placeholders(path_placeholder, delim_placeholder, col_no_placeholder):
     """
@@ -553,12 +826,15 @@ def Get_Placeholders(path_placeholder, delim_placeholder, col_no_placeholder):
             The index number of the column in the placeholder file to use as a
             placeholder.
     
+    The values are kept in the order they appear in, for the original order.
+    
     Get_Keys_Order(str, str, int) -> dict<str:int>
     """
-    result = {}
+    result = collections.OrderedDict()
     f = Table_Reader()
     f.Set_New_Path(path_placeholder)
     f.Set_Delimiter(delim_placeholder)
+    f.Set_Mmap(True)
     f.Open()
     while not f.EOF:
         f.Read()
@@ -741,13 +1017,15 @@ def Parse_Command_Line_Input__Tally_Column(raw_command_line_input):
     path_placeholder = None
     delim_placeholder = None
     col_no_placeholder = 1
+    top_k = DEFAULT__top_k
+    workers = DEFAULT__workers
     
     # Validate optional inputs (except output path)
     while inputs:
         arg = inputs.pop(0)
         flag = 0
         try: # Following arguments
-            if arg in ["-o", "-s", "-m", "-r"]:
+            if arg in ["-o", "-s", "-m", "-r", "-t", "-w"]:
                 arg2 = inputs.pop(0)
             elif arg in ["-p"]:
                 arg2 = inputs.pop(0)
@@ -778,6 +1056,18 @@ def Parse_Command_Line_Input__Tally_Column(raw_command_line_input):
                 PRINT.printE(STR__invalid_order.format(s = arg))
                 PRINT.printE(STR__use_help)
                 return 1
+        elif arg == "-t":
+            top_k = Validate_Int_Positive(arg2)
+            if top_k == -1:
+                PRINT.printE(STR__invalid_top_k.format(s = arg2))
+                PRINT.printE(STR__use_help)
+                return 1
+        elif arg == "-w":
+            workers = Validate_Int_Positive(arg2)
+            if workers == -1:
+                PRINT.printE(STR__invalid_workers.format(s = arg2))
+                PRINT.printE(STR__use_help)
+                return 1
         else: # arg == "-p"
             path_placeholder = arg2
             valid = Validate_Read_Path(path_placeholder)
@@ -798,6 +1088,20 @@ def Parse_Command_Line_Input__Tally_Column(raw_command_line_input):
                 return 1
             col_no_placeholder = col_no_placeholder - 1
     
+    # Validate top-K
+    if top_k and path_placeholder:
+        PRINT.printE(STR__top_k_placeholder)
+        PRINT.printE(STR__use_help)
+        return 1
+    if top_k and order == ORDER.ORIGINAL:
+        PRINT.printE(STR__top_k_original)
+        PRINT.printE(STR__use_help)
+        return 1
+    if top_k and workers > 1:
+        PRINT.printE(STR__top_k_workers)
+        PRINT.printE(STR__use_help)
+        return 1
+    
     # Validate output paths
     valid_out = Validate_Write_Path(path_out)
     if valid_out == 2: return 0
@@ -810,7 +1114,8 @@ def Parse_Command_Line_Input__Tally_Column(raw_command_line_input):
     
     # Run program
     exit_state = Tally_Column(path_in, delim, col_no, path_out, separator, mode,
-            order, path_placeholder, delim_placeholder, col_no_placeholder)
+            order, path_placeholder, delim_placeholder, col_no_placeholder,
+            top_k, workers)
     
     # Exit
     if exit_state == 0: return 0
@@ -0,0 +1,1001 @@
+"""
+BENCHMARKS
+(version 1.6.3)
+by Angelo Chan
+
+This is a library of benchmarks for the performance critical parts of the Table
+Tools. Each benchmark runs the current implementation against the legacy
+implementation it replaced, checks that both produce identical results, and
+reports the time taken by each.
+
+USAGE:
+
+    python27 _Benchmarks.py [<benchmark_name>]...
+
+If no benchmark names are given, all benchmarks are run.
+"""
+
+
+
+# Configurations ###############################################################
+
+PRINT_ERRORS = True
+PRINT_PROGRESS = True
+PRINT_METRICS = True
+
+
+
+# Minor Configurations #########################################################
+
+SEED = 12345 # Seed for generating reproducible test data
+
+
+
+# Defaults #####################################################################
+
+DEFAULT__rows = 100000
+DEFAULT__repeats = 3
+DEFAULT__duplicates = 50 # Rows per key, for the join benchmarks
+DEFAULT__tally_values = 1000 # Distinct values, for the tally benchmarks
+DEFAULT__batch_size = 1000 # Rows per batch, for the tally benchmarks
+DEFAULT__wide_columns = 200 # Columns, for the projection benchmarks
+DEFAULT__wide_rows = 10000 # Rows generated, for the projection benchmarks
+DEFAULT__directory = None # Where output files are written, None for temp dir
+
+
+
+# Imported Modules #############################################################
+
+import sys
+import os
+import random
+import time
+import tempfile
+import zlib
+
+import _Controlled_Print as PRINT
+
+from Table_File_Reader import *
+
+import _Buffered_Writer as WRITER
+
+import Join
+from Join import JOIN
+
+import Multitool_For_Tables
+from Multitool_For_Tables import CRITERIA, INC_EXC
+
+import Tally_Column
+from Tally_Column import MODE
+
+import Table_to_Table
+
+
+
+# Strings ######################################################################
+
+STR__benchmark_begin = "\nRunning benchmark: {s}"
+
+STR__benchmark_mismatch = """
+ERROR: Results of the current and legacy implementations do not match:
+    {s}"""
+
+STR__benchmark_timing = """\
+    {s}
+        Legacy:     {L:.4f} s
+        Current:    {C:.4f} s
+        Speedup:    {X:.2f} x"""
+
+STR__benchmark_unknown = "\nERROR: Unknown benchmark: {s}"
+
+STR__benchmark_scaling = """\
+    {s}
+        Per row:    {A:.3f} us ({a} rows)
+        Per row:    {B:.3f} us ({b} rows)"""
+
+
+
+# Lists ########################################################################
+
+LIST__chars = list("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+        "0123456789     ._-;")
+
+
+
+# Apply Globals ################################################################
+
+PRINT.PRINT_ERRORS = PRINT_ERRORS
+PRINT.PRINT_PROGRESS = PRINT_PROGRESS
+PRINT.PRINT_METRICS = PRINT_METRICS
+
+
+
+# Legacy Implementations #######################################################
+
+def Legacy__process_raw(raw_str, delim, enclosers, keep_enclosers):
+    """
+    The character-by-character version of Table_Reader._process_raw, from
+    Table_File_Reader 2.1.
+    """
+    flag = False
+    active_encloser = ""
+    sb = ""
+    results = []
+    for c in raw_str:
+        if flag:
+            if c == active_encloser:
+                if keep_enclosers: sb += c
+                flag = False
+            else:
+                sb += c
+        else:
+            if c in enclosers:
+                if keep_enclosers: sb += c
+                flag = True
+                active_encloser = c
+            elif c == delim:
+                results.append(sb)
+                sb = ""
+            else:
+                sb += c
+    if sb and sb[-1] in LIST__newline: sb = sb[:-1]
+    results.append(sb)
+    return results
+
+def Legacy__process_raw__SIMPLE(raw_str, delim):
+    """
+    The character-by-character version of Table_Reader._process_raw__SIMPLE,
+    from Table_File_Reader 2.1.
+    """
+    sb = ""
+    results = []
+    for c in raw_str:
+        if c == delim:
+            results.append(sb)
+            sb = ""
+        else:
+            sb += c
+    if sb and sb[-1] in LIST__newline: sb = sb[:-1]
+    results.append(sb)
+    return results
+
+def Legacy__Write_Table__DICTs(dict_l, keys_l, blank_l, dict_r, keys_r,
+            blank_r, path_out, delim_out, join, header_values):
+    """
+    The version of Join.Write_Table__DICTs which uses registrars initialized
+    over every key, from Join 3.0.2.
+    """
+    # Setup
+    o = open(path_out, "w")
+    # Metrics
+    lines_o = 0
+    lines_l_o = 0
+    lines_r_o = 0
+    # Headers
+    if header_values:
+        header_str = delim_out.join(header_values) + "\n"
+        o.write(header_str)
+    # Join type
+    if join == JOIN.INNER:
+        all_keys = []
+        for key in keys_l:
+            if key in dict_r: all_keys.append(key)
+    elif join == JOIN.LEFT:
+        all_keys = keys_l
+    elif join == JOIN.RIGHT:
+        all_keys = keys_r
+    elif join == JOIN.OUTER:
+        all_keys = keys_l
+        for k in keys_r:
+            if k not in dict_l:
+                all_keys.append(k)
+    else: # XOR
+        all_keys = []
+        for key in keys_l:
+            if key not in dict_r: all_keys.append(key)
+        for key in keys_r:
+            if key not in dict_l: all_keys.append(key)
+    lines_o = len(all_keys)
+    # Duplicate handler
+    registrar_l = {}
+    registrar_r = {}
+    for key in keys_l: registrar_l[key] = 0
+    for key in keys_r: registrar_r[key] = 0
+    # Iterate 
+    for key in all_keys:
+        key_list = []
+        for k in key:
+            key_list.append(str(k))
+        key_str = delim_out.join(key_list)
+        o.write(key_str)
+        if join == JOIN.INNER:
+            lines_l_o += 1
+            lines_r_o += 1
+            val_l = dict_l[key][0]
+            str_l = delim_out.join(val_l)
+            if str_l: o.write(delim_out + str_l)
+            val_r = dict_r[key][0]
+            str_r = delim_out.join(val_r)
+            if str_r: o.write(delim_out + str_r)
+        elif join == JOIN.LEFT:
+            #
+            index_l = registrar_l[key]
+            registrar_l[key] += 1
+            #
+            lines_l_o += 1
+            val_l = dict_l[key][index_l]
+            str_l = delim_out.join(val_l)
+            if str_l: o.write(delim_out + str_l)
+            if key in dict_r:
+                lines_r_o += 1
+                val_r = dict_r[key][0]
+                str_r = delim_out.join(val_r)
+                if str_r: o.write(delim_out + str_r)
+            else:
+                o.write(blank_r)
+        elif join == JOIN.RIGHT:
+            #
+            index_r = registrar_r[key]
+            registrar_r[key] += 1
+            #
+            lines_r_o += 1
+            if key in dict_l:
+                lines_l_o += 1
+                val_l = dict_l[key][0]
+                str_l = delim_out.join(val_l)
+                if str_l: o.write(delim_out + str_l)
+            else:
+                o.write(blank_l)
+            val_r = dict_r[key][index_r]
+            str_r = delim_out.join(val_r)
+            if str_r: o.write(delim_out + str_r)
+        elif join == JOIN.OUTER: # Outer
+            if key in dict_l:
+                lines_l_o += 1
+                val_l = dict_l[key][0]
+                str_l = delim_out.join(val_l)
+                if str_l: o.write(delim_out + str_l)
+            else:
+                o.write(blank_l)
+            if key in dict_r:
+                lines_r_o += 1
+                val_r = dict_r[key][0]
+                str_r = delim_out.join(val_r)
+                if str_r: o.write(delim_out + str_r)
+            else:
+                o.write(blank_r)
+        else: # XOR
+            if key in dict_l:
+                #
+                index_l = registrar_l[key]
+                registrar_l[key] += 1
+                #
+                lines_l_o += 1
+                val_l = dict_l[key][index_l]
+                str_l = delim_out.join(val_l)
+                if str_l: o.write(delim_out + str_l)
+            else:
+                o.write(blank_l)
+            if key in dict_r:
+                #
+                index_r = registrar_r[key]
+                registrar_r[key] += 1
+                #
+                lines_r_o += 1
+                val_r = dict_r[key][index_r]
+                str_r = delim_out.join(val_r)
+                if str_r: o.write(delim_out + str_r)
+            else:
+                o.write(blank_r)
+        o.write("\n")
+    #
+    o.close()
+    return [lines_o, lines_l_o, lines_r_o]
+
+
+def Legacy__Filter_Line(data, filters, filter_metrics=None):
+    """
+    The version of Multitool_For_Tables.Filter_Line which checks every filter
+    through a chain of if/elif statements, from Multitool_For_Tables 1.2.
+    """
+    # Setup
+    all_inc = True
+    any_exc = False
+    index = 0
+    # Main loop
+    for filt in filters:
+        inc_exc, target, criteria, val_ref = filt
+        # Get values
+        val_1 = data[target]
+        if type(val_ref) == int:
+            val_2 = data[val_ref]
+        elif type(val_ref) == str:
+            val_2 = val_ref
+        else: # Shouldn't happen
+            return None
+        # Compare
+        flag = False
+        if criteria == CRITERIA.STR_EQ:
+            if val_1 == val_2:
+                flag = True
+        elif criteria == CRITERIA.STR_NOT_EQ:
+            if val_1 != val_2:
+                flag = True
+        elif criteria == CRITERIA.CONTAINS:
+            if val_2 in val_1:
+                flag = True
+        elif criteria == CRITERIA.NOT_CONTAIN:
+            if val_2 not in val_1:
+                flag = True
+        elif criteria == CRITERIA.IN:
+            if val_1 in val_2:
+                flag = True
+        elif criteria == CRITERIA.NOT_IN:
+            if val_1 not in val_2:
+                flag = True
+        elif criteria == CRITERIA.GREATER_THAN:
+            if val_1 > val_2:
+                flag = True
+        elif criteria == CRITERIA.GREAQUALS:
+            if val_1 >= val_2:
+                flag = True
+        elif criteria == CRITERIA.LESS_THAN:
+            if val_1 < val_2:
+                flag = True
+        elif criteria == CRITERIA.LEQUALS:
+            if val_1 <= val_2:
+                flag = True
+        elif criteria == CRITERIA.INT_EQ:
+            try:
+                val_1 = int(val_1)
+                val_2 = int(val_2)
+                if val_1 == val_2:
+                    flag = True
+            except:
+                pass
+        elif criteria == CRITERIA.INT_NOT_EQ:
+            try:
+                val_1 = int(val_1)
+                val_2 = int(val_2)
+                if val_1 != val_2:
+                    flag = True
+            except:
+                pass
+        elif criteria == CRITERIA.FLO_EQ:
+            try:
+                val_1 = float(val_1)
+                val_2 = float(val_2)
+                if val_1 == val_2:
+                    flag = True
+            except:
+                pass
+        elif criteria == CRITERIA.FLO_NOT_EQ:
+            try:
+                val_1 = float(val_1)
+                val_2 = float(val_2)
+                if val_1 != val_2:
+                    flag = True
+            except:
+                pass
+        else: # Shouldn't happen
+            return None
+        # Update flags
+        if inc_exc == INC_EXC.INCLUDE:
+            if not flag:
+                all_inc = False
+        elif inc_exc == INC_EXC.EXCLUDE:
+            if flag:
+                any_exc = True
+        else:
+            return None
+        # Update metrics
+        if filter_metrics:
+            if flag:
+                filter_metrics[index] += 1
+            index += 1
+    # Return
+    if all_inc and not any_exc:
+        return True
+    return False
+
+def Legacy__Create_Output(data, columns, delim):
+    """
+    The version of Table_to_Table.Create_Output which adds the values to a
+    string one at a time, from Table_to_Table 4.3.
+    """
+    first = columns[0]
+    others = columns[1:]
+
+    if first == 0: sb = ""
+    else: sb = data[first - 1]
+    
+    for i in others:
+        if i == 0:
+            sb += (delim + "")
+        else:
+            sb += (delim + data[i - 1])
+
+    sb += "\n"
+
+    return sb
+
+def Legacy__Tally_Batches(batches, col_no, separator, mode, counts):
+    """
+    The per-row version of Tally_Column.Tally_Batches, from Tally_Column 2.3,
+    for the Count and Present modes only.
+    """
+    total_rows = 0
+    total_counted = 0
+    total_value = 0
+    for batch in batches:
+        total_rows += len(batch)
+        for columns in batch:
+            # Get values
+            if separator:
+                values_raw = columns[col_no]
+                values = values_raw.split(separator)
+            else:
+                values = [columns[col_no]]
+            # Mode-dependant
+            if mode == MODE.COUNT: # Count
+                for value in values:
+                    total_counted += 1
+                    total_value += 1
+                    if value not in counts:
+                        counts[value] = 1
+                    else:
+                        counts[value] += 1
+            else: # Present
+                # Do mini count
+                mini_count = {}
+                mini_total = 0
+                for value in values:
+                    mini_total += 1
+                    if value not in mini_count:
+                        mini_count[value] = 1.0
+                    else:
+                        mini_count[value] += 1
+                for value in mini_count:
+                    total_counted += 1
+                    total_value += 1
+                    if value not in counts:
+                        counts[value] = 1
+                    else:
+                        counts[value] += 1
+    return [total_rows, total_counted, total_value]
+
+
+
+# Benchmarks ###################################################################
+
+def Benchmark__Table_Reader_Parsing(rows=DEFAULT__rows,
+            repeats=DEFAULT__repeats):
+    """
+    Compare the line parsing functions of the Table_Reader against their legacy
+    implementations, both with and without enclosers.
+    
+    @rows
+            (int)
+            The number of lines of test data to generate.
+    @repeats
+            (int)
+            The number of times each implementation is run. The fastest run is
+            reported.
+    
+    Return a value of 0 if the results of both implementations match.
+    Return a value of 1 if they do not.
+    
+    Benchmark__Table_Reader_Parsing(int, int) -> int
+    """
+    f = Table_Reader()
+    # Without enclosers
+    lines = Generate_Test_Lines(rows, 10, "\t", [])
+    legacy = lambda: [Legacy__process_raw__SIMPLE(s, "\t") for s in lines]
+    current = lambda: [f._process_raw__SIMPLE(s, "\t") for s in lines]
+    if Compare(legacy, current, repeats, "_process_raw__SIMPLE"): return 1
+    # With enclosers
+    enclosers = ["\"", "'"]
+    lines = Generate_Test_Lines(rows, 10, ",", enclosers)
+    for keep in [True, False]:
+        legacy = lambda: [Legacy__process_raw(s, ",", enclosers, keep)
+                for s in lines]
+        current = lambda: [f._process_raw(s, ",", enclosers, keep)
+                for s in lines]
+        name = "_process_raw (keep_enclosers={k})".format(k=keep)
+        if Compare(legacy, current, repeats, name): return 1
+    return 0
+
+def Benchmark__Join_Duplicates(rows=DEFAULT__rows, repeats=DEFAULT__repeats,
+            duplicates=DEFAULT__duplicates):
+    """
+    Compare the output writing of the DICT method of Join against its legacy
+    implementation, on tables where every key has many rows. Each join type is
+    run on two table sizes, to show how the time taken per row scales.
+    
+    @rows
+            (int)
+            The number of rows in each of the larger pair of test tables.
+    @repeats
+            (int)
+            The number of times each implementation is run. The fastest run is
+            reported.
+    @duplicates
+            (int)
+            The number of rows with each key.
+    
+    Return a value of 0 if the results of both implementations match.
+    Return a value of 1 if they do not.
+    
+    Benchmark__Join_Duplicates(int, int, int) -> int
+    """
+    sizes = [rows/4, rows]
+    all_tables = [Generate_Test_Join_Tables(size, duplicates) for size in sizes]
+    path_out = tempfile.mktemp()
+    try:
+        for join in [JOIN.LEFT, JOIN.OUTER, JOIN.XOR]:
+            per_row = []
+            for tables in all_tables:
+                def legacy():
+                    dict_l, keys_l, dict_r, keys_r = Copy_Test_Join_Tables(
+                            tables)
+                    Legacy__Write_Table__DICTs(dict_l, keys_l, "\t", dict_r,
+                            keys_r, "\t", path_out, "\t", join, [])
+                    return open(path_out).read()
+                def current():
+                    dict_l, keys_l, dict_r, keys_r = Copy_Test_Join_Tables(
+                            tables)
+                    Join.Write_Table__DICTs(dict_l, keys_l, "\t", dict_r,
+                            keys_r, "\t", path_out, "\t", join, [])
+                    return open(path_out).read()
+                name = "Write_Table__DICTs (join={j}, rows={n})".format(j=join,
+                        n=len(tables[1]))
+                if Compare(legacy, current, repeats, name): return 1
+                taken = Time_Function(current, repeats)[0]
+                per_row.append(1000000*taken/len(tables[1]))
+            name = "Write_Table__DICTs (join={j}) scaling".format(j=join)
+            PRINT.printM(STR__benchmark_scaling.format(s=name, A=per_row[0],
+                    a=sizes[0], B=per_row[1], b=sizes[1]))
+    finally:
+        if os.path.exists(path_out): os.remove(path_out)
+    return 0
+
+def Benchmark__Multitool_Filters(rows=DEFAULT__rows, repeats=DEFAULT__repeats):
+    """
+    Compare the compiled filters of Multitool_For_Tables against
+    Legacy__Filter_Line(), using a mix of string and numeric criteria, with and
+    without the tracking of filter metrics.
+    
+    @rows
+            (int)
+            The number of rows of test data to generate.
+    @repeats
+            (int)
+            The number of times each implementation is run. The fastest run is
+            reported.
+    
+    Return a value of 0 if the results of both implementations match.
+    Return a value of 1 if they do not.
+    
+    Benchmark__Multitool_Filters(int, int) -> int
+    """
+    data = Generate_Test_Rows(rows)
+    filters = [
+        [INC_EXC.INCLUDE, 0, CRITERIA.INT_NOT_EQ, "500"],
+        [INC_EXC.EXCLUDE, 1, CRITERIA.STR_EQ, "beta"],
+        [INC_EXC.INCLUDE, 2, CRITERIA.FLO_NOT_EQ, "0.5"],
+        [INC_EXC.EXCLUDE, 3, CRITERIA.CONTAINS, "x"],
+        [INC_EXC.INCLUDE, 0, CRITERIA.LESS_THAN, 4],
+        [INC_EXC.INCLUDE, 1, CRITERIA.IN, "alphabetagammadelta"]]
+    filter_line = Legacy__Filter_Line
+    compile_filters = Multitool_For_Tables.Compile_Filters
+    # With metrics
+    def legacy():
+        metrics = len(filters)*[0]
+        return [[filter_line(row, filters, metrics) for row in data], metrics]
+    def current():
+        metrics = len(filters)*[0]
+        compiled = compile_filters(filters)
+        return [[compiled(row, metrics) for row in data], metrics]
+    if Compare(legacy, current, repeats, "Filter_Line (metrics)"): return 1
+    # Without metrics
+    legacy = lambda: [filter_line(row, filters) for row in data]
+    def current():
+        compiled = compile_filters(filters, False)
+        return [compiled(row) for row in data]
+    if Compare(legacy, current, repeats, "Filter_Line (no metrics)"): return 1
+    return 0
+
+
+def Benchmark__Tally_Count(rows=DEFAULT__rows, repeats=DEFAULT__repeats,
+            values=DEFAULT__tally_values):
+    """
+    Compare the bulk counting of Tally_Column against its legacy per-row
+    implementation, on a multi-valued column with a ";" separator, in the Count
+    and Present modes.
+    
+    Only the first DEFAULT__rows rows are generated. Larger values of [rows],
+    such as 50000000, reuse those rows over and over, so that the memory used
+    stays small.
+    
+    @rows
+            (int)
+            The number of rows of test data.
+    @repeats
+            (int)
+            The number of times each implementation is run. The fastest run is
+            reported.
+    @values
+            (int)
+            The number of distinct values in the column.
+    
+    Return a value of 0 if the results of both implementations match.
+    Return a value of 1 if they do not.
+    
+    Benchmark__Tally_Count(int, int, int) -> int
+    """
+    batches = Generate_Test_Tally_Batches(rows, values)
+    for mode in [MODE.COUNT, MODE.PRESENT]:
+        def legacy():
+            counts = {}
+            totals = Legacy__Tally_Batches(batches, 1, ";", mode, counts)
+            return [totals, counts]
+        def current():
+            counts = {}
+            totals = Tally_Column.Tally_Batches(batches, 1, ";", mode, counts)
+            return [totals, counts]
+        name = "Tally_Batches (mode={m}, rows={n})".format(m=mode, n=rows)
+        if Compare(legacy, current, repeats, name): return 1
+    return 0
+
+
+def Benchmark__Buffered_Writer(rows=DEFAULT__rows, repeats=DEFAULT__repeats,
+            directory=DEFAULT__directory):
+    """
+    Compare writing an output file one row at a time through a file opened by
+    _Buffered_Writer against a file opened with the default buffer.
+    
+    The benefit depends heavily on the filesystem being written to. To compare
+    different filesystems, such as a local SSD and an NFS mount, run this
+    benchmark with a [directory] on each of them.
+    
+    @rows
+            (int)
+            The number of rows of test data to generate.
+    @repeats
+            (int)
+            The number of times each implementation is run. The fastest run is
+            reported.
+    @directory
+            (str - dirpath)
+            The directory in which the output file is written. The system's
+            temporary directory is used if no directory is specified.
+    
+    Return a value of 0 if the results of both implementations match.
+    Return a value of 1 if they do not.
+    
+    Benchmark__Buffered_Writer(int, int, str) -> int
+    """
+    lines = Generate_Test_Lines(rows, 10, "\t", [])
+    lines = [line.rstrip("\r\n") + "\n" for line in lines]
+    path_out = tempfile.mktemp(dir=directory)
+    try:
+        def legacy():
+            o = open(path_out, "w")
+            for line in lines: o.write(line)
+            o.close()
+            return open(path_out).read()
+        def current():
+            o = WRITER.Open_Buffered(path_out)
+            for line in lines: o.write(line)
+            o.close()
+            return open(path_out).read()
+        name = "Open_Buffered (directory={d})".format(d=os.path.dirname(
+                path_out))
+        if Compare(legacy, current, repeats, name): return 1
+    finally:
+        if os.path.exists(path_out): os.remove(path_out)
+    return 0
+
+
+def Benchmark__Table_to_Table_Output(rows=DEFAULT__rows,
+            repeats=DEFAULT__repeats, columns=DEFAULT__wide_columns):
+    """
+    Compare the compiled output function of Table_to_Table against
+    Legacy__Create_Output(), on wide rows where only a handful of columns are
+    kept, with and without an empty column.
+    
+    Only the first DEFAULT__wide_rows rows are generated. Larger values of
+    [rows], such as 10000000, reuse those rows over and over, so that the memory
+    used stays small.
+    
+    @rows
+            (int)
+            The number of rows of test data.
+    @repeats
+            (int)
+            The number of times each implementation is run. The fastest run is
+            reported.
+    @columns
+            (int)
+            The number of columns in each row.
+    
+    Return a value of 0 if the results of both implementations match.
+    Return a value of 1 if they do not.
+    
+    Benchmark__Table_to_Table_Output(int, int, int) -> int
+    """
+    data = Generate_Test_Wide_Rows(rows, columns)
+    create_output = Legacy__Create_Output
+    compile_output = Table_to_Table.Compile_Output
+    kept = [5, 17, 3, columns/2, columns]
+    for columns_out in [kept, kept[:2] + [0] + kept[2:]]:
+        legacy = lambda: [create_output(row, columns_out, "\t")
+                for row in data]
+        def current():
+            compiled = compile_output(columns_out, "\t")
+            return [compiled(row) for row in data]
+        name = "Create_Output (columns={c})".format(c=columns_out)
+        if Compare(legacy, current, repeats, name): return 1
+    return 0
+
+
+def Benchmark__Binary_Read(rows=DEFAULT__rows, repeats=DEFAULT__repeats,
+            directory=DEFAULT__directory):
+    """
+    Compare reading a table file with Unix newlines as raw bytes against
+    reading it in universal newline mode, for the row reader of the HASH method
+    of Join.
+    
+    The rows read are checked with a running checksum, rather than kept, so that
+    the memory held by the results of the first implementation does not slow
+    down the second.
+    
+    @rows
+            (int)
+            The number of rows of test data to generate.
+    @repeats
+            (int)
+            The number of times each implementation is run. The fastest run is
+            reported.
+    @directory
+            (str - dirpath)
+            The directory in which the test file is written. The system's
+            temporary directory is used if no directory is specified.
+    
+    Return a value of 0 if the results of both implementations match.
+    Return a value of 1 if they do not.
+    
+    Benchmark__Binary_Read(int, int, str) -> int
+    """
+    lines = Generate_Test_Lines(rows, 10, "\t", [])
+    lines = [line.rstrip("\r\n") + "\n" for line in lines]
+    path_in = tempfile.mktemp(dir=directory)
+    o = WRITER.Open_Buffered(path_in)
+    o.writelines(lines)
+    o.close()
+    try:
+        def read_hash(binary):
+            checksum = 0
+            for item in Join.Read_Table__HASH(path_in, "\t", [0], False,
+                    binary):
+                checksum = zlib.crc32(repr(item), checksum)
+            return checksum
+        if Compare(lambda: read_hash(False), lambda: read_hash(True), repeats,
+                "Join.Read_Table__HASH"): return 1
+    finally:
+        if os.path.exists(path_in): os.remove(path_in)
+    return 0
+
+
+
+# Helper Functions #############################################################
+
+def Generate_Test_Lines(rows, columns, delim, enclosers):
+    """
+    Generate a list of lines of random table data, each ending with a newline
+    character. If [enclosers] are given, some of the fields will be enclosed,
+    and some of the enclosed fields will contain delimiters or other enclosers.
+    Some lines will also contain an encloser which is never closed.
+    
+    Generate_Test_Lines(int, int, str, list<str>) -> list<str>
+    """
+    rng = random.Random(SEED)
+    chars = LIST__chars + [delim]
+    results = []
+    for i in range(rows):
+        fields = []
+        for j in range(columns):
+            length = rng.randint(0, 24)
+            if enclosers and rng.random() < 0.1:
+                e = rng.choice(enclosers)
+                inner = [rng.choice(chars + enclosers) for k in range(length)]
+                inner = "".join(inner).replace(e, "")
+                fields.append(e + inner + e)
+            else:
+                fields.append("".join([rng.choice(LIST__chars)
+                        for k in range(length)]))
+        line = delim.join(fields)
+        if enclosers and rng.random() < 0.01:
+            line += delim + rng.choice(enclosers) + "unclosed" + delim + "x"
+        results.append(line + rng.choice(["\n", "\n", "\n", "\r", ""]))
+    return results
+
+def Generate_Test_Rows(rows):
+    """
+    Generate a list of rows of random table data, already split into values.
+    Each row contains an integer, a word, a decimal number, a random string and
+    another integer, in that order.
+    
+    Generate_Test_Rows(int) -> list<list<str>>
+    """
+    rng = random.Random(SEED)
+    words = ["alpha", "beta", "gamma", "delta", "epsilon"]
+    results = []
+    for i in range(rows):
+        string = "".join([rng.choice(LIST__chars) + rng.choice("xyz")
+                for j in range(rng.randint(0, 6))])
+        results.append([str(rng.randint(0, 1000)), rng.choice(words),
+                "{:.2f}".format(rng.random()), string,
+                str(rng.randint(-1000, 1000))])
+    return results
+
+def Generate_Test_Join_Tables(rows, duplicates):
+    """
+    Generate the data for a left and a right table, in the format returned by
+    Join.Process_Table(), with [rows] rows each. Every key has [duplicates]
+    rows, and half of the keys of each table are not found in the other table.
+    
+    Generate_Test_Join_Tables(int, int) ->
+            [dict<tuple<str>:list<list<str>>>, list<tuple<str>>,
+            dict<tuple<str>:list<list<str>>>, list<tuple<str>>]
+    """
+    rng = random.Random(SEED)
+    results = []
+    for offset in [0, rows/duplicates/2]:
+        dict_ = {}
+        keys = []
+        for i in range(rows):
+            key = (str(offset + rng.randint(0, rows/duplicates - 1)),)
+            values = [str(rng.randint(0, 999)), str(i)]
+            if key in dict_: dict_[key].append(values)
+            else: dict_[key] = [values]
+            keys.append(key)
+        results += [dict_, keys]
+    return results
+
+def Generate_Test_Tally_Batches(rows, values):
+    """
+    Generate batches of rows, in the format returned by the Table Reader's
+    iter_batches(), with [rows] rows in total. Each row contains an integer and
+    between 1 and 5 values separated by ";", chosen from [values] distinct
+    values, some of which are repeated within the row.
+    
+    No more than DEFAULT__rows rows are generated. The same batches are repeated
+    as many times as needed to make up the rest of the rows.
+    
+    Generate_Test_Tally_Batches(int, int) -> list<list<list<str>>>
+    """
+    rng = random.Random(SEED)
+    words = ["v" + str(i) for i in range(values)]
+    size = min(rows, DEFAULT__rows)
+    pool = []
+    for i in range(0, size, DEFAULT__batch_size):
+        batch = []
+        for j in range(min(DEFAULT__batch_size, size - i)):
+            row_values = [rng.choice(words) for k in range(rng.randint(1, 5))]
+            batch.append([str(i + j), ";".join(row_values)])
+        pool.append(batch)
+    results = pool * (rows // size)
+    remainder = rows % size
+    while remainder:
+        batch = pool[len(results) % len(pool)]
+        batch = batch[:remainder]
+        results.append(batch)
+        remainder -= len(batch)
+    return results
+
+def Generate_Test_Wide_Rows(rows, columns):
+    """
+    Generate a list of [rows] rows of random integers, already split into
+    [columns] values.
+    
+    No more than DEFAULT__wide_rows rows are generated. The same rows are
+    repeated as many times as needed to make up the rest of the rows.
+    
+    Generate_Test_Wide_Rows(int, int) -> list<list<str>>
+    """
+    rng = random.Random(SEED)
+    size = min(rows, DEFAULT__wide_rows)
+    pool = [[str(rng.randint(0, 99999)) for j in range(columns)]
+            for i in range(size)]
+    results = pool * (rows // size)
+    results += pool[:rows % size]
+    return results
+
+def Copy_Test_Join_Tables(tables):
+    """
+    Return a copy of the data returned by Generate_Test_Join_Tables(), so that
+    each run of a benchmark starts with the same data.
+    
+    Copy_Test_Join_Tables(list) -> list
+    """
+    dict_l, keys_l, dict_r, keys_r = tables
+    return [dict(dict_l), list(keys_l), dict(dict_r), list(keys_r)]
+
+def Compare(legacy, current, repeats, name):
+    """
+    Run the legacy and current implementations, check that they return
+    identical results, and report the fastest time of each.
+    
+    Return a value of 0 if the results match.
+    Return a value of 1 if they do not.
+    
+    Compare(function, function, int, str) -> int
+    """
+    time_l, results_l = Time_Function(legacy, repeats)
+    time_c, results_c = Time_Function(current, repeats)
+    if results_l != results_c:
+        PRINT.printE(STR__benchmark_mismatch.format(s=name))
+        return 1
+    speedup = time_l / max(time_c, 0.000001)
+    PRINT.printM(STR__benchmark_timing.format(s=name, L=time_l, C=time_c,
+            X=speedup))
+    return 0
+
+def Time_Function(function, repeats):
+    """
+    Run [function] [repeats] times and return the fastest time taken, along with
+    the results of the last run.
+    
+    Time_Function(function, int) -> [float, *]
+    """
+    best = None
+    results = None
+    for i in range(repeats):
+        start = time.time()
+        results = function()
+        taken = time.time() - start
+        if best == None or taken < best: best = taken
+    return [best, results]
+
+
+
+# Dictionaries #################################################################
+
+DICT__benchmarks = {
+    "binary_read": Benchmark__Binary_Read,
+    "buffered_writer": Benchmark__Buffered_Writer,
+    "parsing": Benchmark__Table_Reader_Parsing,
+    "join_duplicates": Benchmark__Join_Duplicates,
+    "filters": Benchmark__Multitool_Filters,
+    "tally_count": Benchmark__Tally_Count,
+    "t2t_output": Benchmark__Table_to_Table_Output,
+    }
+
+
+
+# Main Loop ####################################################################
+
+def Run_Benchmarks(names):
+    """
+    Run the benchmarks specified by [names], or all benchmarks if [names] is
+    empty.
+    
+    Return a value of 0 if all benchmarks passed.
+    Return a value of 1 if any of them did not.
+    
+    Run_Benchmarks(list<str>) -> int
+    """
+    if not names: names = sorted(DICT__benchmarks.keys())
+    exit_code = 0
+    for name in names:
+        if name not in DICT__benchmarks:
+            PRINT.printE(STR__benchmark_unknown.format(s=name))
+            exit_code = 1
+            continue
+        PRINT.printP(STR__benchmark_begin.format(s=name))
+        if DICT__benchmarks[name](): exit_code = 1
+    return exit_code
+
+if __name__ == "__main__":
+    exit_code = Run_Benchmarks(sys.argv[1:])
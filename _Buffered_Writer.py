@@ -0,0 +1,68 @@
+"""
+BUFFERED WRITER
+(version 1.0)
+by Angelo Chan
+
+This is a library for opening output files with a large write buffer, so that
+the many small writes made by the Table Tools, usually one per row, are
+collected in memory and written to disk in a small number of large blocks.
+This matters most for slow or networked filesystems, where every write to the
+disk has a high fixed cost.
+"""
+
+
+
+# Configurations ###############################################################
+
+BUFFER_SIZE = 4194304 # The size of the write buffer, in bytes (4 MB)
+
+
+
+# Minor Configurations #########################################################
+
+# Defaults #####################################################################
+
+# Imported Modules #############################################################
+
+import os
+
+
+
+# Functions ####################################################################
+
+def Open_Buffered(path, buffer_size=None):
+    """
+    Open the file at [path] for writing, with a write buffer of [buffer_size]
+    bytes. Returns a standard file object, which can be used and closed in the
+    same way as one returned by open().
+    
+    The buffer of the file object itself is used, rather than collecting lines
+    in a list, as calling a Python method for every line costs more time than
+    the writes it saves. Lines written with write() or writelines() are kept in
+    the buffer until it is full, or until the file is flushed or closed.
+    
+    @path
+            (str - filepath)
+            The filepath of the output file.
+    @buffer_size
+            (int)
+            (Optional)
+            The size of the write buffer, in bytes. BUFFER_SIZE is used if no
+            size is specified.
+    
+    Open_Buffered(str, int) -> file
+    """
+    if not buffer_size: buffer_size = BUFFER_SIZE
+    return open(path, "w", buffer_size)
+
+def Fdopen_Buffered(handle, buffer_size=None):
+    """
+    Open the file with the OS-level file descriptor [handle] for writing, with a
+    write buffer of [buffer_size] bytes. For use with tempfile.mkstemp().
+    
+    See Open_Buffered() for more details.
+    
+    Fdopen_Buffered(int, int) -> file
+    """
+    if not buffer_size: buffer_size = BUFFER_SIZE
+    return os.fdopen(handle, "w", buffer_size)
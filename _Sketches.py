@@ -0,0 +1,290 @@
+"""
+SKETCHES
+(version 1.1.1)
+by Angelo Chan
+
+This is a library of probabilistic data structures, which use a fixed amount of
+memory regardless of how many items they are given, in exchange for a small
+and bounded chance of giving the wrong answer.
+"""
+
+
+
+# Configurations ###############################################################
+
+# Minor Configurations #########################################################
+
+# Defaults #####################################################################
+
+# Imported Modules #############################################################
+
+import sys
+import math
+import hashlib
+import struct
+import heapq
+
+
+
+# Classes ######################################################################
+
+class Bloom_Filter:
+    """
+    A set-like object which records which keys have been added to it, using a
+    fixed array of bits.
+    
+    Each key sets a number of bits in the array, chosen by hashing the key.
+    Checking whether a key has been added never gives a false negative, but may
+    give a false positive, if all of the bits of a new key were already set by
+    other keys. The size of the array and the number of bits per key are chosen
+    so that the chance of a false positive stays below [error_rate] as long as
+    no more than [capacity] unique keys are added.
+    
+    Designed for the following use:
+    
+    seen = Bloom_Filter(1000000, 0.001)
+    for key in keys:
+        if key in seen:
+            # Your code - [key] has (almost certainly) been seen before
+        else:
+            seen.add(key)
+    
+    Any object with a consistent repr() can be used as a key, such as strings or
+    tuples of strings.
+    """
+    
+    # Constructor ##############################################################
+    
+    def __init__(self, capacity, error_rate):
+        """
+        Creates a Bloom Filter sized for [capacity] unique keys and a false
+        positive rate of [error_rate].
+        
+        @capacity
+                (int)
+                The expected number of unique keys.
+        @error_rate
+                (float)
+                The maximum acceptable chance of a false positive, between 0 and
+                1, once [capacity] unique keys have been added.
+        """
+        ln2 = math.log(2)
+        size = -capacity * math.log(error_rate) / (ln2 * ln2)
+        self.size = max(int(math.ceil(size)), 8)
+        self.hashes = max(int(round(self.size * ln2 / capacity)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+        self._last_key = None
+        self._last_positions = []
+    
+    
+    
+    # Property Methods #########################################################
+    
+    def __contains__(self, key):
+        """
+        Return True if [key] has (probably) been added to the filter, and False
+        if it definitely has not.
+        """
+        bits = self.bits
+        for pos in self.Get_Positions(key):
+            if not bits[pos >> 3] & (1 << (pos & 7)): return False
+        return True
+    
+    def __len__(self):
+        """
+        Return the approximate number of unique keys which have been added.
+        """
+        return self.count
+    
+    def Get_Positions(self, key):
+        """
+        Return the positions of the bits set by [key].
+        
+        Two 64-bit hashes are taken from the MD5 digest of [key] and combined to
+        generate as many positions as needed. The positions of the most recent
+        key are kept, so that checking for a key and then adding it only hashes
+        the key once.
+        
+        Get_Positions(*) -> list<int>
+        """
+        if key is self._last_key: return self._last_positions
+        a, b = struct.unpack("<QQ", hashlib.md5(repr(key)).digest())
+        b |= 1
+        size = self.size
+        positions = [(a + i*b) % size for i in range(self.hashes)]
+        self._last_key = key
+        self._last_positions = positions
+        return positions
+    
+    def Get_Error_Rate(self):
+        """
+        Return the estimated chance of a false positive, given the number of
+        unique keys added so far.
+        
+        Get_Error_Rate() -> float
+        """
+        fill = 1 - math.exp(-float(self.hashes * self.count) / self.size)
+        return fill ** self.hashes
+    
+    def Get_Error_Bound(self, checks):
+        """
+        Return the expected number of false positives over [checks] checks for
+        keys, rounded to the nearest whole number. This assumes every check was
+        made at the current error rate, which is the highest it has been.
+        
+        Get_Error_Bound(int) -> int
+        """
+        return int(round(self.Get_Error_Rate() * checks))
+    
+    def Get_Memory(self):
+        """
+        Return the memory used by the array of bits, in bytes.
+        
+        Get_Memory() -> int
+        """
+        return sys.getsizeof(self.bits)
+    
+    
+    
+    # Methods ##################################################################
+    
+    def add(self, key):
+        """
+        Add [key] to the filter.
+        """
+        bits = self.bits
+        new = False
+        for pos in self.Get_Positions(key):
+            byte = pos >> 3
+            bit = 1 << (pos & 7)
+            if not bits[byte] & bit:
+                bits[byte] |= bit
+                new = True
+        if new: self.count += 1
+
+
+
+class Space_Saving:
+    """
+    A dict-like object which keeps approximate counts of the most frequent keys
+    given to it, using the Space-Saving algorithm, in a fixed amount of memory.
+    
+    At most [capacity] keys are monitored at once. When a new key is given and
+    every slot is in use, the key with the lowest count is replaced, and the new
+    key inherits that count as its "error". The count of a key is therefore
+    never less than its true count, and never more than its true count plus its
+    error. Any key whose true count is more than 1/[capacity] of the total is
+    guaranteed to be monitored.
+    
+    Designed to be used in place of a dict of counts:
+    
+    counts = Space_Saving(1000)
+    for key in keys:
+        if key not in counts:
+            counts[key] = 1
+        else:
+            counts[key] += 1
+    for key in counts.Get_Top(10):
+        # Your code - counts[key] and counts.Get_Error(key) are available
+    
+    Counts may be any positive numbers, such as fractions, but may not be
+    lowered.
+    """
+    
+    # Constructor ##############################################################
+    
+    def __init__(self, capacity):
+        """
+        Creates a Space-Saving sketch which monitors up to [capacity] keys.
+        
+        @capacity
+                (int)
+                The maximum number of keys monitored at once.
+        """
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.heap = [] # [count, key], where count may be out of date
+        self.max_error = 0
+    
+    
+    
+    # Property Methods #########################################################
+    
+    def __contains__(self, key):
+        return key in self.counts
+    
+    def __getitem__(self, key):
+        return self.counts[key]
+    
+    def __setitem__(self, key, count):
+        """
+        Set the count of a monitored [key], or start monitoring a new [key] with
+        a count of [count]. If every slot is in use, the key with the lowest
+        count is replaced, and [count] is added to its count.
+        """
+        counts = self.counts
+        if key in counts:
+            counts[key] = count
+            return
+        error = 0
+        if len(counts) >= self.capacity:
+            error = self._evict()
+            count = count + error
+        counts[key] = count
+        self.errors[key] = error
+        heapq.heappush(self.heap, [count, key])
+    
+    def __len__(self):
+        """
+        Return the number of keys currently monitored.
+        """
+        return len(self.counts)
+    
+    def Get_Error(self, key):
+        """
+        Return the maximum amount by which the count of [key] may exceed its
+        true count.
+        
+        Get_Error(*) -> int/float
+        """
+        return self.errors[key]
+    
+    def Get_Top(self, k):
+        """
+        Return the [k] monitored keys with the highest counts, in descending
+        order of count.
+        
+        Get_Top(int) -> list<*>
+        """
+        counts = self.counts
+        return heapq.nlargest(k, counts, key=counts.__getitem__)
+    
+    
+    
+    # Methods ##################################################################
+    
+    def _evict(self):
+        """
+        Stop monitoring the key with the lowest count, and return its count.
+        
+        The counts in the heap are only updated when they reach the top, as
+        counts only ever go up, so an out of date count is always too low.
+        
+        _evict() -> int/float
+        """
+        heap = self.heap
+        counts = self.counts
+        while True:
+            entry = heap[0]
+            count, key = entry
+            current = counts[key]
+            if current == count:
+                heapq.heappop(heap)
+                del counts[key]
+                del self.errors[key]
+                if count > self.max_error: self.max_error = count
+                return count
+            entry[0] = current
+            heapq.heapreplace(heap, entry)